@@ -0,0 +1,46 @@
+"""
+Compare load_binary() / open_binary() with parse() for one layout and for a multi-layout archive.
+
+    python -m benchmarks.bench_binary
+"""
+import os
+import tempfile
+import timeit
+
+import pykle_serial as kle_serial
+from pykle_serial.binary import dump_binary, load_binary, open_binary
+
+from .bench_deserialize import FULL_SIZE
+from .bench_parse import to_raw_data
+
+
+def _first_key_of_each(path: str) -> None:
+    with open_binary(path) as archive:
+        for i in range(len(archive)):
+            archive.keys(i)[0]
+
+
+def main():
+    raw = to_raw_data(FULL_SIZE)
+    kbd = kle_serial.parse(raw)
+    with tempfile.TemporaryDirectory() as d:
+        single = os.path.join(d, 'single.bin')
+        archive = os.path.join(d, 'archive.bin')
+        dump_binary(kbd, single)
+        n_layouts = 200
+        dump_binary([kbd] * n_layouts, archive)
+        print("file size: raw data %d bytes, binary %d bytes, archive of %d: %d bytes" % (
+            len(raw.encode()), os.path.getsize(single), n_layouts, os.path.getsize(archive)))
+        for name, f, number in [
+            ("parse() x1", lambda: kle_serial.parse(raw), 100),
+            ("load_binary() x1", lambda: load_binary(single), 100),
+            ("parse() x%d" % n_layouts, lambda: [kle_serial.parse(raw) for _ in range(n_layouts)], 3),
+            ("load_binary() archive of %d" % n_layouts, lambda: load_binary(archive), 3),
+            ("open_binary() + first key of each", lambda: _first_key_of_each(archive), 20),
+        ]:
+            t = timeit.timeit(f, number=number) / number
+            print("%-36s: %9.2f ms" % (name, t * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Scaling of parse_many() from 1 to N worker processes.
+
+    python -m benchmarks.bench_bulk
+"""
+import os
+import pickle
+import time
+
+import pykle_serial as kle_serial
+from pykle_serial.bulk import _pack_keyboard, parse_many
+
+from .bench_deserialize import FULL_SIZE
+from .bench_parse import to_raw_data
+
+
+def main():
+    texts = [to_raw_data(FULL_SIZE)] * 400
+    kbd = kle_serial.parse(texts[0])
+    print("pickled size of a full-size layout: Keyboard %d bytes, packed %d bytes" % (
+        len(pickle.dumps(kbd, protocol=pickle.HIGHEST_PROTOCOL)),
+        len(pickle.dumps(_pack_keyboard(kbd), protocol=pickle.HIGHEST_PROTOCOL))))
+
+    t0 = time.perf_counter()
+    _ = [kle_serial.parse(text) for text in texts]
+    base = time.perf_counter() - t0
+    print("parse() loop: %d layouts, %.2f s" % (len(texts), base))
+
+    n = os.cpu_count() or 1
+    workers = 1
+    del _
+    while True:
+        t0 = time.perf_counter()
+        parse_many(texts, workers=workers, chunksize=16)
+        t = time.perf_counter() - t0
+        print("parse_many(workers=%d): %.2f s, x%.2f" % (workers, t, base / t))
+        if workers >= n:
+            break
+        workers = min(workers * 2, n)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Measure per-key memory of Key and CompactKey on a full-size layout.
+
+    python -m benchmarks.bench_compact
+"""
+import timeit
+import tracemalloc
+
+import pykle_serial as kle_serial
+
+from .bench_deserialize import FULL_SIZE
+
+
+def _bytes_per_key(compact: bool, copies: int = 100) -> float:
+    kle_serial.deserialize(FULL_SIZE, compact=compact)  # warm up shared pools
+    tracemalloc.start()
+    kbds = [kle_serial.deserialize(FULL_SIZE, compact=compact) for _ in range(copies)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_keys = sum(len(kbd.keys) for kbd in kbds)
+    return size / n_keys
+
+
+def main():
+    for compact in (False, True):
+        name = "CompactKey" if compact else "Key"
+        number = 200
+        t = timeit.timeit(lambda: kle_serial.deserialize(FULL_SIZE, compact=compact), number=number)
+        print("%-10s: %6.0f bytes/key, %.1f us/layout" % (name, _bytes_per_key(compact), t / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
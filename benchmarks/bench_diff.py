@@ -0,0 +1,33 @@
+"""
+diff() on a 10k-key layout against a revision with moved, relabeled and shuffled keys.
+
+    python -m benchmarks.bench_diff
+"""
+import copy
+import random
+import time
+
+import pykle_serial as kle_serial
+from pykle_serial.diff import diff
+
+from .layouts import stress
+
+
+def main(n_keys: int = 10000, n_edits: int = 500):
+    a = kle_serial.deserialize(stress(n_keys))
+    b = copy.deepcopy(a)
+    rnd = random.Random(1)
+    for k in rnd.sample(b.keys, n_edits):
+        k.x += 0.5
+    for k in rnd.sample(b.keys, n_edits):
+        k.labels[0] = "X"
+    rnd.shuffle(b.keys)
+    t = time.perf_counter()
+    d = diff(a, b)
+    t = time.perf_counter() - t
+    print("%d keys: diff() %.0f ms, %d changed, %d removed, %d added" % (
+        len(a.keys), t * 1e3, len(d.changed), len(d.removed), len(d.added)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+load_dir() with the prefetch thread against a sequential load() loop, on a directory of gzip layouts.
+
+    python -m benchmarks.bench_files
+"""
+import gzip
+import json
+import os
+import tempfile
+import time
+
+import pykle_serial as kle_serial
+
+from .layouts import churn, ergo, full_size, sixty_percent, tkl
+
+
+def main(n_files: int = 400):
+    layouts = [sixty_percent(), tkl(), full_size(), ergo(), churn(500)]
+    with tempfile.TemporaryDirectory() as d:
+        for i in range(n_files):
+            with gzip.open(os.path.join(d, '%04d.json.gz' % i), 'wt', encoding='utf-8') as f:
+                json.dump(layouts[i % len(layouts)], f)
+        names = sorted(os.listdir(d))
+        t = time.perf_counter()
+        for name in names:
+            kle_serial.load(os.path.join(d, name))
+        sequential = time.perf_counter() - t
+        t = time.perf_counter()
+        for _ in kle_serial.load_dir(d, '*.json.gz'):
+            pass
+        prefetched = time.perf_counter() - t
+    print("%d gzip files: load() loop %.0f ms, load_dir() %.0f ms" % (n_files, sequential * 1e3, prefetched * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Duplicate detection over a corpus by fingerprint, against pairwise Keyboard comparison.
+
+    python -m benchmarks.bench_frozen
+"""
+import copy
+import random
+import time
+import timeit
+
+import pykle_serial as kle_serial
+
+from .layouts import ergo, full_size, sixty_percent, tkl
+
+
+def main(n_layouts: int = 2000):
+    bases = [kle_serial.deserialize(rows) for rows in (sixty_percent(), tkl(), full_size(), ergo())]
+    rnd = random.Random(1)
+    corpus = []
+    for i in range(n_layouts):
+        kbd = copy.deepcopy(bases[i % len(bases)])
+        if i % 3 == 0:
+            rnd.choice(kbd.keys).labels[0] = "X%d" % i  # a third of them are unique
+        rnd.shuffle(kbd.keys)
+        corpus.append(kbd)
+    t = time.perf_counter()
+    groups: dict = {}
+    for i, kbd in enumerate(corpus):
+        groups.setdefault(kbd.freeze().fingerprint(), []).append(i)
+    t = time.perf_counter() - t
+    # Pairwise deduplication compares up to n^2 / 2 pairs; an equal pair costs a full comparison.
+    number = 200
+    a = bases[2]
+    b = copy.deepcopy(a)
+    t_eq = timeit.timeit(lambda: a == b, number=number) / number
+    n = 200000
+    print("%d layouts: %d groups by fingerprint in %.0f ms, %.0f us/layout. "
+          "For %d layouts: fingerprints %.0f s, pairwise == up to %.0f s" % (
+              n_layouts, len(groups), t * 1e3, t / n_layouts * 1e6, n, t / n_layouts * n, t_eq * n * n / 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare batched geometry against a naive per-key loop.
+
+    python -m benchmarks.bench_geometry
+"""
+import math
+import timeit
+
+import pykle_serial as kle_serial
+from pykle_serial import geometry
+
+from .bench_deserialize import FULL_SIZE
+
+
+def _tiled(copies: int) -> list:
+    # Full-size layouts in rotated clusters, 104 keys each.
+    rows = []
+    for c in range(copies):
+        for i, row in enumerate(FULL_SIZE[1:]):
+            head = {'r': (c % 7) * 5, 'rx': (c % 10) * 25, 'ry': (c // 10) * 8} if i == 0 else {}
+            rows.append([head] + [item for item in row if isinstance(item, str) or not ({'r', 'rx', 'ry'} & set(item))])
+    return rows
+
+
+def naive_bounding_boxes(kbd):
+    ret = []
+    for k in kbd.keys:
+        a = math.radians(k.rotation_angle)
+        cs, sn = math.cos(a), math.sin(a)
+        xs, ys = [], []
+        for x, y, w, h in ((k.x, k.y, k.width, k.height), (k.x + k.x2, k.y + k.y2, k.width2, k.height2)):
+            for px, py in ((x, y), (x + w, y), (x + w, y + h), (x, y + h)):
+                dx, dy = px - k.rotation_x, py - k.rotation_y
+                xs.append(k.rotation_x + cs * dx - sn * dy)
+                ys.append(k.rotation_y + sn * dx + cs * dy)
+        ret.append((min(xs), min(ys), max(xs), max(ys)))
+    return ret
+
+
+def main():
+    kbd = kle_serial.deserialize(_tiled(100))
+    n = len(kbd.keys)
+    number = 10
+    table = kbd.to_table()
+    for name, f in [
+        ("naive per-key loop", lambda: naive_bounding_boxes(kbd)),
+        ("bounding_boxes(Keyboard)", lambda: geometry.bounding_boxes(kbd)),
+        ("bounding_boxes(KeyTable)", lambda: geometry.bounding_boxes(table)),
+        ("bounding_boxes(array fallback)", lambda: geometry.bounding_boxes(kbd, use_numpy=False)),
+    ]:
+        t = timeit.timeit(f, number=number) / number
+        print("%-32s: %d keys, %8.2f ms" % (name, n, t * 1e3))
+
+
+if __name__ == '__main__':
+    main()
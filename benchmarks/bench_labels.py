@@ -0,0 +1,65 @@
+"""
+Label plain text extraction over a layout corpus, cold and warm cache, against per-label HTMLParser.
+
+    python -m benchmarks.bench_labels
+"""
+import time
+from html.parser import HTMLParser
+
+import pykle_serial as kle_serial
+from pykle_serial.labels import clear_cache, iter_texts
+
+from .layouts import churn, ergo, full_size, sixty_percent, tkl
+
+
+class _Stripper(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'br':
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def _html(rows: list) -> list:
+    # Every other label as it often comes from KLE: bold, with an entity or a line break.
+    forms = ["<b>%s</b>", "%s&nbsp;", "%s<br>Alt", "%s"]
+    return [[forms[i % 4] % item if isinstance(item, str) else item for i, item in enumerate(row)]
+            if isinstance(row, list) else row for row in rows]
+
+
+def _naive(keyboards: list) -> None:
+    for kbd in keyboards:
+        for key in kbd.keys:
+            for label in key.labels:
+                if label is not None:
+                    p = _Stripper()
+                    p.feed(label)
+                    p.close()
+                    ''.join(p.parts)
+
+
+def main():
+    layouts = [sixty_percent(), tkl(), full_size(), ergo(), churn(2000)]
+    keyboards = [kle_serial.deserialize(_html(rows)) for rows in layouts] * 20
+    n = sum(1 for kbd in keyboards for key in kbd.keys for label in key.labels if label is not None)
+    t = time.perf_counter()
+    _naive(keyboards)
+    naive = time.perf_counter() - t
+    clear_cache()
+    t = time.perf_counter()
+    list(iter_texts(keyboards))
+    cold = time.perf_counter() - t
+    t = time.perf_counter()
+    list(iter_texts(keyboards))
+    warm = time.perf_counter() - t
+    print("%d labels: HTMLParser %.1f ms, iter_texts() cold %.1f ms, warm %.1f ms" % (
+        n, naive * 1e3, cold * 1e3, warm * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory and time of deserialize() with Key, CompactKey and lazy columns on a 100k-key layout.
+
+    python -m benchmarks.bench_lazy
+"""
+import gc
+import time
+import tracemalloc
+
+import pykle_serial as kle_serial
+
+from .layouts import stress
+
+
+def _measure(rows: list, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    t = time.perf_counter()
+    kbd = kle_serial.deserialize(rows, **kwargs)
+    t = time.perf_counter() - t
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kbd, t, retained, peak
+
+
+def main():
+    rows = stress(100000)
+    for name, kwargs in [("Key", {}), ("CompactKey", {'compact': True}), ("lazy", {'lazy': True})]:
+        kbd, t, retained, peak = _measure(rows, **kwargs)
+        n = len(kbd.keys)
+        t_read = time.perf_counter()
+        for k in kbd.keys[::1000]:
+            k.x, k.y, k.width, k.labels[0]
+        t_read = time.perf_counter() - t_read
+        print("%-10s: %d keys, deserialize %7.0f ms (under tracemalloc), retained %6.1f MB, peak %6.1f MB, "
+              "read 4 fields of %d keys %6.1f us" % (
+                  name, n, t * 1e3, retained / 1e6, peak / 1e6, len(kbd.keys[::1000]), t_read * 1e6))
+        del kbd
+    t = time.perf_counter()
+    kle_serial.deserialize(rows, lazy=True)
+    print("lazy deserialize without tracemalloc: %.0f ms" % ((time.perf_counter() - t) * 1e3))
+    t = time.perf_counter()
+    kle_serial.deserialize(rows)
+    print("Key deserialize without tracemalloc: %.0f ms" % ((time.perf_counter() - t) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
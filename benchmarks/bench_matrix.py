@@ -0,0 +1,29 @@
+"""
+assign_matrix() time on ordinary, ergo and 10k / 100k-key layouts, with NumPy and pure Python.
+
+    python -m benchmarks.bench_matrix
+"""
+import time
+
+import pykle_serial as kle_serial
+from pykle_serial.matrix import assign_matrix
+from pykle_serial.table import np
+
+from .layouts import ergo, full_size, stress
+
+
+def main():
+    for name, rows in [("full-size", full_size()), ("ergo", ergo()), ("stress-10k", stress(10000)),
+                       ("stress-100k", stress(100000))]:
+        kbd = kle_serial.deserialize(rows)
+        for use_numpy in ([True, False] if np is not None else [False]):
+            t = time.perf_counter()
+            m = assign_matrix(kbd, use_numpy=use_numpy)
+            t = time.perf_counter() - t
+            print("%-11s %-6s: %6d keys, %8.1f ms, %5.2f us/key, %s matrix" % (
+                name, 'numpy' if use_numpy else 'python', len(kbd.keys), t * 1e3, t / len(kbd.keys) * 1e6,
+                '%dx%d' % m.shape))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Compare json5.loads() with the tiered loader on KLE raw data.
+
+    python -m benchmarks.bench_parse
+"""
+import json
+import timeit
+
+import json5
+
+import pykle_serial as kle_serial
+from pykle_serial.rawdata import loads_with_tier
+
+from .bench_deserialize import FULL_SIZE
+from .bench_geometry import _tiled
+
+
+def to_raw_data(rows: list) -> str:
+    # Formats rows like KLE's "Raw data" tab: unquoted keys, no outer [].
+    def item(v) -> str:
+        if isinstance(v, dict):
+            return '{' + ','.join(k + ':' + json.dumps(x, ensure_ascii=False) for k, x in v.items()) + '}'
+        return json.dumps(v, ensure_ascii=False)
+    return ',\n'.join(item(r) if isinstance(r, dict) else '[' + ','.join(item(x) for x in r) + ']' for r in rows)
+
+
+def main():
+    for name, rows in [("full-size", FULL_SIZE), ("2.6k keys", _tiled(25))]:
+        raw = to_raw_data(rows)
+        strict = json.dumps(rows)
+        number = 2 if len(raw) > 100000 else 50
+        for label, f in [
+            ("json5.loads (raw data)", lambda: json5.loads('[' + raw + ']')),
+            ("loads_with_tier (raw data)", lambda: loads_with_tier(raw)),
+            ("loads_with_tier (JSON)", lambda: loads_with_tier(strict)),
+            ("parse (raw data)", lambda: kle_serial.parse(raw)),
+        ]:
+            t = timeit.timeit(f, number=number) / number
+            print("%-10s %-28s: %10.1f us" % (name, label, t * 1e6))
+        print("%-10s tiers: raw data -> %s, JSON -> %s" % (name, loads_with_tier(raw)[1], loads_with_tier(strict)[1]))
+
+
+if __name__ == '__main__':
+    main()
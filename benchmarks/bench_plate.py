@@ -0,0 +1,41 @@
+"""
+Plate cutouts of a batch of 1k-key plates: one cutouts() call per plate, and one cutouts_many() batch,
+with NumPy and pure Python. Also times write_dxf().
+
+    python -m benchmarks.bench_plate
+"""
+import io
+import time
+
+import pykle_serial as kle_serial
+from pykle_serial.plate import cutouts, cutouts_many, write_dxf
+from pykle_serial.table import np
+
+from .layouts import ergo, full_size, stress
+
+
+def _time(f):
+    t = time.perf_counter()
+    r = f()
+    return time.perf_counter() - t, r
+
+
+def main():
+    plates = [kle_serial.deserialize(stress(1000)) for _ in range(8)]
+    plates += [kle_serial.deserialize(full_size()), kle_serial.deserialize(ergo())]
+    n = sum(len(kbd.keys) for kbd in plates)
+    for use_numpy in ([True, False] if np is not None else [False]):
+        backend = 'numpy' if use_numpy else 'python'
+        t, _ = _time(lambda: [cutouts(kbd, use_numpy=use_numpy) for kbd in plates])
+        print("%-6s per plate : %2d plates, %5d keys, %7.1f ms, %5.2f us/key" % (
+            backend, len(plates), n, t * 1e3, t / n * 1e6))
+        t, many = _time(lambda: cutouts_many(plates, use_numpy=use_numpy))
+        print("%-6s batched   : %2d plates, %5d keys, %7.1f ms, %5.2f us/key, %d cutouts" % (
+            backend, len(plates), n, t * 1e3, t / n * 1e6, sum(len(c) for c in many)))
+    f = io.StringIO()
+    t, _ = _time(lambda: [write_dxf(c, f) for c in many])
+    print("write_dxf       : %7.1f ms, %7.1f KB" % (t * 1e3, len(f.getvalue()) / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Throughput of deserialize() per property dict, on property-heavy layouts.
+
+    python -m benchmarks.bench_properties
+"""
+import timeit
+
+import pykle_serial as kle_serial
+from pykle_serial.serial import _iter_deserialize
+
+from .layouts import churn, ergo, full_size
+
+
+def _count_items(rows: list) -> int:
+    return sum(1 for row in rows if isinstance(row, list) for item in row if isinstance(item, dict))
+
+
+def _walk(rows: list) -> None:
+    # deserialize() without the key emission: rows and property dicts only.
+    for _ in _iter_deserialize(rows, lambda current, labels, align: None):
+        pass
+
+
+def main():
+    for name, rows in [("full-size", full_size()), ("ergo", ergo()), ("churn-2k", churn(2000))]:
+        n_items = _count_items(rows)
+        n_keys = len(kle_serial.deserialize(rows).keys)
+        number = max(1, 20000 // n_keys)
+        t = min(timeit.repeat(lambda: kle_serial.deserialize(rows), number=number, repeat=5)) / number
+        walk = min(timeit.repeat(lambda: _walk(rows), number=number, repeat=5)) / number
+        print("%-10s: %5d property dicts, %5d keys, %9.1f us/layout, %6.2f us/key, walk %6.2f us/dict" % (
+            name, n_items, n_keys, t * 1e6, t / n_keys * 1e6, walk / n_items * 1e6))
+
+
+if __name__ == '__main__':
+    main()
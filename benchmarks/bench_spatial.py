@@ -0,0 +1,62 @@
+"""
+Compare SpatialIndex queries against a brute-force scan of all keys.
+
+    python -m benchmarks.bench_spatial
+"""
+import math
+import random
+import timeit
+
+import pykle_serial as kle_serial
+from pykle_serial.spatial import SpatialIndex
+
+from .bench_geometry import _tiled
+
+
+def _local(k, x, y):
+    a = math.radians(k.rotation_angle)
+    cs, sn = math.cos(a), math.sin(a)
+    dx, dy = x - k.rotation_x, y - k.rotation_y
+    return k.rotation_x + cs * dx + sn * dy, k.rotation_y - sn * dx + cs * dy
+
+
+def _distance(k, x, y):
+    u, v = _local(k, x, y)
+    d = math.inf
+    for x0, y0, w, h in ((k.x, k.y, k.width, k.height), (k.x + k.x2, k.y + k.y2, k.width2, k.height2)):
+        d = min(d, math.hypot(max(x0 - u, 0., u - x0 - w), max(y0 - v, 0., v - y0 - h)))
+    return d
+
+
+def brute_keys_at(kbd, x, y):
+    return [k for k in kbd.keys if _distance(k, x, y) == 0.]
+
+
+def brute_nearest(kbd, x, y, k):
+    return sorted(kbd.keys, key=lambda key: _distance(key, x, y))[:k]
+
+
+def main():
+    kbd = kle_serial.deserialize(_tiled(100))
+    n = len(kbd.keys)
+    rng = random.Random(0)
+    points = [(rng.uniform(0, 250), rng.uniform(0, 80)) for _ in range(100)]
+    rects = [(x, y, x + 5, y + 3) for x, y in points]
+
+    t = timeit.timeit(lambda: SpatialIndex(kbd), number=3) / 3
+    print("%-24s: %d keys, %10.2f ms" % ("build", n, t * 1e3))
+    index = SpatialIndex(kbd)
+    for name, f in [
+        ("keys_at() brute force", lambda: [brute_keys_at(kbd, x, y) for x, y in points]),
+        ("keys_at()", lambda: [index.keys_at(x, y) for x, y in points]),
+        ("keys_in() 5x3", lambda: [index.keys_in(r) for r in rects]),
+        ("nearest(k=5) brute force", lambda: [brute_nearest(kbd, x, y, 5) for x, y in points]),
+        ("nearest(k=5)", lambda: [index.nearest(x, y, 5) for x, y in points]),
+    ]:
+        number = 1 if 'brute' in name else 10
+        t = timeit.timeit(f, number=number) / number / len(points)
+        print("%-24s: %d keys, %10.2f us / query" % (name, n, t * 1e6))
+
+
+if __name__ == '__main__':
+    main()
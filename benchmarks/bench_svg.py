@@ -0,0 +1,27 @@
+"""
+render_svg() time and output size on ordinary and 10k-key layouts.
+
+    python -m benchmarks.bench_svg
+"""
+import io
+import time
+
+import pykle_serial as kle_serial
+from pykle_serial.svg import render_svg
+
+from .layouts import ergo, full_size, stress
+
+
+def main():
+    for name, rows in [("full-size", full_size()), ("ergo", ergo()), ("stress-10k", stress(10000))]:
+        kbd = kle_serial.deserialize(rows)
+        f = io.StringIO()
+        t = time.perf_counter()
+        render_svg(kbd, f)
+        t = time.perf_counter() - t
+        print("%-10s: %5d keys, %7.1f ms, %6.2f us/key, %7.1f KB" % (
+            name, len(kbd.keys), t * 1e3, t / len(kbd.keys) * 1e6, len(f.getvalue()) / 1024))
+
+
+if __name__ == '__main__':
+    main()
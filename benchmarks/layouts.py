@@ -0,0 +1,128 @@
+"""
+Synthetic KLE layouts for the benchmarks. Every generator returns rows, as ``deserialize()`` takes.
+"""
+import math
+import random
+from typing import Callable, Dict, List, Optional
+
+from .bench_deserialize import FULL_SIZE
+from .bench_geometry import _tiled
+
+
+def _cut(row: list, gaps: Optional[int]) -> list:
+    # Keeps the items before the gaps-th {'x': ...}, i.e. drops the clusters on the right.
+    if gaps is None:
+        return list(row)
+    ret = []
+    for item in row:
+        if isinstance(item, dict) and 'x' in item:
+            gaps -= 1
+            if gaps == 0:
+                break
+        ret.append(item)
+    return ret
+
+
+def full_size() -> List:
+    return [dict(FULL_SIZE[0])] + [list(row) for row in FULL_SIZE[1:]]
+
+
+def tkl() -> List:
+    rows = [_cut(row, gaps) for row, gaps in zip(FULL_SIZE[1:], [None, 2, 2, 1, 2, 2])]
+    return [{'name': "TKL"}] + rows
+
+
+def sixty_percent() -> List:
+    rows = [_cut(row, 1) for row in FULL_SIZE[2:]]
+    rows[0] = [{k: v for k, v in item.items() if k != 'y'} if isinstance(item, dict) else item for item in rows[0]]
+    rows[0] = [item for item in rows[0] if item != {}]
+    return [{'name': "60%"}] + rows
+
+
+def ergo() -> List:
+    # Split keyboard: both halves rotated, with column stagger, and rotated thumb clusters.
+    rows: List = [{'name': "ergo", 'backcolor': "#222222"}]
+    stagger = [0.375, 0.375, 0.125, 0., 0.125, 0.25]  # from the outer column
+    # Each half is rotated around its outer top corner, so the inner columns go down on both sides.
+    for side, angle, origin_x in ((0, 10, 0.), (1, -10, 19.)):
+        letters = ["QWERT", "ASDFG", "ZXCVB"] if side == 0 else ["YUIOP", "HJKL;", "NM,./"]
+        offsets = stagger if side == 0 else stagger[::-1]
+        for r in range(4):
+            # Each key moves down by the stagger of its column; the row starts back at the first column.
+            keys: List = [{'y': offsets[0] - (offsets[-1] if r else 0.), 'c': "#555555"}]
+            if side == 1:
+                keys[0]['x'] = -6
+            if r == 0:
+                keys[0].update(r=angle, rx=origin_x, ry=0.5)
+            for col in range(6):
+                if col:
+                    keys.append({'y': offsets[col] - offsets[col - 1], 'c': "#555555" if col == 5 else "#cccccc"})
+                outer = 0 if side == 0 else 5
+                if r == 3:
+                    keys.append("Fn" + str(col))
+                elif col == outer:
+                    keys.append(("Tab", "Ctrl", "Shift")[r] if side == 0 else ("\\", "'", "Shift")[r])
+                else:
+                    keys.append(letters[r][col - 1 if side == 0 else col])
+            rows.append(keys)
+        if side == 0:
+            rows.append([{'r': 25, 'rx': 6.5, 'ry': 4.5, 'x': 1, 'a': 4, 'f': 2, 'c': "#cccccc"}, "Home\nEnd", "PgUp\nPgDn"])
+            rows.append([{'a': 7, 'f': 3}, "Alt", {'h': 2}, "Space", {'h': 2}, "BS"])
+        else:
+            rows.append([{'r': -25, 'rx': 12.5, 'ry': 4.5, 'x': -3, 'a': 4, 'f': 2, 'c': "#cccccc"}, "PgUp\nPgDn",
+                         "Home\nEnd"])
+            rows.append([{'x': -3, 'a': 7, 'f': 3}, {'h': 2}, "Enter", {'h': 2}, "Del", "Alt"])
+    return rows
+
+
+_LABELS = ["A", "B\nC", "Shift", "Ctrl\n\n\nL", "", "F1\n\n\n\n\n\nF13", "<i class='kb kb-Arrows-Up'></i>"]
+
+
+def churn(n_keys: int, seed: int = 0) -> List:
+    """
+    Adversarial: a property dict before every key, changing colors, text sizes, alignment,
+    profiles, sizes and flags.
+    """
+    rng = random.Random(seed)
+    rows: List = [{'name': "churn", 'radii': "6px"}]
+    per_row = 16
+    for r in range(0, n_keys, per_row):
+        row: List = []
+        for k in range(min(per_row, n_keys - r)):
+            props = {
+                'c': "#%06x" % rng.randrange(1 << 24),
+                't': "#%06x\n\n#%06x" % (rng.randrange(1 << 24), rng.randrange(1 << 24)),
+                'a': rng.choice([0, 4, 5, 6, 7]),
+                'p': rng.choice(["DCS", "SA R1", "DSA", ""]),
+                'w': rng.choice([1, 1.25, 1.5, 2]),
+            }
+            if rng.random() < 0.3:
+                props['f'] = rng.randrange(1, 9)
+            if rng.random() < 0.3:
+                props['fa'] = [rng.randrange(1, 9) for _ in range(rng.randrange(1, 12))]
+            if rng.random() < 0.2:
+                props.update(h=2, w2=1.5, h2=1, x2=-0.25)
+            if rng.random() < 0.1:
+                props.update(n=True, l=True, d=rng.random() < 0.5, g=rng.random() < 0.5)
+            row.append(props)
+            row.append(rng.choice(_LABELS))
+        rows.append(row)
+    return rows
+
+
+def stress(n_keys: int) -> List:
+    """
+    Full-size layouts in rotated clusters, about ``n_keys`` keys.
+    """
+    return _tiled(max(1, math.ceil(n_keys / 104)))
+
+
+LAYOUTS: Dict[str, Callable[[], List]] = {
+    '60%': sixty_percent,
+    'tkl': tkl,
+    'full-size': full_size,
+    'ergo': ergo,
+    'churn-2k': lambda: churn(2000),
+    'stress-10k': lambda: stress(10000),
+    'stress-100k': lambda: stress(100000),
+}
@@ -0,0 +1,141 @@
+"""
+Benchmark suite over the synthetic layouts of ``benchmarks.layouts``, with JSON results
+which can be compared across runs.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+
+For each layout, it measures separately:
+
+- ``json5_loads``: ``json5.loads()`` of the KLE raw data (skipped above ``--json5-max-bytes``)
+- ``loads``: the tiered loader ``pykle_serial.rawdata.loads()`` of the same text
+- ``deserialize``: ``deserialize()`` of the rows
+- ``state_machine``: the row / property state machine of ``deserialize()`` alone, keys not emitted
+- ``key_copy``: ``deserialize - state_machine``, the emission of keys from the running state
+- ``parse_peak_bytes``: the peak of ``tracemalloc`` during ``parse()``
+
+Times are the best of ``--repeat`` runs, in seconds. ``--stress 1000000`` adds a stress layout
+of that many keys; at 1M keys, expect some GB of memory.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import pykle_serial as kle_serial
+from pykle_serial.rawdata import loads
+from pykle_serial.serial import _iter_deserialize
+
+from .bench_parse import to_raw_data
+from .layouts import LAYOUTS, stress
+
+
+def _best(f: Callable, repeat: int, budget: float = 0.2) -> float:
+    # Best time of one call, with enough calls per run to fill about budget seconds.
+    t = timeit.timeit(f, number=1)
+    number = max(1, min(1000, int(budget / t))) if t > 0 else 1000
+    return min([t] + [timeit.timeit(f, number=number) / number for _ in range(repeat)])
+
+
+def _state_machine(rows: List) -> None:
+    for _ in _iter_deserialize(rows, lambda current, labels, align: None):
+        pass
+
+
+def _peak(f: Callable) -> int:
+    tracemalloc.start()
+    try:
+        f()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_layout(rows: List, repeat: int, json5_max_bytes: int) -> Dict[str, Any]:
+    text = to_raw_data(rows)
+    kbd = kle_serial.deserialize(rows)
+    result: Dict[str, Any] = {'keys': len(kbd.keys), 'rows': len(rows), 'bytes': len(text.encode('utf-8'))}
+    if result['bytes'] <= json5_max_bytes:
+        import json5
+        result['json5_loads'] = _best(lambda: json5.loads('[' + text + ']'), repeat)
+    else:
+        result['json5_loads'] = None
+    result['loads'] = _best(lambda: loads(text), repeat)
+    result['deserialize'] = _best(lambda: kle_serial.deserialize(rows), repeat)
+    result['state_machine'] = _best(lambda: _state_machine(rows), repeat)
+    result['key_copy'] = max(0., result['deserialize'] - result['state_machine'])
+    result['parse_peak_bytes'] = _peak(lambda: kle_serial.parse(text))
+    return result
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Returns the regressions: metrics more than ``threshold`` (0.1 = 10%) slower or bigger than ``baseline``.
+    """
+    regressions = []
+    for name, r in results['layouts'].items():
+        b = baseline['layouts'].get(name)
+        if b is None:
+            continue
+        for metric, v in r.items():
+            old = b.get(metric)
+            if metric in ('keys', 'rows', 'bytes') or v is None or not old:
+                continue
+            ratio = v / old
+            print("%-12s %-16s %12.4g -> %12.4g  %+7.1f%%" % (name, metric, old, v, (ratio - 1) * 100))
+            if ratio > 1 + threshold:
+                regressions.append("%s %s: %+.1f%%" % (name, metric, (ratio - 1) * 100))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="compare with the results of an earlier run")
+    parser.add_argument('--threshold', type=float, default=0.1, help="regression threshold (default: 0.1 = 10%%)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--layouts', nargs='*', default=list(LAYOUTS), help="names of the layouts to run")
+    parser.add_argument('--stress', type=int, nargs='*', default=[], help="extra stress layouts of these key counts")
+    parser.add_argument('--json5-max-bytes', type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    layouts: Dict[str, Callable[[], List]] = {name: LAYOUTS[name] for name in args.layouts}
+    for n in args.stress:
+        layouts['stress-%d' % n] = (lambda n: lambda: stress(n))(n)
+
+    results: Dict[str, Any] = {
+        'python': sys.version,
+        'platform': platform.platform(),
+        'pykle_serial': kle_serial.__version__,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'layouts': {},
+    }
+    print("%-12s %8s %12s %12s %12s %12s %12s %12s" % (
+        "layout", "keys", "json5 ms", "loads ms", "deser ms", "state ms", "copy ms", "peak KB"))
+    for name, make in layouts.items():
+        r = run_layout(make(), args.repeat, args.json5_max_bytes)
+        results['layouts'][name] = r
+        print("%-12s %8d %12s %12.3f %12.3f %12.3f %12.3f %12.0f" % (
+            name, r['keys'], '-' if r['json5_loads'] is None else '%.3f' % (r['json5_loads'] * 1e3),
+            r['loads'] * 1e3, r['deserialize'] * 1e3, r['state_machine'] * 1e3, r['key_copy'] * 1e3,
+            r['parse_peak_bytes'] / 1024))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,9 @@
-from .serial import Key, Keyboard, KeyboardMetadata, deserialize, parse, UB_LABEL_MAP
+from .serial import Key, Keyboard, KeyboardMetadata, deserialize, iter_deserialize, parse, serialize, UB_LABEL_MAP
+from .compact import CompactKey, CompactKeyboard, CompactKeyDefault
+from .table import KeyTable, DictColumn
+from .stream import iter_parse
+from .files import load, load_dir
+from .validation import validate
 
 __version_info__ = (0, 1, 1)
 __version__ = '.'.join(map(str, __version_info__))
@@ -0,0 +1,334 @@
+"""
+Versioned binary encoding of one or more ``Keyboard``.
+
+Layout (little endian):
+
+    header        HEADER
+    layouts       LAYOUT * n_layouts         keys_offset, n_keys, meta (string ref)
+    key records   KEY_RECORD * n_keys        for each layout, fixed width
+    label sets    12 string refs each        deduplicated Key.labels
+    styles        12 string refs + 12 f64    deduplicated Key.textColor / Key.textSize
+    strings       (n_strings + 1) uint64 offsets, then UTF-8 bytes
+
+A string ref is an index into the string table, or ``NONE``. A text size is float64, or NaN for ``None``;
+whole sizes are read back as int. Label lists shorter than 12 are padded with ``None``.
+The metadata of a layout is stored as a JSON string.
+"""
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence as _SequenceABC
+from dataclasses import asdict, fields, is_dataclass
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from .serial import UB_LABEL_MAP, Key, Keyboard, KeyboardMetadata, _inner_Key_default
+from .table import NUMERIC_FIELDS, np
+
+MAGIC = b'PKLB'
+FORMAT_VERSION = 1
+
+NONE = 0xFFFFFFFF
+NONE_SIZE = float('nan')
+
+HEADER = struct.Struct('<4sHHIIIIQQQQ')  # magic, version, reserved, n_layouts, n_label_sets, n_styles, n_strings,
+#                                           layouts, label sets, styles and strings offsets
+LAYOUT = struct.Struct('<QII')
+KEY_RECORD = struct.Struct('<11d5IIiIIB3x')
+LABEL_SET = struct.Struct('<12I')
+STYLE = struct.Struct('<12I12d')
+
+STRING_FIELDS = ('color', 'profile', 'sm', 'sb', 'st')
+FLAG_FIELDS = ('decal', 'ghost', 'stepped', 'nub')
+
+# The numeric block of KEY_RECORD as a NumPy structured dtype, for zero-copy views.
+KEY_RECORD_DTYPE = None if np is None else np.dtype(
+    [(name, '<f8') for name in NUMERIC_FIELDS]
+    + [(name, '<u4') for name in STRING_FIELDS]
+    + [('default_text_color', '<u4'), ('default_text_size', '<i4'), ('labels_ref', '<u4'), ('style_ref', '<u4'),
+       ('flags', 'u1'), ('_pad', 'V3')])
+
+
+class _Interner:
+    def __init__(self):
+        self.index: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def __call__(self, v: Any) -> int:
+        i = self.index.get(v)
+        if i is None:
+            i = self.index[v] = len(self.values)
+            self.values.append(v)
+        return i
+
+
+def _meta_json(meta: KeyboardMetadata) -> str:
+    d = {}
+    for f in fields(KeyboardMetadata):
+        v = getattr(meta, f.name)
+        d[f.name] = asdict(v) if is_dataclass(v) else v
+    return json.dumps(d, ensure_ascii=False, separators=(',', ':'))
+
+
+def dump_binary(keyboards: Union[Keyboard, Sequence[Keyboard]], fp: Union[str, IO]) -> None:
+    """
+    Writes one ``Keyboard`` (or ``CompactKeyboard``), or a sequence of them, to a path or a binary file object.
+    """
+    if not isinstance(keyboards, (list, tuple)):
+        keyboards = [keyboards]  # type: ignore
+    strings = _Interner()
+    label_sets = _Interner()
+    styles = _Interner()
+
+    def sref(v: Optional[str]) -> int:
+        return NONE if v is None else strings(v)
+
+    def size(v: Optional[float]) -> float:
+        return NONE_SIZE if v is None else float(v)
+
+    def padded(values: Sequence, name: str) -> List:
+        # Key() starts with no labels: lists are padded to one entry per label position.
+        if len(values) > UB_LABEL_MAP:
+            raise ValueError("Error: %s of a key has more than %d entries" % (name, UB_LABEL_MAP))
+        return list(values) + [None, ] * (UB_LABEL_MAP - len(values))
+
+    n_layouts = len(keyboards)
+    offset = HEADER.size + LAYOUT.size * n_layouts
+    layouts = []
+    records = []
+    for kbd in keyboards:
+        layouts.append(LAYOUT.pack(offset, len(kbd.keys), strings(_meta_json(kbd.meta))))
+        for k in kbd.keys:
+            flags = 0
+            for bit, name in enumerate(FLAG_FIELDS):
+                if getattr(k, name):
+                    flags |= 1 << bit
+            records.append(KEY_RECORD.pack(
+                *[float(getattr(k, name)) for name in NUMERIC_FIELDS],
+                *[strings(getattr(k, name)) for name in STRING_FIELDS],
+                strings(k.default.textColor), int(k.default.textSize),
+                label_sets(tuple(sref(v) for v in padded(k.labels, 'labels'))),
+                styles((tuple(sref(v) for v in padded(k.textColor, 'textColor')),
+                        tuple(size(v) for v in padded(k.textSize, 'textSize')))),
+                flags))
+        offset += KEY_RECORD.size * len(kbd.keys)
+
+    label_sets_offset = offset
+    styles_offset = label_sets_offset + LABEL_SET.size * len(label_sets.values)
+    strings_offset = styles_offset + STYLE.size * len(styles.values)
+    encoded = [s.encode('utf-8') for s in strings.values]
+    string_offsets = [0]
+    for e in encoded:
+        string_offsets.append(string_offsets[-1] + len(e))
+
+    chunks = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, n_layouts, len(label_sets.values), len(styles.values),
+                          len(strings.values), HEADER.size, label_sets_offset, styles_offset, strings_offset)]
+    chunks.extend(layouts)
+    chunks.extend(records)
+    chunks.extend(LABEL_SET.pack(*ls) for ls in label_sets.values)
+    chunks.extend(STYLE.pack(*tc, *ts) for tc, ts in styles.values)
+    chunks.append(struct.pack('<%dQ' % len(string_offsets), *string_offsets))
+    chunks.extend(encoded)
+    data = b''.join(chunks)
+    if isinstance(fp, str):
+        with open(fp, 'wb') as f:
+            f.write(data)
+    else:
+        fp.write(data)
+
+
+class BinaryArchive:
+    """
+    Reads a file written by ``dump_binary()`` through ``mmap``.
+
+    Nothing but the header and the string offsets is read up front. ``keys(i)`` decodes a key
+    only when it is accessed, and ``records(i)`` is a zero-copy view of the key records.
+    """
+    def __init__(self, source: Union[str, bytes, bytearray, memoryview]):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, str):
+            self._file = open(source, 'rb')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._file.close()
+                raise ValueError("Error: empty file")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buf: Any = memoryview(self._mmap)
+        else:
+            self.buf = memoryview(source)
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        if len(self.buf) < HEADER.size:
+            raise ValueError("Error: not a pykle-serial binary file")
+        (magic, version, _, self.n_layouts, self.n_label_sets, self.n_styles, self.n_strings,
+         self._layouts_offset, self._label_sets_offset, self._styles_offset, strings_offset) = HEADER.unpack_from(self.buf)
+        if magic != MAGIC:
+            raise ValueError("Error: not a pykle-serial binary file")
+        if version != FORMAT_VERSION:
+            raise ValueError("Error: unsupported binary format version " + str(version))
+        self._string_offsets = struct.unpack_from('<%dQ' % (self.n_strings + 1), self.buf, strings_offset)
+        self._string_data_offset = strings_offset + 8 * (self.n_strings + 1)
+        self._strings: Dict[int, str] = {}
+        self._label_sets: Dict[int, Tuple] = {}
+        self._styles: Dict[int, Tuple[Tuple, Tuple]] = {}
+
+    def close(self) -> None:
+        """
+        Closes the file. Views from ``records()`` which are still alive keep the mapping
+        and stay valid; it is unmapped when the last of them is garbage collected.
+        """
+        try:
+            self.buf.release()
+        except BufferError:  # exported to live records() views
+            pass
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'BinaryArchive':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_layouts
+
+    def string(self, ref: int) -> Optional[str]:
+        if ref == NONE:
+            return None
+        s = self._strings.get(ref)
+        if s is None:
+            base = self._string_data_offset
+            s = self._strings[ref] = str(self.buf[base + self._string_offsets[ref]:base + self._string_offsets[ref + 1]],
+                                         'utf-8')
+        return s
+
+    def _layout(self, i: int) -> Tuple[int, int, int]:
+        if not 0 <= i < self.n_layouts:
+            raise IndexError(i)
+        return LAYOUT.unpack_from(self.buf, self._layouts_offset + LAYOUT.size * i)
+
+    def meta(self, i: int = 0) -> KeyboardMetadata:
+        meta = KeyboardMetadata()
+        for k, v in json.loads(self.string(self._layout(i)[2])).items():  # type: ignore
+            setattr(meta, k, v)
+        return meta
+
+    def records(self, i: int = 0) -> Any:
+        """
+        Zero-copy view of the key records of layout ``i``: a NumPy structured array
+        (``KEY_RECORD_DTYPE``) if NumPy is installed, or a ``memoryview`` otherwise.
+        The view stays valid after ``close()``, and keeps the file mapped while it is alive.
+        """
+        offset, n, _ = self._layout(i)
+        if np is not None:
+            return np.frombuffer(self.buf, dtype=KEY_RECORD_DTYPE, count=n, offset=offset)
+        return self.buf[offset:offset + KEY_RECORD.size * n]
+
+    def keys(self, i: int = 0) -> '_LazyKeys':
+        offset, n, _ = self._layout(i)
+        return _LazyKeys(self, offset, n)
+
+    def keyboard(self, i: int = 0) -> Keyboard:
+        offset, n, _ = self._layout(i)
+        make_key = self._make_key
+        return Keyboard(self.meta(i), [
+            make_key(v) for v in KEY_RECORD.iter_unpack(self.buf[offset:offset + KEY_RECORD.size * n])])
+
+    def __iter__(self) -> Iterator[Keyboard]:
+        for i in range(self.n_layouts):
+            yield self.keyboard(i)
+
+    def _label_set(self, ref: int) -> Tuple:
+        ls = self._label_sets.get(ref)
+        if ls is None:
+            string = self.string
+            ls = self._label_sets[ref] = tuple(
+                string(r) for r in LABEL_SET.unpack_from(self.buf, self._label_sets_offset + LABEL_SET.size * ref))
+        return ls
+
+    def _style(self, ref: int) -> Tuple[Tuple, Tuple]:
+        style = self._styles.get(ref)
+        if style is None:
+            v = STYLE.unpack_from(self.buf, self._styles_offset + STYLE.size * ref)
+            style = self._styles[ref] = (
+                tuple(self.string(r) for r in v[:UB_LABEL_MAP]),
+                tuple(None if s != s else int(s) if s.is_integer() else s for s in v[UB_LABEL_MAP:]))
+        return style
+
+    def _key(self, offset: int) -> Key:
+        return self._make_key(KEY_RECORD.unpack_from(self.buf, offset))
+
+    def _make_key(self, v: Tuple) -> Key:
+        string = self.string
+        (x, y, width, height, x2, y2, width2, height2, rotation_x, rotation_y, rotation_angle,
+         color, profile, sm, sb, st, default_text_color, default_text_size, labels_ref, style_ref, flags) = v
+        text_color, text_size = self._style(style_ref)
+        key: Key = Key.__new__(Key)
+        # Same order as the fields of Key
+        key.__dict__ = {
+            'color': string(color),
+            'labels': list(self._label_set(labels_ref)),
+            'textColor': list(text_color),
+            'textSize': list(text_size),
+            'default': _inner_Key_default(string(default_text_color), default_text_size),  # type: ignore
+            'x': x, 'y': y, 'width': width, 'height': height,
+            'x2': x2, 'y2': y2, 'width2': width2, 'height2': height2,
+            'rotation_x': rotation_x, 'rotation_y': rotation_y, 'rotation_angle': rotation_angle,
+            'decal': bool(flags & 1), 'ghost': bool(flags & 2), 'stepped': bool(flags & 4), 'nub': bool(flags & 8),
+            'profile': string(profile), 'sm': string(sm), 'sb': string(sb), 'st': string(st),
+        }
+        return key
+
+
+class _LazyKeys(_SequenceABC):
+    # Sequence of the keys of one layout, decoded on access.
+    def __init__(self, archive: BinaryArchive, offset: int, n: int):
+        self._archive = archive
+        self._offset = offset
+        self._n = n
+
+    def __len__(self) -> int:
+        return self._n
+
+    @overload
+    def __getitem__(self, i: int) -> Key: ...  # noqa: E704
+
+    @overload
+    def __getitem__(self, i: slice) -> List[Key]: ...  # noqa: E704
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self._archive._key(self._offset + KEY_RECORD.size * i)
+
+
+def open_binary(source: Union[str, bytes, bytearray, memoryview]) -> BinaryArchive:
+    """
+    Opens a file (through ``mmap``) or a buffer written by ``dump_binary()``, for lazy reading.
+    """
+    return BinaryArchive(source)
+
+
+def load_binary(source: Union[str, bytes, bytearray, memoryview]) -> List[Keyboard]:
+    """
+    Reads all the keyboards of a file or a buffer written by ``dump_binary()``.
+    """
+    with BinaryArchive(source) as archive:
+        return list(archive)
@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import fields
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .compact import KEY_FIELDS, CompactKey, CompactKeyboard, _shared_default, _compact_labels
+from .serial import Key, Keyboard, KeyboardMetadata, _inner_Key_default, deserialize, parse
+
+if TYPE_CHECKING:
+    from .intern import InternPool
+
+META_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(KeyboardMetadata))
+
+_I_LABELS = KEY_FIELDS.index('labels')
+_I_TEXT_COLOR = KEY_FIELDS.index('textColor')
+_I_TEXT_SIZE = KEY_FIELDS.index('textSize')
+_I_DEFAULT = KEY_FIELDS.index('default')
+
+
+class ItemError(NamedTuple):
+    """
+    Failure of one input of ``parse_many()`` / ``deserialize_many()``.
+    """
+    index: int
+    type: str
+    message: str
+
+
+# Keyboards are sent back from the workers as plain tuples. They pickle much smaller and
+# faster than the dataclass graph, which repeats field names and class references per key.
+
+_get_key_fields = attrgetter(*KEY_FIELDS)
+
+
+def _pack_key(key: Any) -> tuple:
+    t = list(_get_key_fields(key))
+    t[_I_LABELS] = tuple(t[_I_LABELS])
+    t[_I_TEXT_COLOR] = tuple(t[_I_TEXT_COLOR])
+    t[_I_TEXT_SIZE] = tuple(t[_I_TEXT_SIZE])
+    t[_I_DEFAULT] = (key.default.textColor, key.default.textSize)
+    return tuple(t)
+
+
+def _pack_keyboard(kbd: Any) -> tuple:
+    return tuple(getattr(kbd.meta, name) for name in META_FIELDS), [_pack_key(k) for k in kbd.keys]
+
+
+def _unpack_key(t: tuple) -> Key:
+    d = dict(zip(KEY_FIELDS, t))
+    d['labels'] = list(d['labels'])
+    d['textColor'] = list(d['textColor'])
+    d['textSize'] = list(d['textSize'])
+    d['default'] = _inner_Key_default(*d['default'])
+    key: Key = Key.__new__(Key)
+    key.__dict__ = d
+    return key
+
+
+def _unpack_compact_key(t: tuple) -> CompactKey:
+    key: CompactKey = CompactKey.__new__(CompactKey)
+    for name, v in zip(KEY_FIELDS, t):
+        setattr(key, name, v)
+    key.labels = _compact_labels(key.labels)
+    key.textColor = _compact_labels(key.textColor)
+    key.textSize = _compact_labels(key.textSize)
+    key.default = _shared_default(*t[_I_DEFAULT])
+    return key
+
+
+def _unpack_keyboard(packed: tuple, compact: bool) -> Union[Keyboard, CompactKeyboard]:
+    meta_values, keys = packed
+    # The packed tuple may be shared (ParseCache): mutable values such as the background dict are copied.
+    meta = KeyboardMetadata(*[v if isinstance(v, (str, int, float, type(None))) else deepcopy(v) for v in meta_values])
+    if compact:
+        return CompactKeyboard(meta, [_unpack_compact_key(t) for t in keys])
+    return Keyboard(meta, [_unpack_key(t) for t in keys])
+
+
+def _run_chunk(args: Tuple[bool, int, Sequence]) -> List[Tuple[bool, Any]]:
+    is_text, offset, chunk = args
+    ret: List[Tuple[bool, Any]] = []
+    for i, item in enumerate(chunk):
+        try:
+            kbd = parse(item) if is_text else deserialize(item)
+            ret.append((True, _pack_keyboard(kbd)))
+        except Exception as e:
+            ret.append((False, ItemError(offset + i, type(e).__name__, str(e))))
+    return ret
+
+
+def _run_in_process(items: Sequence, is_text: bool, compact: bool,
+                    pool: Optional['InternPool']) -> List[Union[Keyboard, CompactKeyboard, ItemError]]:
+    ret: List[Union[Keyboard, CompactKeyboard, ItemError]] = []
+    for i, item in enumerate(items):
+        try:
+            ret.append(parse(item, compact, pool) if is_text else deserialize(item, compact, pool))
+        except Exception as e:
+            ret.append(ItemError(i, type(e).__name__, str(e)))
+    return ret
+
+
+def _run_many(inputs: Iterable, is_text: bool, workers: Optional[int], chunksize: int,
+              compact: bool, pool: Optional['InternPool']) -> List[Union[Keyboard, CompactKeyboard, ItemError]]:
+    if chunksize < 1:
+        raise ValueError("Error: chunksize must be at least 1, not " + repr(chunksize))
+    items = list(inputs)
+    if workers == 1:
+        return _run_in_process(items, is_text, compact, pool)
+    chunks = [(is_text, i, items[i:i + chunksize]) for i in range(0, len(items), chunksize)]
+    ret: List[Tuple[bool, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(_run_chunk, chunks):
+            ret.extend(chunk)
+    results: List[Union[Keyboard, CompactKeyboard, ItemError]] = [_unpack_keyboard(v, compact) if ok else v for ok, v in ret]
+    if pool is not None:
+        for kbd in results:
+            if not isinstance(kbd, ItemError):
+                for k in kbd.keys:
+                    pool.intern_key(k)
+    return results
+
+
+def parse_many(inputs: Iterable[str], workers: Optional[int] = None, chunksize: int = 16, compact: bool = False,
+               pool: Optional['InternPool'] = None) -> List[Union[Keyboard, CompactKeyboard, ItemError]]:
+    """
+    ``parse()`` every text of ``inputs`` in a process pool of ``workers`` processes
+    (``None``: the number of CPUs, ``1``: in this process).
+
+    Returns a list in the order of ``inputs``. A failed input gives ``ItemError``
+    instead of raising, so one broken layout does not abort the batch.
+    With ``pool``, equal values are shared across the whole batch.
+    """
+    return _run_many(inputs, True, workers, chunksize, compact, pool)
+
+
+def deserialize_many(inputs: Iterable[List], workers: Optional[int] = None, chunksize: int = 16, compact: bool = False,
+                     pool: Optional['InternPool'] = None) -> List[Union[Keyboard, CompactKeyboard, ItemError]]:
+    """
+    ``deserialize()`` version of ``parse_many()``.
+    """
+    return _run_many(inputs, False, workers, chunksize, compact, pool)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from . import __version__
+from .bulk import _I_DEFAULT, _I_LABELS, _I_TEXT_COLOR, _I_TEXT_SIZE, _pack_keyboard, _unpack_keyboard
+from .compact import CompactKeyboard
+from .serial import Keyboard, deserialize, parse
+
+
+class ParseCache:
+    """
+    Content-addressed cache of ``parse()`` / ``deserialize()`` results.
+
+    Entries are keyed by the SHA-256 of the text (or of the canonical JSON of the rows)
+    and by ``__version__``, so an upgrade never reads old entries. They are stored as
+    immutable tuples, and every read builds a fresh ``Keyboard``; callers may modify it freely.
+
+    ``max_entries`` bounds the in-memory LRU tier. If ``directory`` is given, entries are also
+    written there as JSON, and the least recently used files are evicted beyond ``max_bytes``.
+    """
+    def __init__(self, max_entries: int = 1024, directory: Optional[str] = None, max_bytes: int = 256 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else os.path.join(directory, 'v' + __version__)
+        self._lru: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._disk_bytes = 0
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._disk_bytes = sum(e.stat().st_size for e in os.scandir(self.directory) if e.name.endswith(_SUFFIX))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'entries': len(self._lru),
+                'disk_bytes': self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def parse(self, text: str, compact: bool = False) -> Union[Keyboard, CompactKeyboard]:
+        return self._get(_digest('text', text.encode('utf-8')), lambda: parse(text), compact)
+
+    def deserialize(self, rows: List, compact: bool = False) -> Union[Keyboard, CompactKeyboard]:
+        canonical = json.dumps(rows, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return self._get(_digest('rows', canonical.encode('utf-8')), lambda: deserialize(rows), compact)
+
+    def _get(self, key: str, load, compact: bool) -> Union[Keyboard, CompactKeyboard]:
+        with self._lock:
+            packed = self._lru.get(key)
+            if packed is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+        if packed is None:
+            packed = self._disk_get(key)
+            if packed is None:
+                packed = _pack_keyboard(load())
+                with self._lock:
+                    self.misses += 1
+                self._disk_put(key, packed)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+            with self._lock:
+                self._lru[key] = packed
+                while len(self._lru) > self.max_entries:
+                    self._lru.popitem(last=False)
+                    self.evictions += 1
+        return _unpack_keyboard(packed, compact)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)  # type: ignore
+
+    def _disk_get(self, key: str) -> Any:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                packed = _from_json(json.loads(f.read()))
+        except (OSError, ValueError, TypeError, IndexError):
+            return None
+        try:
+            os.utime(path)  # for LRU eviction
+        except OSError:
+            pass
+        return packed
+
+    def _disk_put(self, key: str, packed: Any) -> None:
+        if self.directory is None:
+            return
+        data = json.dumps(packed, separators=(',', ':'), ensure_ascii=False, default=_json_default).encode('utf-8')
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            try:
+                replaced = os.stat(path).st_size  # the same entry, written by another cache or thread
+            except OSError:
+                replaced = 0
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.max_bytes:
+                self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for e in os.scandir(self.directory):
+            if e.name.endswith(_SUFFIX):
+                st = e.stat()
+                entries.append((st.st_mtime, st.st_size, e.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
+
+
+# Entries are stored as JSON rather than pickle, so that reading a cache directory never runs code.
+_SUFFIX = '.json'
+
+
+def _json_default(v: Any) -> Any:
+    if is_dataclass(v):
+        return asdict(v)
+    raise TypeError(type(v).__name__)
+
+
+def _from_json(data: Any) -> Any:
+    # Back to the packed tuples of bulk._pack_keyboard().
+    meta_values, keys = data
+    packed_keys = []
+    for t in keys:
+        t[_I_LABELS] = tuple(t[_I_LABELS])
+        t[_I_TEXT_COLOR] = tuple(t[_I_TEXT_COLOR])
+        t[_I_TEXT_SIZE] = tuple(t[_I_TEXT_SIZE])
+        t[_I_DEFAULT] = tuple(t[_I_DEFAULT])
+        packed_keys.append(tuple(t))
+    return tuple(meta_values), packed_keys
+
+
+def _digest(kind: str, data: bytes) -> str:
+    h = hashlib.sha256(kind.encode('ascii') + b'\0')
+    h.update(data)
+    return h.hexdigest()
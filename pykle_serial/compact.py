@@ -0,0 +1,180 @@
+from dataclasses import fields
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .serial import UB_LABEL_MAP, Key, KeyboardMetadata, _emit_key_labels, _inner_Key_default
+from .table import KeyTable, to_table
+
+if TYPE_CHECKING:
+    from .frozen import FrozenKeyboard
+
+
+# Measured with tracemalloc on CPython 3.11 (64 bit), full-size 104 key layout:
+#   Key          ~980 bytes / key
+#   CompactKey   ~410 bytes / key
+# See benchmarks/bench_compact.py.
+
+KEY_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(Key))
+
+_NONE_LABELS: Tuple[None, ...] = (None, ) * UB_LABEL_MAP
+
+
+class CompactKeyDefault:
+    """
+    Immutable counterpart of ``Key.default``. Instances are shared between keys.
+    """
+    __slots__ = ('textColor', 'textSize')
+
+    textColor: str
+    textSize: int
+
+    def __init__(self, textColor: str = "#000000", textSize: int = 3):
+        object.__setattr__(self, 'textColor', textColor)
+        object.__setattr__(self, 'textSize', textSize)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactKeyDefault is shared between keys and cannot be modified")
+
+    def __eq__(self, other):
+        if not isinstance(other, (CompactKeyDefault, _inner_Key_default)):
+            return NotImplemented
+        return self.textColor == other.textColor and self.textSize == other.textSize
+
+    def __hash__(self):
+        return hash((self.textColor, self.textSize))
+
+    def __repr__(self):
+        return 'CompactKeyDefault(textColor=%r, textSize=%r)' % (self.textColor, self.textSize)
+
+
+_default_pool: Dict[Tuple[str, int], CompactKeyDefault] = {}
+
+
+def _shared_default(textColor: str, textSize: int) -> CompactKeyDefault:
+    k = (textColor, textSize)
+    d = _default_pool.get(k)
+    if d is None:
+        d = _default_pool[k] = CompactKeyDefault(textColor, textSize)
+    return d
+
+
+def _compact_labels(labels: List) -> Tuple:
+    t = tuple(labels)
+    return _NONE_LABELS if t == _NONE_LABELS else t
+
+
+class CompactKey:
+    """
+    Memory-saving, read-mostly counterpart of ``Key``.
+
+    Same attribute names as ``Key``, but ``labels`` / ``textColor`` / ``textSize``
+    are tuples and ``default`` is a shared ``CompactKeyDefault``.
+    Use ``to_key()`` to get an ordinary ``Key``.
+    """
+    __slots__ = KEY_FIELDS
+
+    color: str
+    labels: Tuple[Optional[str], ...]
+    textColor: Tuple[Optional[str], ...]
+    textSize: Tuple[Optional[int], ...]
+    default: CompactKeyDefault
+    x: float
+    y: float
+    width: float
+    height: float
+    x2: float
+    y2: float
+    width2: float
+    height2: float
+    rotation_x: float
+    rotation_y: float
+    rotation_angle: float
+    decal: bool
+    ghost: bool
+    stepped: bool
+    nub: bool
+    profile: str
+    sm: str
+    sb: str
+    st: str
+
+    def __init__(self, **kwargs):
+        template = Key()
+        for name in KEY_FIELDS:
+            v = kwargs.pop(name) if name in kwargs else getattr(template, name)
+            setattr(self, name, v)
+        if kwargs:
+            raise TypeError("unexpected keyword argument(s): " + ", ".join(kwargs))
+        self.labels = _compact_labels(self.labels)
+        self.textColor = _compact_labels(self.textColor)
+        self.textSize = _compact_labels(self.textSize)
+        if not isinstance(self.default, CompactKeyDefault):
+            self.default = _shared_default(self.default.textColor, self.default.textSize)
+
+    @classmethod
+    def from_key(cls, key: Key) -> 'CompactKey':
+        return cls(**{name: getattr(key, name) for name in KEY_FIELDS})
+
+    def to_key(self) -> Key:
+        kwargs = {name: getattr(self, name) for name in KEY_FIELDS}
+        kwargs['labels'] = list(self.labels)
+        kwargs['textColor'] = list(self.textColor)
+        kwargs['textSize'] = list(self.textSize)
+        kwargs['default'] = _inner_Key_default(self.default.textColor, self.default.textSize)
+        return Key(**kwargs)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactKey):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in KEY_FIELDS)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return 'CompactKey(' + ', '.join('%s=%r' % (name, getattr(self, name)) for name in KEY_FIELDS) + ')'
+
+
+class CompactKeyboard:
+    __slots__ = ('meta', 'keys')
+
+    meta: KeyboardMetadata
+    keys: List[CompactKey]
+
+    def __init__(self, meta: Optional[KeyboardMetadata] = None, keys: Optional[List[CompactKey]] = None):
+        self.meta = KeyboardMetadata() if meta is None else meta
+        self.keys = [] if keys is None else keys
+
+    def to_table(self, use_numpy: Optional[bool] = None) -> KeyTable:
+        return to_table(self.keys, use_numpy)
+
+    def freeze(self) -> 'FrozenKeyboard':
+        from .frozen import freeze
+        return freeze(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactKeyboard):
+            return NotImplemented
+        return self.meta == other.meta and self.keys == other.keys
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return 'CompactKeyboard(meta=%r, keys=%r)' % (self.meta, self.keys)
+
+
+def _emit_compact_key(current: Key, labels: List, align: int, emit_labels: Callable = _emit_key_labels) -> CompactKey:
+    new_key: CompactKey = CompactKey.__new__(CompactKey)
+    for name in KEY_FIELDS:
+        setattr(new_key, name, getattr(current, name))
+    default = current.default
+    new_key.default = _shared_default(default.textColor, default.textSize)
+
+    # Calculate some generated values
+    if current.width2 == 0:
+        new_key.width2 = current.width
+    if current.height2 == 0:
+        new_key.height2 = current.height
+    labels, text_size, text_color = emit_labels(current, labels, align)
+    new_key.labels = _compact_labels(labels)
+    new_key.textSize = _compact_labels(text_size)
+    new_key.textColor = _compact_labels(text_color)
+    return new_key
@@ -0,0 +1,205 @@
+from dataclasses import dataclass, field, fields
+from math import floor, hypot
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .compact import KEY_FIELDS
+from .geometry import rotation_matrix
+from .serial import KeyboardMetadata
+from .table import NUMERIC_FIELDS
+
+META_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(KeyboardMetadata))
+
+_NUMERIC = frozenset(NUMERIC_FIELDS)
+_SEQUENCES = frozenset(('labels', 'textColor', 'textSize'))
+
+# Positions are compared at this number of decimal places, to absorb floating point noise.
+_DIGITS = 6
+
+
+class KeyChange(NamedTuple):
+    """
+    A key matched in both keyboards, with ``fields``: name -> (old value, new value).
+    """
+    a: int  # index in the keys of the old keyboard
+    b: int  # index in the keys of the new keyboard
+    fields: Dict[str, Tuple[Any, Any]]
+
+
+@dataclass
+class KeyboardDiff:
+    """
+    Result of ``diff()``. ``removed`` are indexes into the old keys, ``added`` into the new keys,
+    and ``matched`` holds every matched pair, changed or not.
+    """
+    meta: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    changed: List[KeyChange] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    added: List[int] = field(default_factory=list)
+    matched: List[Tuple[int, int]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.meta or self.changed or self.removed or self.added)
+
+
+def _center(key: Any) -> Tuple[float, float]:
+    # Center of the primary rect, rotated.
+    a, b, c, d, e, f = rotation_matrix(key.rotation_angle, key.rotation_x, key.rotation_y)
+    x = key.x + key.width / 2
+    y = key.y + key.height / 2
+    return a * x + b * y + e, c * x + d * y + f
+
+
+def _label_similarity(la: Sequence, lb: Sequence) -> float:
+    # Share of the label positions, used in either key, which hold the same label.
+    used = same = 0
+    for u, v in zip(la, lb):
+        if u is not None or v is not None:
+            used += 1
+            if u == v:
+                same += 1
+    return same / used if used else 1.
+
+
+def _normalize(name: str, v: Any) -> Any:
+    if name in _SEQUENCES:
+        return list(v)
+    if name == 'default':
+        return v.textColor, v.textSize
+    return v
+
+
+def _field_changes(ka: Any, kb: Any, names: Sequence[str], tolerance: float) -> Dict[str, Tuple[Any, Any]]:
+    changes: Dict[str, Tuple[Any, Any]] = {}
+    for name in names:
+        va = getattr(ka, name)
+        vb = getattr(kb, name)
+        if name in _NUMERIC:
+            if abs(va - vb) > tolerance:
+                changes[name] = (va, vb)
+        elif _normalize(name, va) != _normalize(name, vb):
+            changes[name] = (_normalize(name, va), _normalize(name, vb))
+    return changes
+
+
+def _greedy(candidates: List[Tuple[float, float, int, int]], match_a: List[int], match_b: List[int]) -> None:
+    # candidates: (distance, -label similarity, index a, index b). Best first.
+    candidates.sort()
+    for _, _, i, j in candidates:
+        if match_a[i] < 0 and match_b[j] < 0:
+            match_a[i] = j
+            match_b[j] = i
+
+
+def _match(keys_a: Sequence, keys_b: Sequence, max_distance: float) -> List[int]:  # noqa: C901
+    # Returns the index in keys_b matched to each key of keys_a, or -1.
+    centers_a = [_center(k) for k in keys_a]
+    centers_b = [_center(k) for k in keys_b]
+    labels_a = [k.labels for k in keys_a]
+    labels_b = [k.labels for k in keys_b]
+    match_a = [-1] * len(keys_a)
+    match_b = [-1] * len(keys_b)
+
+    # 1. Same rotated center and angle: the key has not moved.
+    def place(c: Tuple[float, float], key: Any) -> Tuple[float, float, float]:
+        return round(c[0], _DIGITS), round(c[1], _DIGITS), round(key.rotation_angle % 360, _DIGITS)
+
+    places_b: Dict[Tuple[float, float, float], List[int]] = {}
+    for j, key in enumerate(keys_b):
+        places_b.setdefault(place(centers_b[j], key), []).append(j)
+    places_a: Dict[Tuple[float, float, float], List[int]] = {}
+    for i, key in enumerate(keys_a):
+        places_a.setdefault(place(centers_a[i], key), []).append(i)
+    # Stacked keys, on either side, are paired by label similarity.
+    stacked: List[Tuple[float, float, int, int]] = []
+    for p, at_a in places_a.items():
+        at_b = places_b.get(p)
+        if at_b is None:
+            continue
+        if len(at_a) == 1 and len(at_b) == 1:
+            match_a[at_a[0]] = at_b[0]
+            match_b[at_b[0]] = at_a[0]
+        else:
+            stacked.extend((0., -_label_similarity(labels_a[i], labels_b[j]), i, j) for i in at_a for j in at_b)
+    _greedy(stacked, match_a, match_b)
+
+    # 2. Labels unique in both and not blank: the key has moved.
+    def by_labels(labels: List[Sequence], matched: List[int]) -> Dict[Tuple, int]:
+        d: Dict[Tuple, int] = {}
+        for i, ls in enumerate(labels):
+            if matched[i] < 0:
+                t = tuple(ls)
+                if any(t):
+                    d[t] = -1 if t in d else i
+        return d
+
+    unique_b = by_labels(labels_b, match_b)
+    for t, i in by_labels(labels_a, match_a).items():
+        j = unique_b.get(t, -1)
+        if i >= 0 and j >= 0:
+            match_a[i] = j
+            match_b[j] = i
+
+    # 3. The nearest within max_distance, label similarity breaking ties.
+    if max_distance > 0:
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for j, (x, y) in enumerate(centers_b):
+            if match_b[j] < 0:
+                cells.setdefault((floor(x / max_distance), floor(y / max_distance)), []).append(j)
+        candidates: List[Tuple[float, float, int, int]] = []
+        for i, (x, y) in enumerate(centers_a):
+            if match_a[i] >= 0:
+                continue
+            cx = floor(x / max_distance)
+            cy = floor(y / max_distance)
+            for gx in (cx - 1, cx, cx + 1):
+                for gy in (cy - 1, cy, cy + 1):
+                    for j in cells.get((gx, gy), ()):
+                        xb, yb = centers_b[j]
+                        dist = hypot(xb - x, yb - y)
+                        if dist <= max_distance:
+                            candidates.append((round(dist, _DIGITS), -_label_similarity(labels_a[i], labels_b[j]), i, j))
+        _greedy(candidates, match_a, match_b)
+    return match_a
+
+
+def diff(kbd_a: Any, kbd_b: Any, fields: Optional[Iterable[str]] = None, max_distance: float = 1.,
+         tolerance: float = 1e-9) -> KeyboardDiff:
+    """
+    Differences from ``kbd_a`` to ``kbd_b`` (``Keyboard``, ``CompactKeyboard`` or ``LazyKeyboard``).
+
+    Keys are matched by hashing: first those at the same rotated center and angle, then those
+    with the same labels (unique and not blank), then the nearest within ``max_distance`` units.
+    Label similarity breaks ties. The matched keys are compared on ``fields`` (default: all
+    the fields of ``Key``); numbers within ``tolerance`` are equal.
+    """
+    names: Tuple[str, ...] = KEY_FIELDS if fields is None else tuple(fields)
+    for name in names:
+        if name not in KEY_FIELDS:
+            raise ValueError("Error: unknown Key field " + repr(name))
+    ret = KeyboardDiff()
+    for name in META_FIELDS:
+        va = getattr(kbd_a.meta, name)
+        vb = getattr(kbd_b.meta, name)
+        if va != vb:
+            ret.meta[name] = (va, vb)
+
+    keys_a = list(kbd_a.keys)
+    keys_b = list(kbd_b.keys)
+    match_a = _match(keys_a, keys_b, max_distance)
+    get = attrgetter(*names)
+    matched_b = [False] * len(keys_b)
+    for i, j in enumerate(match_a):
+        if j < 0:
+            ret.removed.append(i)
+            continue
+        matched_b[j] = True
+        ret.matched.append((i, j))
+        ka = keys_a[i]
+        kb = keys_b[j]
+        if get(ka) != get(kb):
+            changes = _field_changes(ka, kb, names, tolerance)
+            if changes:
+                ret.changed.append(KeyChange(i, j, changes))
+    ret.added = [j for j, m in enumerate(matched_b) if not m]
+    return ret
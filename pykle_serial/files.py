@@ -0,0 +1,130 @@
+import gzip
+import mmap
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterator, List, Optional, Tuple, Union
+
+from .bulk import ItemError
+from .rawdata import loads
+from .serial import Keyboard, deserialize
+
+if TYPE_CHECKING:
+    from .compact import CompactKeyboard
+    from .intern import InternPool
+    from .lazy import LazyKeyboard
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Number of files read ahead of the parsing by load_dir().
+DEFAULT_PREFETCH = 8
+
+
+def _decode(data: Any) -> str:
+    # data: bytes or a buffer (mmap) of a file, gzip-compressed or not.
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    return str(data, 'utf-8-sig')
+
+
+def read_text(path_or_fileobj: Union[str, os.PathLike, IO]) -> str:
+    """
+    Text of a file (through ``mmap``) or of a file object, decompressed if it is gzip.
+    """
+    if not isinstance(path_or_fileobj, (str, os.PathLike)):
+        data = path_or_fileobj.read()
+        return data if isinstance(data, str) else _decode(data)
+    with open(path_or_fileobj, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with memoryview(m) as buf:
+                return _decode(buf)
+
+
+def _rows_of(data: Any) -> List:
+    # Rows out of what a file may hold: rows (the outer [] is already handled by loads()),
+    # a layout wrapped in a VIA / QMK definition, or a gist saved by KLE.
+    if not isinstance(data, dict):
+        return data
+    layouts = data.get('layouts')
+    if isinstance(layouts, dict) and isinstance(layouts.get('keymap'), list):
+        return layouts['keymap']
+    files = data.get('files')
+    if isinstance(files, dict):
+        for name, f in files.items():
+            if name.endswith('.kbd.json') and isinstance(f, dict) and isinstance(f.get('content'), str):
+                return _rows_of(loads(f['content']))
+        raise ValueError("Error: no *.kbd.json file in the gist")
+    return [data]  # metadata only
+
+
+def loads_text(text: str, compact: bool = False, pool: Optional['InternPool'] = None,
+               lazy: bool = False) -> Union[Keyboard, 'CompactKeyboard', 'LazyKeyboard']:
+    """
+    ``parse()`` which also accepts the rows wrapped by VIA / QMK (``layouts.keymap``) or by a KLE gist.
+    """
+    return deserialize(_rows_of(loads(text)), compact, pool, lazy=lazy)
+
+
+def load(path_or_fileobj: Union[str, os.PathLike, IO], compact: bool = False, pool: Optional['InternPool'] = None,
+         lazy: bool = False) -> Union[Keyboard, 'CompactKeyboard', 'LazyKeyboard']:
+    """
+    Loads a layout from a file path or a (text or binary) file object.
+
+    Files are read through ``mmap`` and decompressed if they are gzip. JSON, KLE raw data
+    (with or without the outer ``[]``) and JSON5 are accepted, as well as the rows wrapped
+    by VIA / QMK (``layouts.keymap``) or by a KLE gist (``files`` / ``*.kbd.json``).
+    """
+    return loads_text(read_text(path_or_fileobj), compact, pool, lazy)
+
+
+def _prefetch(paths: List[Path], q: 'queue.Queue', stop: threading.Event) -> None:
+    for path in paths:
+        try:
+            item: Tuple[bool, Any] = (True, read_text(path))
+        except Exception as e:
+            item = (False, e)
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        else:
+            return
+
+
+def load_dir(path: Union[str, os.PathLike], pattern: str = '*', compact: bool = False,
+             pool: Optional['InternPool'] = None, lazy: bool = False,
+             prefetch: int = DEFAULT_PREFETCH) -> Iterator[Tuple[Path, Any]]:
+    """
+    ``load()`` every file of the directory ``path`` matching the glob ``pattern``
+    (``'**/*.json'`` for subdirectories too), in name order.
+
+    Yields ``(path, keyboard)``. A file which fails gives ``ItemError`` instead of raising,
+    its ``index`` being the position of the file. Up to ``prefetch`` files are read ahead
+    by a thread, so the reads overlap with the parsing.
+    """
+    if prefetch < 1:
+        raise ValueError("Error: prefetch must be 1 or more")
+    paths = sorted(p for p in Path(path).glob(pattern) if p.is_file())
+    q: 'queue.Queue' = queue.Queue(prefetch)
+    stop = threading.Event()
+    reader = threading.Thread(target=_prefetch, args=(paths, q, stop), daemon=True)
+    reader.start()
+    try:
+        for i, p in enumerate(paths):
+            ok, v = q.get()
+            if ok:
+                try:
+                    v = loads_text(v, compact, pool, lazy)
+                except Exception as e:
+                    v = ItemError(i, type(e).__name__, str(e))
+            else:
+                v = ItemError(i, type(v).__name__, str(v))
+            yield p, v
+    finally:
+        stop.set()
+        reader.join()
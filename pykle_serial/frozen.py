@@ -0,0 +1,208 @@
+import hashlib
+from operator import attrgetter
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from .compact import KEY_FIELDS, CompactKeyDefault, _compact_labels, _shared_default
+from .serial import Key, Keyboard, KeyboardMetadata, _inner_Key_default
+from .table import FLAG_FIELDS, NUMERIC_FIELDS
+
+
+class FrozenKey(NamedTuple):
+    """
+    Immutable, hashable counterpart of ``Key``. ``labels`` / ``textColor`` / ``textSize`` are tuples,
+    ``default`` is a shared ``CompactKeyDefault`` and the numbers are floats.
+    """
+    color: str
+    labels: Tuple[Optional[str], ...]
+    textColor: Tuple[Optional[str], ...]
+    textSize: Tuple[Optional[int], ...]
+    default: CompactKeyDefault
+    x: float
+    y: float
+    width: float
+    height: float
+    x2: float
+    y2: float
+    width2: float
+    height2: float
+    rotation_x: float
+    rotation_y: float
+    rotation_angle: float
+    decal: bool
+    ghost: bool
+    stepped: bool
+    nub: bool
+    profile: str
+    sm: str
+    sb: str
+    st: str
+
+    def to_key(self) -> Key:
+        key: Key = Key.__new__(Key)
+        d = self._asdict()
+        d['labels'] = list(self.labels)
+        d['textColor'] = list(self.textColor)
+        d['textSize'] = list(self.textSize)
+        d['default'] = _inner_Key_default(self.default.textColor, self.default.textSize)
+        key.__dict__ = d
+        return key
+
+
+class FrozenMetadata(NamedTuple):
+    """
+    Immutable counterpart of ``KeyboardMetadata``. ``background`` is the sorted ``(name, value)``
+    pairs of the background, or ``None``.
+    """
+    author: str
+    backcolor: str
+    background: Optional[Tuple[Tuple[str, Any], ...]]
+    name: str
+    notes: str
+    radii: str
+    switchBrand: str
+    switchMount: str
+    switchType: str
+
+    def to_metadata(self) -> KeyboardMetadata:
+        d = self._asdict()
+        if self.background is not None:
+            d['background'] = dict(self.background)
+        return KeyboardMetadata(**d)
+
+
+# freeze_key() relies on this layout of KEY_FIELDS: color, the 3 label lists, default, the numbers,
+# the flags, then the strings. tests/test_frozen.py checks it.
+_get_key_fields = attrgetter(*KEY_FIELDS)
+_I_NUMERIC = KEY_FIELDS.index(NUMERIC_FIELDS[0])
+_J_NUMERIC = _I_NUMERIC + len(NUMERIC_FIELDS)
+_J_FLAGS = _J_NUMERIC + len(FLAG_FIELDS)
+_I_LABELS = KEY_FIELDS.index('labels')
+_I_TEXT_COLOR = KEY_FIELDS.index('textColor')
+_I_TEXT_SIZE = KEY_FIELDS.index('textSize')
+_I_DEFAULT = KEY_FIELDS.index('default')
+_new_tuple = tuple.__new__
+_PLAIN_SIZE_TYPES = frozenset((int, type(None)))
+_BOOL_TYPES = frozenset((bool, ))
+
+
+def _text_size(v: Any) -> Any:
+    # 4 and 4.0 are the same size, and must give the same repr for fingerprint().
+    if v is None or type(v) is int:
+        return v
+    return int(v) if v == int(v) else float(v)
+
+
+def freeze_key(key: Any) -> FrozenKey:
+    """
+    ``FrozenKey`` of a ``Key``, ``CompactKey`` or ``KeyProxy``.
+
+    Values are normalized so that equal keys have the same repr: numbers are floats (1 and 1.0,
+    -0.0 and 0.0 are the same), whole text sizes are ints and flags are bools.
+    """
+    values = _get_key_fields(key)
+    default = values[_I_DEFAULT]
+    text_size = values[_I_TEXT_SIZE]
+    if not _PLAIN_SIZE_TYPES.issuperset(map(type, text_size)):
+        text_size = [_text_size(v) for v in text_size]
+    flags = values[_J_NUMERIC:_J_FLAGS]
+    if not _BOOL_TYPES.issuperset(map(type, flags)):
+        flags = tuple(map(bool, flags))
+    return _new_tuple(FrozenKey, (
+        *values[:_I_LABELS],
+        _compact_labels(values[_I_LABELS]),
+        _compact_labels(values[_I_TEXT_COLOR]),
+        _compact_labels(text_size),
+        _shared_default(default.textColor, _text_size(default.textSize)),
+        *[float(v) + 0. for v in values[_I_NUMERIC:_J_NUMERIC]],
+        *flags,
+        *values[_J_FLAGS:],
+    ))
+
+
+def freeze_meta(meta: KeyboardMetadata) -> FrozenMetadata:
+    background = meta.background
+    if background is not None:
+        # deserialize() leaves the background as a dict
+        background = tuple(sorted((asdict(background) if is_dataclass(background) else background).items()))
+    return FrozenMetadata(meta.author, meta.backcolor, background, meta.name, meta.notes, meta.radii,
+                          meta.switchBrand, meta.switchMount, meta.switchType)
+
+
+class FrozenKeyboard:
+    """
+    Immutable, hashable snapshot of a keyboard, from ``Keyboard.freeze()``.
+    The hash and the fingerprints are computed once and cached.
+    """
+    __slots__ = ('meta', 'keys', '_hash', '_fingerprints')
+
+    meta: FrozenMetadata
+    keys: Tuple[FrozenKey, ...]
+
+    def __init__(self, meta: FrozenMetadata, keys: Tuple[FrozenKey, ...]):
+        object.__setattr__(self, 'meta', meta)
+        object.__setattr__(self, 'keys', keys)
+        object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, '_fingerprints', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenKeyboard cannot be modified")
+
+    def __hash__(self):
+        h = self._hash
+        if h is None:
+            h = hash((self.meta, self.keys))
+            object.__setattr__(self, '_hash', h)
+        return h
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenKeyboard):
+            return NotImplemented
+        return self is other or (hash(self) == hash(other) and self.meta == other.meta and self.keys == other.keys)
+
+    def __repr__(self):
+        return 'FrozenKeyboard(meta=%r, keys=%r)' % (self.meta, self.keys)
+
+    def fingerprint(self, ignore_meta: bool = False) -> str:
+        """
+        Canonical hex digest of the keys, in any order, and of the metadata unless ``ignore_meta``.
+        Stable across processes and versions of Python, unlike ``hash()``.
+        """
+        fingerprints: Dict[bool, str] = self._fingerprints
+        fp = fingerprints.get(ignore_meta)
+        if fp is None:
+            h = hashlib.blake2b(digest_size=16)
+            if not ignore_meta:
+                h.update(hashlib.blake2b(tuple.__repr__(self.meta).encode('utf-8'), digest_size=16).digest())
+            h.update(b''.join(sorted(map(_key_digest, self.keys))))
+            fp = fingerprints[ignore_meta] = h.hexdigest()
+        return fp
+
+    def to_keyboard(self) -> Keyboard:
+        return Keyboard(self.meta.to_metadata(), [k.to_key() for k in self.keys])
+
+
+# Digest of the canonical text of a key, for fingerprint(). Keys repeat a lot across layouts,
+# and formatting the floats costs over 10 times the hash lookup. Keys are looked up by equality,
+# which is safe as freeze_key() gives equal keys the same repr.
+_MAX_KEY_DIGESTS = 1 << 16
+_key_digests: Dict[FrozenKey, bytes] = {}
+
+
+def _key_digest(key: FrozenKey) -> bytes:
+    r = _key_digests.get(key)
+    if r is None:
+        default = key.default
+        text = tuple.__repr__(key[:_I_DEFAULT] + ((default.textColor, default.textSize), ) + key[_I_DEFAULT + 1:])
+        r = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        if len(_key_digests) >= _MAX_KEY_DIGESTS:
+            _key_digests.clear()
+        _key_digests[key] = r
+    return r
+
+
+def freeze(keyboard: Any) -> FrozenKeyboard:
+    """
+    ``FrozenKeyboard`` of a ``Keyboard``, ``CompactKeyboard`` or ``LazyKeyboard``.
+    """
+    return FrozenKeyboard(freeze_meta(keyboard.meta), tuple(map(freeze_key, keyboard.keys)))
@@ -0,0 +1,132 @@
+from functools import lru_cache
+from math import cos, radians, sin
+from typing import Any, List, Optional, Tuple
+
+from .table import KeyTable, np
+
+
+# Corner order is top-left, top-right, bottom-right, bottom-left (before rotation).
+# Rotation is clockwise in KLE coordinates (y grows downward), around (rotation_x, rotation_y).
+
+Point = Tuple[float, float]
+Polygon = Tuple[Point, Point, Point, Point]
+Rect = Tuple[float, float, float, float]  # min_x, min_y, max_x, max_y
+
+
+@lru_cache(maxsize=1024)
+def rotation_matrix(angle: float, origin_x: float = 0., origin_y: float = 0.) -> Tuple[float, float, float, float, float, float]:
+    """
+    Returns the affine transform ``(a, b, c, d, e, f)`` of the rotation:
+    ``x' = a * x + b * y + e``, ``y' = c * x + d * y + f``.
+    """
+    r = radians(angle)
+    cs = cos(r)
+    sn = sin(r)
+    return cs, -sn, sn, cs, origin_x - cs * origin_x + sn * origin_y, origin_y - sn * origin_x - cs * origin_y
+
+
+def _as_table(keyboard: Any, use_numpy: Optional[bool]) -> KeyTable:
+    if isinstance(keyboard, KeyTable):
+        return keyboard
+    return keyboard.to_table(use_numpy)
+
+
+def _rotation_np(table: KeyTable) -> Tuple[Any, Any]:
+    # cos / sin are computed once per distinct angle and broadcast to the keys.
+    angles, inverse = np.unique(table.rotation_angle, return_inverse=True)
+    r = np.radians(angles)
+    return np.cos(r)[inverse], np.sin(r)[inverse]
+
+
+def _corner_xy_np(table: KeyTable, cs: Any, sn: Any, x: Any, y: Any, w: Any, h: Any) -> Tuple[Any, Any]:
+    # Returns x and y of the corners, both of shape (4, n).
+    rx = table.rotation_x
+    ry = table.rotation_y
+    px = np.stack([x, x + w, x + w, x]) - rx
+    py = np.stack([y, y, y + h, y + h]) - ry
+    return rx + cs * px - sn * py, ry + sn * px + cs * py
+
+
+def _corner_xy_both_np(table: KeyTable) -> Tuple[Tuple[Any, Any], Tuple[Any, Any]]:
+    cs, sn = _rotation_np(table)
+    return (
+        _corner_xy_np(table, cs, sn, table.x, table.y, table.width, table.height),
+        _corner_xy_np(table, cs, sn, table.x + table.x2, table.y + table.y2, table.width2, table.height2))
+
+
+def _to_polygons_np(cx: Any, cy: Any) -> Any:
+    return np.stack([cx.T, cy.T], axis=2)
+
+
+def _rects_py(table: KeyTable, secondary: bool) -> Any:
+    if secondary:
+        return zip([x + x2 for x, x2 in zip(table.x, table.x2)], [y + y2 for y, y2 in zip(table.y, table.y2)],
+                   table.width2, table.height2)
+    return zip(table.x, table.y, table.width, table.height)
+
+
+def _corners_py(table: KeyTable, secondary: bool) -> List[Polygon]:
+    ret: List[Polygon] = []
+    for (x, y, w, h), angle, rx, ry in zip(
+            _rects_py(table, secondary), table.rotation_angle, table.rotation_x, table.rotation_y):
+        a, b, c, d, e, f = rotation_matrix(angle, rx, ry)
+        x1 = x + w
+        y1 = y + h
+        ret.append((
+            (a * x + b * y + e, c * x + d * y + f),
+            (a * x1 + b * y + e, c * x1 + d * y + f),
+            (a * x1 + b * y1 + e, c * x1 + d * y1 + f),
+            (a * x + b * y1 + e, c * x + d * y1 + f)))
+    return ret
+
+
+def corners(keyboard: Any, use_numpy: Optional[bool] = None) -> Tuple[Any, Any]:
+    """
+    Returns the rotated corners of the primary rects and of the secondary rects
+    (``x2`` / ``y2`` / ``width2`` / ``height2``) of all keys.
+
+    ``keyboard`` is ``Keyboard``, ``CompactKeyboard`` or ``KeyTable``.
+    With NumPy, both are float64 arrays of shape ``(n, 4, 2)``.
+    Without NumPy, both are lists of 4-tuples of ``(x, y)``.
+    """
+    table = _as_table(keyboard, use_numpy)
+    if table.backend == 'numpy':
+        primary, secondary = _corner_xy_both_np(table)
+        return _to_polygons_np(*primary), _to_polygons_np(*secondary)
+    return _corners_py(table, False), _corners_py(table, True)
+
+
+def bounding_boxes(keyboard: Any, use_numpy: Optional[bool] = None) -> Any:
+    """
+    Returns the axis-aligned bounding box ``(min_x, min_y, max_x, max_y)`` of each key,
+    covering both the primary and the secondary rect.
+
+    With NumPy, a float64 array of shape ``(n, 4)``. Without NumPy, a list of tuples.
+    """
+    table = _as_table(keyboard, use_numpy)
+    if table.backend == 'numpy':
+        (px, py), (sx, sy) = _corner_xy_both_np(table)
+        return np.stack([
+            np.minimum(px.min(axis=0), sx.min(axis=0)),
+            np.minimum(py.min(axis=0), sy.min(axis=0)),
+            np.maximum(px.max(axis=0), sx.max(axis=0)),
+            np.maximum(py.max(axis=0), sy.max(axis=0))], axis=1)
+    primary, secondary = corners(table)
+    ret: List[Rect] = []
+    for p, s in zip(primary, secondary):
+        xs = (p[0][0], p[1][0], p[2][0], p[3][0], s[0][0], s[1][0], s[2][0], s[3][0])
+        ys = (p[0][1], p[1][1], p[2][1], p[3][1], s[0][1], s[1][1], s[2][1], s[3][1])
+        ret.append((min(xs), min(ys), max(xs), max(ys)))
+    return ret
+
+
+def extents(keyboard: Any, use_numpy: Optional[bool] = None) -> Optional[Rect]:
+    """
+    Returns ``(min_x, min_y, max_x, max_y)`` of the whole layout, or ``None`` if it has no keys.
+    """
+    boxes = bounding_boxes(keyboard, use_numpy)
+    if len(boxes) == 0:
+        return None
+    if np is not None and isinstance(boxes, np.ndarray):
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].min()), float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
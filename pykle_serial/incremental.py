@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
+
+from .compact import CompactKeyboard
+from .serial import (Key, Keyboard, KeyboardMetadata, _Cluster, _deserialize_error, _inner_Key_default, _iter_deserialize,
+                     _key_emitter)
+
+if TYPE_CHECKING:
+    from .intern import InternPool
+
+
+# Parser state at a row boundary: current, cluster x, cluster y, align.
+_State = Tuple[Key, float, float, int]
+
+
+def _copy_key(key: Key) -> Key:
+    c: Key = Key.__new__(Key)
+    d = key.__dict__.copy()
+    d['labels'] = list(key.labels)
+    d['textColor'] = list(key.textColor)
+    d['textSize'] = list(key.textSize)
+    d['default'] = _inner_Key_default(key.default.textColor, key.default.textSize)
+    c.__dict__ = d
+    return c
+
+
+def _snapshot(current: Key, cluster: _Cluster, align: int) -> _State:
+    return _copy_key(current), cluster.x, cluster.y, align
+
+
+_INITIAL_STATE: _State = _snapshot(Key(), _Cluster(), 4)
+
+
+class _Converged(Exception):
+    # Raised from the checkpoint to stop re-deserialization.
+    def __init__(self, row: int):
+        self.row = row
+
+
+class IncrementalKeyboard:
+    """
+    ``Keyboard`` kept up to date with edits to its rows, for live editors.
+
+    The parser state is saved at each row boundary. An edit resumes from the state before the
+    first edited row, and stops as soon as the state after an edited row is the same as before
+    the edit: the following keys are reused as they are. So the cost follows the edited rows,
+    not the size of the layout.
+
+    ``keyboard`` is updated in place. Its keys must not be modified by the caller.
+    """
+    def __init__(self, rows: List, compact: bool = False, pool: Optional['InternPool'] = None):
+        if not isinstance(rows, List):
+            _deserialize_error("expected an array of objects", rows)
+        self._emit_key = _key_emitter(compact, pool)
+        self.rows: List = []
+        self.keyboard: Union[Keyboard, CompactKeyboard] = CompactKeyboard() if compact else Keyboard()
+        self._states: List[_State] = []  # before row i, and after the last row
+        self._key_starts: List[int] = []  # index of the first key of row i, and the number of keys
+        self.rows_processed = 0  # by the last edit, for diagnostics
+        self._rebuild(list(rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _row_index(self, r: int) -> int:
+        # Index of an existing row, as for a list: negative indexes count from the end.
+        n = len(self.rows)
+        if not -n <= r < n:
+            raise IndexError("row index out of range")
+        return r + n if r < 0 else r
+
+    def set_row(self, r: int, row: Any) -> None:
+        r = self._row_index(r)
+        self.replace_rows(r, r + 1, [row])
+
+    def insert_row(self, r: int, row: Any) -> None:
+        self.replace_rows(r, r, [row])
+
+    def delete_row(self, r: int) -> None:
+        r = self._row_index(r)
+        self.replace_rows(r, r + 1, [])
+
+    def keys_of_row(self, r: int) -> List[Any]:
+        return self.keyboard.keys[self._key_starts[r]:self._key_starts[r + 1]]
+
+    def replace_rows(self, start: int, stop: int, new_rows: Sequence) -> None:
+        """
+        Replaces ``rows[start:stop]`` with ``new_rows`` and updates ``keyboard``.
+        On ``ValueError``, nothing is changed.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self.rows))
+        stop = max(start, stop)
+        new_rows = list(new_rows)
+        old_rows = self.rows
+        rows = old_rows[:start] + new_rows + old_rows[stop:]
+        if start == 0 and (old_rows[:1] != rows[:1] and any(isinstance(r, dict) for r in old_rows[:1] + rows[:1])):
+            # The metadata has changed.
+            self._rebuild(rows)
+            return
+
+        delta = len(new_rows) - (stop - start)
+        old_states = self._states
+        old_key_starts = self._key_starts
+        states = old_states[:start + 1]
+        key_starts = old_key_starts[:start + 1]
+        keys = self.keyboard.keys[:old_key_starts[start]]
+        first_unchanged = start + len(new_rows)  # index in rows
+
+        def checkpoint(r: int, current: Key, cluster: _Cluster, align: int) -> None:
+            state = _snapshot(current, cluster, align)
+            if r + 1 >= first_unchanged and state == old_states[r + 1 - delta]:
+                raise _Converged(r + 1)
+            states.append(state)
+            key_starts.append(len(keys))
+
+        current, cx, cy, align = states[start]
+        cluster = _Cluster(cx, cy)
+        it = _iter_deserialize(rows[start:], self._emit_key, (_copy_key(current), cluster, align, start), checkpoint)
+        try:
+            for k in it:
+                if isinstance(k, KeyboardMetadata):  # rows[0] is the metadata, and is not changed
+                    continue
+                keys.append(k)
+            self.rows_processed = len(rows) - start
+        except _Converged as e:
+            old = e.row - delta
+            offset = len(keys) - old_key_starts[old]
+            keys.extend(self.keyboard.keys[old_key_starts[old]:])
+            states.extend(old_states[old:])
+            key_starts.extend(ks + offset for ks in old_key_starts[old:])
+            self.rows_processed = e.row - start
+        self.rows = rows
+        self._states = states
+        self._key_starts = key_starts
+        self.keyboard.keys = keys
+
+    def _rebuild(self, rows: List) -> None:
+        states: List[_State] = [_INITIAL_STATE]
+        key_starts = [0]
+        keys: List[Any] = []
+
+        def checkpoint(r: int, current: Key, cluster: _Cluster, align: int) -> None:
+            states.append(_snapshot(current, cluster, align))
+            key_starts.append(len(keys))
+
+        it = _iter_deserialize(rows, self._emit_key, checkpoint=checkpoint)
+        meta = next(it)
+        for k in it:
+            keys.append(k)
+        self.rows = rows
+        self._states = states
+        self._key_starts = key_starts
+        self.keyboard.meta = meta
+        self.keyboard.keys = keys
+        self.rows_processed = len(rows)
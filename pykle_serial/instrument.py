@@ -0,0 +1,136 @@
+from collections import Counter
+from functools import partial
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .compact import CompactKeyboard, _emit_compact_key
+from .rawdata import loads_with_tier
+from .serial import (Key, Keyboard, _cleanup_key_labels, _deserialize_error, _emit_key, _iter_deserialize,
+                     _reorder_key_labels)
+
+if TYPE_CHECKING:
+    from .intern import InternPool
+
+
+PHASES: Tuple[str, ...] = ('decode', 'row_walk', 'key_clone', 'reorder_labels', 'cleanup', 'total')
+
+
+class DeserializeStats:
+    """
+    Instrumentation of ``deserialize(rows, stats=...)`` / ``parse(text, stats=...)``.
+
+    Accumulates over calls: seconds per phase, rows processed, keys emitted, and the count
+    of each property key (``a``, ``f``, ``t``, ``r``, ...) in the rows. The phases are:
+
+    - ``decode``: JSON / KLE raw data / JSON5 decoding (``parse()`` only)
+    - ``row_walk``: the rows and property dicts, apart from the keys emitted
+    - ``key_clone``: the copy of the running state to each key
+    - ``reorder_labels``: ``reorder_labels_in()`` of labels and text sizes
+    - ``cleanup``: dropping text sizes / colors equal to the defaults
+    - ``total``: whole calls
+
+    If ``sink`` is given, it is called with this object after each call.
+    Without ``stats``, ``deserialize()`` / ``parse()`` run no instrumentation code at all.
+    """
+    def __init__(self, sink: Optional[Callable[['DeserializeStats'], None]] = None):
+        self.sink = sink
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.rows = 0
+        self.keys = 0
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.)
+        self.properties: Counter = Counter()
+        self.decode_tiers: Counter = Counter()
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        """
+        Flat ``{metric name: value}``, for example ``seconds.row_walk`` or ``properties.a``.
+        """
+        ret: Dict[str, Union[int, float]] = {'calls': self.calls, 'rows': self.rows, 'keys': self.keys}
+        for name, v in self.seconds.items():
+            ret['seconds.' + name] = v
+        for name, n in sorted(self.properties.items()):
+            ret['properties.' + name] = n
+        for name, n in sorted(self.decode_tiers.items()):
+            ret['decode_tier.' + name] = n
+        return ret
+
+    def __repr__(self):
+        return 'DeserializeStats(%r)' % self.as_dict()
+
+
+def _emit_key_labels_timed(current: Key, labels: List, align: int, seconds: Dict[str, float]) -> Tuple[List, List, List]:
+    # serial._emit_key_labels(), with its two steps timed.
+    t0 = perf_counter()
+    labels, text_size, text_color = _reorder_key_labels(current, labels, align)
+    t1 = perf_counter()
+    _cleanup_key_labels(current, labels, text_size, text_color)
+    seconds['reorder_labels'] += t1 - t0
+    seconds['cleanup'] += perf_counter() - t1
+    return labels, text_size, text_color
+
+
+def _counted_rows(rows: Iterable, stats: DeserializeStats, own: List[float]) -> Iterator:
+    # Counts rows and property keys. own[0] is the time spent here.
+    properties = stats.properties
+    for row in rows:
+        t0 = perf_counter()
+        stats.rows += 1
+        if isinstance(row, list):
+            for item in row:
+                if isinstance(item, dict):
+                    properties.update(item.keys())
+        own[0] += perf_counter() - t0
+        yield row
+
+
+def _deserialize(rows: Any, compact: bool, pool: Optional['InternPool'], stats: DeserializeStats,
+                 decode_seconds: float = 0.) -> Union[Keyboard, CompactKeyboard]:
+    t_start = perf_counter()
+    if not isinstance(rows, List):
+        _deserialize_error("expected an array of objects", rows)
+    seconds = stats.seconds
+    reorder_before = seconds['reorder_labels']
+    cleanup_before = seconds['cleanup']
+    emit_labels = partial(_emit_key_labels_timed, seconds=seconds)
+    if compact:
+        emit_key: Callable = partial(_emit_compact_key, emit_labels=emit_labels)
+    else:
+        emit_key = partial(_emit_key, emit_labels=emit_labels)
+    if pool is not None:
+        emit_key = pool.wrap(emit_key)
+    emitting = [0.]
+
+    def timed_emit_key(current: Key, labels: List, align: int) -> Any:
+        t0 = perf_counter()
+        key = emit_key(current, labels, align)
+        emitting[0] += perf_counter() - t0
+        return key
+
+    counting = [0.]
+    it = _iter_deserialize(_counted_rows(rows, stats, counting), timed_emit_key)
+    meta = next(it)
+    keys = list(it)
+    t_end = perf_counter()
+
+    labels_seconds = seconds['reorder_labels'] - reorder_before + seconds['cleanup'] - cleanup_before
+    seconds['key_clone'] += emitting[0] - labels_seconds
+    seconds['row_walk'] += t_end - t_start - emitting[0] - counting[0]
+    seconds['decode'] += decode_seconds
+    seconds['total'] += t_end - t_start + decode_seconds
+    stats.keys += len(keys)
+    stats.calls += 1
+    kbd: Union[Keyboard, CompactKeyboard] = CompactKeyboard(meta, keys) if compact else Keyboard(meta, keys)
+    if stats.sink is not None:
+        stats.sink(stats)
+    return kbd
+
+
+def _parse(text: str, compact: bool, pool: Optional['InternPool'], stats: DeserializeStats) -> Union[Keyboard, CompactKeyboard]:
+    t0 = perf_counter()
+    rows, tier = loads_with_tier(text)
+    decode_seconds = perf_counter() - t0
+    stats.decode_tiers[tier] += 1
+    return _deserialize(rows, compact, pool, stats, decode_seconds)
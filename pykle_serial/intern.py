@@ -0,0 +1,118 @@
+import sys
+from typing import Any, Callable, Dict, Tuple, Union
+
+from .serial import Key
+
+_STR_FIELDS: Tuple[str, ...] = ('color', 'profile', 'sm', 'sb', 'st')
+
+
+class InternPool:
+    """
+    Pool of shared strings and tuples for ``deserialize(rows, pool=...)``.
+
+    Equal ``color`` / ``profile`` / ``sm`` / ``sb`` / ``st`` values and labels become the same
+    string object. ``CompactKey`` also shares equal ``labels`` / ``textColor`` / ``textSize``
+    tuples. ``Key`` keeps its own lists, because they are mutable; only their strings are shared.
+
+    Use one pool per call, or pass the same pool to a whole batch to share values across keyboards.
+    """
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._tuples: Dict[Tuple, Tuple] = {}
+        self.lookups = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def intern_str(self, s: str) -> str:
+        self.lookups += 1
+        v = self._strings.setdefault(s, s)
+        if v is not s:
+            self.hits += 1
+            self.bytes_saved += sys.getsizeof(s)
+        return v
+
+    def intern_tuple(self, t: Tuple) -> Tuple:
+        """
+        Returns the pooled tuple equal to ``t``. Its strings are pooled too.
+        """
+        p = self._pooled_tuple(t)
+        if p is not t:
+            self.bytes_saved += sys.getsizeof(t)
+        return p
+
+    def _pooled_tuple(self, t: Tuple) -> Tuple:
+        # bytes_saved counts the replaced strings only, as t may be a temporary.
+        self.lookups += 1
+        p = self._tuples.get(t)
+        if p is None:
+            intern_str = self.intern_str
+            p = tuple(intern_str(v) if v.__class__ is str else v for v in t)
+            self._tuples[p] = p
+        elif p is not t:
+            self.hits += 1
+            for a, b in zip(t, p):
+                if a is not b:
+                    self.bytes_saved += sys.getsizeof(a)
+        return p
+
+    def intern_key(self, key: Any) -> Any:
+        """
+        Replaces the values of ``key`` (``Key`` or ``CompactKey``) with pooled ones, in place.
+        Returns ``key``.
+        """
+        setdefault = self._strings.setdefault
+        lookups = hits = saved = 0
+        for name in _STR_FIELDS:
+            v = getattr(key, name)
+            if v.__class__ is str:
+                lookups += 1
+                p = setdefault(v, v)
+                if p is not v:
+                    setattr(key, name, p)
+                    hits += 1
+                    saved += sys.getsizeof(v)
+        self.lookups += lookups
+        self.hits += hits
+        self.bytes_saved += saved
+        if isinstance(key, Key):
+            # Lists are mutable: each key keeps its own, filled with pooled strings.
+            pooled_tuple = self._pooled_tuple
+            key.labels = list(pooled_tuple(tuple(key.labels)))
+            key.textColor = list(pooled_tuple(tuple(key.textColor)))
+            key.default.textColor = self.intern_str(key.default.textColor)
+        else:
+            intern_tuple = self.intern_tuple
+            key.labels = intern_tuple(key.labels)
+            key.textColor = intern_tuple(key.textColor)
+            key.textSize = intern_tuple(key.textSize)
+        return key
+
+    def wrap(self, emit_key: Callable) -> Callable:
+        # Wraps the key emitter of _iter_deserialize().
+        intern_key = self.intern_key
+
+        def emit(current: Key, labels, align: int):
+            return intern_key(emit_key(current, labels, align))
+        return emit
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        ``lookups``: values passed through the pool, ``hits``: of them, those replaced by a pooled
+        equal value, ``unique``: pooled strings and tuples (label / text color / text size sets),
+        ``dedup_ratio``: ``lookups / unique``, ``bytes_saved``: ``sys.getsizeof()`` of the replaced values.
+        """
+        unique = len(self._strings) + len(self._tuples)
+        return {
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'unique': unique,
+            'strings': len(self._strings),
+            'tuples': len(self._tuples),
+            'dedup_ratio': self.lookups / unique if unique else 1.,
+            'bytes_saved': self.bytes_saved,
+        }
+
+    def clear(self) -> None:
+        self._strings.clear()
+        self._tuples.clear()
+        self.lookups = self.hits = self.bytes_saved = 0
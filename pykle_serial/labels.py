@@ -0,0 +1,162 @@
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# Labels are HTML fragments. Both conversions are memoized by the raw fragment,
+# as the same fragments repeat across keys and layouts.
+
+CACHE_SIZE = 1 << 16
+
+# Elements without content nor end tag.
+_VOID = frozenset(('area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source',
+                   'track', 'wbr'))
+
+
+class Run(NamedTuple):
+    """
+    A piece of label text with its style. ``icon`` is the ``class`` of an icon font element
+    like ``<i class='kb kb-Arrows-Up'></i>``, whose ``text`` is empty.
+    """
+    text: str
+    bold: bool = False
+    italic: bool = False
+    icon: Optional[str] = None
+
+
+def to_text(fragment: Optional[str]) -> Optional[str]:
+    """
+    Plain text of a label: tags removed, ``<br>`` as ``'\\n'``, entities decoded,
+    ``&nbsp;`` as a space. ``None`` stays ``None``. The text of ``to_runs()``, joined.
+    """
+    if fragment is None:
+        return None
+    if '<' not in fragment and '&' not in fragment:
+        return fragment
+    return _to_text(fragment)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _to_text(fragment: str) -> str:
+    # The text of the runs, so that both APIs read the fragment alike.
+    return ''.join(run.text for run in _to_runs(fragment))
+
+
+class _RunParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.runs: List[Run] = []
+        self.bold = 0
+        self.italic = 0
+        self.stack: List[Tuple[str, str]] = []  # open tags, and what each changed: 'b', 'i', 'icon' or ''
+
+    def _append(self, text: str, icon: Optional[str] = None) -> None:
+        bold = self.bold > 0
+        italic = self.italic > 0
+        runs = self.runs
+        if icon is None and runs and runs[-1].icon is None and runs[-1].bold == bold and runs[-1].italic == italic:
+            runs[-1] = Run(runs[-1].text + text, bold, italic)
+        else:
+            runs.append(Run(text, bold, italic, icon))
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'br':
+            self._append('\n')
+            return
+        if tag in _VOID:
+            return
+        cls = dict(attrs).get('class')
+        if tag == 'i' and cls:
+            self._append('', cls)
+            self.stack.append((tag, 'icon'))
+        elif tag in ('b', 'strong'):
+            self.bold += 1
+            self.stack.append((tag, 'b'))
+        elif tag in ('i', 'em'):
+            self.italic += 1
+            self.stack.append((tag, 'i'))
+        else:
+            self.stack.append((tag, ''))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br':
+            self._append('\n')
+        elif tag == 'i' and dict(attrs).get('class'):
+            self._append('', dict(attrs)['class'])
+
+    def handle_endtag(self, tag):
+        # Closes the innermost open ``tag``, and the tags left open inside it. Stray end tags are ignored.
+        stack = self.stack
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(stack) > depth:
+            kind = stack.pop()[1]
+            if kind == 'b':
+                self.bold -= 1
+            elif kind == 'i':
+                self.italic -= 1
+
+    def handle_data(self, data):
+        self._append(data.replace('\xa0', ' '))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _to_runs(fragment: str) -> Tuple[Run, ...]:
+    parser = _RunParser()
+    parser.feed(fragment)
+    parser.close()
+    return tuple(parser.runs)
+
+
+def to_runs(fragment: Optional[str]) -> Tuple[Run, ...]:
+    """
+    Styled runs of a label: ``<b>`` / ``<strong>`` bold, ``<i>`` / ``<em>`` italic, ``<br>`` as ``'\\n'``
+    and icon font elements as ``Run('', icon=...)``. Other tags are dropped, their text kept.
+    """
+    if not fragment:
+        return ()
+    if '<' not in fragment and '&' not in fragment:
+        return (Run(fragment), )
+    return _to_runs(fragment)
+
+
+def key_texts(key: Any) -> List[Optional[str]]:
+    """
+    Plain text of the 12 labels of ``key`` (``Key``, ``CompactKey`` or ``KeyProxy``).
+    """
+    return [to_text(label) for label in key.labels]
+
+
+def keyboard_texts(keyboard: Any) -> List[List[Optional[str]]]:
+    """
+    ``key_texts()`` of all the keys of ``keyboard``.
+    """
+    return [[to_text(label) for label in key.labels] for key in keyboard.keys]
+
+
+def iter_texts(keyboards: Iterable[Any]) -> Iterator[List[List[Optional[str]]]]:
+    """
+    ``keyboard_texts()`` of each keyboard of a corpus, sharing the cache.
+    """
+    for keyboard in keyboards:
+        yield keyboard_texts(keyboard)
+
+
+def cache_info() -> dict:
+    """
+    Hits, misses and sizes of the ``to_text()`` / ``to_runs()`` caches.
+    """
+    text = _to_text.cache_info()
+    runs = _to_runs.cache_info()
+    return {
+        'text_hits': text.hits, 'text_misses': text.misses, 'text_size': text.currsize,
+        'runs_hits': runs.hits, 'runs_misses': runs.misses, 'runs_size': runs.currsize,
+    }
+
+
+def clear_cache() -> None:
+    _to_text.cache_clear()
+    _to_runs.cache_clear()
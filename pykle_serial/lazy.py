@@ -0,0 +1,291 @@
+from array import array
+from collections.abc import Sequence
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .compact import KEY_FIELDS, CompactKeyDefault, _shared_default
+from .serial import (Key, Keyboard, KeyboardMetadata, _deserialize_error, _deserialize_trusted, _emit_key_labels,
+                     _inner_Key_default, _iter_deserialize)
+from .table import FLAG_FIELDS, NUMERIC_FIELDS, STRING_FIELDS, DictColumn, KeyTable, _encode, np
+
+if TYPE_CHECKING:
+    from .frozen import FrozenKeyboard
+    from .intern import InternPool
+
+
+_N_NUMERIC = len(NUMERIC_FIELDS)
+_N_FLAGS = len(FLAG_FIELDS)
+_N_STRINGS = len(STRING_FIELDS)
+_I_WIDTH = NUMERIC_FIELDS.index('width')
+_I_HEIGHT = NUMERIC_FIELDS.index('height')
+_I_WIDTH2 = NUMERIC_FIELDS.index('width2')
+_I_HEIGHT2 = NUMERIC_FIELDS.index('height2')
+
+_get_numeric = attrgetter(*NUMERIC_FIELDS)
+_get_flags = attrgetter(*FLAG_FIELDS)
+_get_strings = attrgetter(*STRING_FIELDS)
+
+
+class _ColumnStore:
+    # Keys packed row-major: numeric fields in one float64 array, flags in one int8 array,
+    # strings (shared with the running state) in one list, one entry per key for the others.
+    __slots__ = ('numeric', 'flags', 'strings', 'labels', 'textColor', 'textSize', 'default', 'materialized', 'tuples')
+
+    def __init__(self):
+        self.numeric = array('d')
+        self.flags = array('b')
+        self.strings: List[str] = []
+        self.labels: List[Tuple] = []
+        self.textColor: List[Tuple] = []
+        self.textSize: List[Tuple] = []
+        self.default: List[CompactKeyDefault] = []
+        self.materialized: Dict[int, Key] = {}
+        self.tuples: Dict[Tuple, Tuple] = {}  # equal labels / textColor / textSize are stored once
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def emitter(self, pool: Optional['InternPool']) -> Callable:
+        numeric = self.numeric
+        extend_numeric = numeric.extend
+        extend_flags = self.flags.extend
+        extend_strings = self.strings.extend
+        append_labels = self.labels.append
+        append_text_color = self.textColor.append
+        append_text_size = self.textSize.append
+        append_default = self.default.append
+        if pool is not None:
+            intern_tuple = pool.intern_tuple
+        else:
+            setdefault = self.tuples.setdefault
+
+            def intern_tuple(t: Tuple) -> Tuple:
+                return setdefault(t, t)
+
+        def compact_labels(values: List) -> Tuple:
+            return intern_tuple(tuple(values))
+
+        def emit(current: Key, labels: List, align: int) -> None:
+            values = _get_numeric(current)
+            extend_numeric(values)
+            if values[_I_WIDTH2] == 0:
+                numeric[_I_WIDTH2 - _N_NUMERIC] = values[_I_WIDTH]
+            if values[_I_HEIGHT2] == 0:
+                numeric[_I_HEIGHT2 - _N_NUMERIC] = values[_I_HEIGHT]
+            extend_flags(_get_flags(current))
+            extend_strings(_get_strings(current))
+            labels, text_size, text_color = _emit_key_labels(current, labels, align)
+            append_labels(compact_labels(labels))
+            append_text_size(compact_labels(text_size))
+            append_text_color(compact_labels(text_color))
+            default = current.default
+            append_default(_shared_default(default.textColor, default.textSize))
+        return emit
+
+    def read(self, i: int, name: str) -> Any:
+        kind, j = _LOCATION[name]
+        if kind == 0:
+            return self.numeric[i * _N_NUMERIC + j]
+        if kind == 1:
+            return bool(self.flags[i * _N_FLAGS + j])
+        if kind == 2:
+            return self.strings[i * _N_STRINGS + j]
+        return getattr(self, name)[i]
+
+    def build(self, i: int) -> Key:
+        # A new Key of the i-th key, as stored in the columns.
+        d: Dict[str, Any] = {}
+        for name in KEY_FIELDS:
+            d[name] = self.read(i, name)
+        d['labels'] = list(d['labels'])
+        d['textColor'] = list(d['textColor'])
+        d['textSize'] = list(d['textSize'])
+        default = d['default']
+        d['default'] = _inner_Key_default(default.textColor, default.textSize)
+        key: Key = Key.__new__(Key)
+        key.__dict__ = d
+        return key
+
+    def key(self, i: int) -> Key:
+        # The materialized Key of the i-th key, built on the first call.
+        key = self.materialized.get(i)
+        if key is None:
+            key = self.materialized[i] = self.build(i)
+        return key
+
+    def peek(self, i: int) -> Key:
+        # The i-th key as Key, without materializing it.
+        key = self.materialized.get(i)
+        return self.build(i) if key is None else key
+
+
+# Field name -> (0: numeric, 1: flag, 2: string, 3: per-key list; index in the row)
+_LOCATION: Dict[str, Tuple[int, int]] = {}
+_LOCATION.update((name, (0, j)) for j, name in enumerate(NUMERIC_FIELDS))
+_LOCATION.update((name, (1, j)) for j, name in enumerate(FLAG_FIELDS))
+_LOCATION.update((name, (2, j)) for j, name in enumerate(STRING_FIELDS))
+_LOCATION.update((name, (3, 0)) for name in ('labels', 'textColor', 'textSize', 'default'))
+
+
+def _proxy_property(name: str) -> property:
+    kind, j = _LOCATION[name]
+
+    def get(self: 'KeyProxy') -> Any:
+        store = self._store
+        if store.materialized:
+            key = store.materialized.get(self._i)
+            if key is not None:
+                return getattr(key, name)
+        if kind == 0:
+            return store.numeric[self._i * _N_NUMERIC + j]
+        return store.read(self._i, name)
+
+    def set(self: 'KeyProxy', value: Any) -> None:
+        setattr(self.to_key(), name, value)
+    return property(get, set)
+
+
+class KeyProxy:
+    """
+    Read-only view of one key of a ``LazyKeyboard``, with the attributes of ``Key``.
+
+    ``labels`` / ``textColor`` / ``textSize`` are tuples and ``default`` is a shared
+    ``CompactKeyDefault``. Assigning an attribute, or ``to_key()``, materializes the ``Key``;
+    from then on, ``LazyKeyboard.keys[i]`` returns that ``Key``.
+    """
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: _ColumnStore, i: int):
+        self._store = store
+        self._i = i
+
+    def to_key(self) -> Key:
+        return self._store.key(self._i)
+
+    def __eq__(self, other):
+        if isinstance(other, KeyProxy):
+            other = other._store.peek(other._i)
+        if not isinstance(other, Key):
+            return NotImplemented
+        return self._store.peek(self._i) == other
+
+    def __repr__(self):
+        return 'KeyProxy(%d, %r)' % (self._i, self._store.peek(self._i))
+
+
+for _name in KEY_FIELDS:
+    setattr(KeyProxy, _name, _proxy_property(_name))
+del _name
+
+
+class LazyKeys(Sequence):
+    """
+    Sequence of ``KeyProxy`` (or of ``Key``, once materialized) over a ``_ColumnStore``.
+    Slices are views; nothing is copied.
+    """
+    __slots__ = ('_store', '_range')
+
+    def __init__(self, store: _ColumnStore, r: Optional[range] = None):
+        self._store = store
+        self._range = range(len(store)) if r is None else r
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return LazyKeys(self._store, self._range[i])
+        j = self._range[i]
+        key = self._store.materialized.get(j)
+        return KeyProxy(self._store, j) if key is None else key
+
+    def __iter__(self) -> Iterator[Any]:
+        store = self._store
+        materialized = store.materialized
+        for j in self._range:
+            key = materialized.get(j)
+            yield KeyProxy(store, j) if key is None else key
+
+    def __eq__(self, other):
+        if not isinstance(other, (LazyKeys, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return 'LazyKeys(%d keys)' % len(self)
+
+
+class LazyKeyboard:
+    """
+    ``Keyboard`` whose keys are kept in packed columns, and built as ``Key`` only on demand.
+    Returned by ``deserialize(rows, lazy=True)``.
+    """
+    __slots__ = ('meta', '_store', 'keys')
+
+    def __init__(self, meta: KeyboardMetadata, store: _ColumnStore):
+        self.meta = meta
+        self._store = store
+        self.keys = LazyKeys(store)
+
+    def to_keyboard(self) -> Keyboard:
+        """
+        Materializes all the keys.
+        """
+        return Keyboard(self.meta, [self._store.key(i) for i in range(len(self._store))])
+
+    def freeze(self) -> 'FrozenKeyboard':
+        from .frozen import freeze
+        return freeze(self)
+
+    def to_table(self, use_numpy: Optional[bool] = None) -> KeyTable:
+        """
+        ``KeyTable`` built straight from the columns. Keys materialized and modified since are included.
+        """
+        store = self._store
+        if store.materialized:
+            from .table import to_table
+            return to_table(list(self.keys), use_numpy)
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("NumPy is required for use_numpy=True. Install pykle-serial[numpy].")
+        n = len(store)
+        columns: Dict[str, Any] = {}
+        if use_numpy:
+            numeric = np.frombuffer(store.numeric, dtype=np.float64).reshape(n, _N_NUMERIC)
+            flags = np.frombuffer(store.flags, dtype=np.int8).reshape(n, _N_FLAGS)
+            for j, name in enumerate(NUMERIC_FIELDS):
+                columns[name] = numeric[:, j].copy()
+            for j, name in enumerate(FLAG_FIELDS):
+                columns[name] = flags[:, j].astype(np.bool_)
+        else:
+            for j, name in enumerate(NUMERIC_FIELDS):
+                columns[name] = store.numeric[j::_N_NUMERIC]
+            for j, name in enumerate(FLAG_FIELDS):
+                columns[name] = store.flags[j::_N_FLAGS]
+        for j, name in enumerate(STRING_FIELDS):
+            codes, categories = _encode(store.strings[j::_N_STRINGS])
+            columns[name] = DictColumn(np.array(codes, dtype=np.int32) if use_numpy else array('i', codes), categories)
+        return KeyTable(columns, n, 'numpy' if use_numpy else 'array')
+
+    def __eq__(self, other):
+        if not isinstance(other, (LazyKeyboard, Keyboard)):
+            return NotImplemented
+        return self.meta == other.meta and self.keys == other.keys
+
+    def __repr__(self):
+        return 'LazyKeyboard(meta=%r, keys=%r)' % (self.meta, self.keys)
+
+
+def _deserialize_lazy(rows: Any, pool: Optional['InternPool'], trusted: bool = False) -> LazyKeyboard:
+    store = _ColumnStore()
+    if trusted:
+        meta = _deserialize_trusted(rows, store.emitter(pool))[0]
+        return LazyKeyboard(meta, store)
+    if not isinstance(rows, List):
+        _deserialize_error("expected an array of objects", rows)
+    it = _iter_deserialize(rows, store.emitter(pool))
+    meta = next(it)
+    for _ in it:
+        pass
+    return LazyKeyboard(meta, store)
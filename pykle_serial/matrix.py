@@ -0,0 +1,222 @@
+from array import array
+from math import cos, radians, sin
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .plate import _plate_table
+from .table import KeyTable, np
+
+# Rotation clusters are compared at this number of decimal places.
+_DIGITS = 6
+
+
+class Matrix(NamedTuple):
+    """
+    Result of ``assign_matrix()``, one element per key: the ``row`` / ``col`` indexes (-1 for decal keys),
+    the rotated ``center_x`` / ``center_y`` of the primary rect in key units and the rotation ``cluster``.
+
+    ``moved`` are the indexes of the keys moved to another column, as they fell on the position
+    of an earlier key.
+
+    With NumPy, these are arrays (int32 / float64). Without NumPy, ``array('i')`` / ``array('d')``.
+    """
+    row: Any
+    col: Any
+    center_x: Any
+    center_y: Any
+    cluster: Any
+    moved: Any
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        ``(number of rows, number of columns)``.
+        """
+        return int(max(self.row, default=-1)) + 1, int(max(self.col, default=-1)) + 1
+
+
+def _centers(table: KeyTable) -> Tuple[List[float], List[float], List[float], List[float]]:
+    # Centers of the primary rects: local (before rotation) and rotated.
+    if table.backend == 'numpy':
+        lx = table.x + table.width / 2
+        ly = table.y + table.height / 2
+        angles, inverse = np.unique(table.rotation_angle, return_inverse=True)
+        cs = np.cos(np.radians(angles))[inverse]
+        sn = np.sin(np.radians(angles))[inverse]
+        px = lx - table.rotation_x
+        py = ly - table.rotation_y
+        cx = table.rotation_x + cs * px - sn * py
+        cy = table.rotation_y + sn * px + cs * py
+        return lx.tolist(), ly.tolist(), cx.tolist(), cy.tolist()
+    lx = [x + w / 2 for x, w in zip(table.x, table.width)]
+    ly = [y + h / 2 for y, h in zip(table.y, table.height)]
+    cx: List[float] = []
+    cy: List[float] = []
+    rotations: Dict[float, Tuple[float, float]] = {}
+    for x, y, angle, rx, ry in zip(lx, ly, table.rotation_angle, table.rotation_x, table.rotation_y):
+        r = rotations.get(angle)
+        if r is None:
+            r = rotations[angle] = (cos(radians(angle)), sin(radians(angle)))
+        cs, sn = r
+        px = x - rx
+        py = y - ry
+        cx.append(rx + cs * px - sn * py)
+        cy.append(ry + sn * px + cs * py)
+    return lx, ly, cx, cy
+
+
+def _clusters(table: KeyTable) -> List[int]:
+    # Keys rotated by the same angle around the same origin share a frame. Unrotated keys are one cluster.
+    # Clusters are numbered in order of first appearance.
+    if table.backend == 'numpy':
+        angle = np.round(table.rotation_angle % 360, _DIGITS) % 360
+        rotated = angle != 0
+        frames = np.stack([angle, np.where(rotated, np.round(table.rotation_x, _DIGITS), 0.),
+                           np.where(rotated, np.round(table.rotation_y, _DIGITS), 0.)], axis=1)
+        if not len(frames):
+            return []
+        _, first, inverse = np.unique(frames, axis=0, return_index=True, return_inverse=True)
+        return np.argsort(np.argsort(first))[inverse.reshape(-1)].tolist()
+    ids: Dict[Tuple[float, float, float], int] = {}
+    ret: List[int] = []
+    for angle, rx, ry in zip(table.rotation_angle, table.rotation_x, table.rotation_y):
+        angle = round(angle % 360, _DIGITS) % 360
+        k = (angle, round(rx, _DIGITS), round(ry, _DIGITS)) if angle else (0., 0., 0.)
+        c = ids.get(k)
+        if c is None:
+            c = ids[k] = len(ids)
+        ret.append(c)
+    return ret
+
+
+def _sweep(order: Sequence[int], values: Sequence[float], groups: Sequence[int], tolerance: float) -> List[int]:
+    # Walks ``order`` (sorted by group, then value) and starts a new line when the group changes,
+    # or when the value is more than ``tolerance`` past the first value of the line.
+    # Returns the line of each element of ``order``.
+    ret: List[int] = []
+    line = -1
+    group = -1
+    start = 0.
+    for i in order:
+        v = values[i]
+        if groups[i] != group or v - start > tolerance:
+            line += 1
+            group = groups[i]
+            start = v
+        ret.append(line)
+    return ret
+
+
+def _lines(keys: List[int], local: List[float], rotated: List[float], cluster: List[int],
+           tolerance: float, use_numpy: bool) -> List[int]:
+    # Groups ``keys`` into lines (rows or columns) along ``local`` within each cluster, then merges
+    # the lines of different clusters whose mean ``rotated`` coordinates are within ``tolerance``.
+    # Returns the global line index of each key of ``keys``, numbered in ``rotated`` order.
+    if use_numpy:
+        k = np.array(keys, dtype=np.intp)
+        order = k[np.lexsort((np.array(local)[k], np.array(cluster)[k]))].tolist()
+    else:
+        order = sorted(keys, key=lambda i: (cluster[i], local[i]))
+    lines = _sweep(order, local, cluster, tolerance)
+    n = lines[-1] + 1 if lines else 0
+
+    sums = [0.] * n
+    counts = [0] * n
+    line_cluster = [0] * n
+    for i, line in zip(order, lines):
+        sums[line] += rotated[i]
+        counts[line] += 1
+        line_cluster[line] = cluster[i]
+    means = [s / c for s, c in zip(sums, counts)]
+
+    merged = [0] * n
+    index = -1
+    start = 0.
+    used: set = set()
+    for line in sorted(range(n), key=means.__getitem__):
+        m = means[line]
+        # A cluster contributes one line at most to a global line.
+        if index < 0 or m - start > tolerance or line_cluster[line] in used:
+            index += 1
+            start = m
+            used = set()
+        used.add(line_cluster[line])
+        merged[line] = index
+
+    ret = [0] * len(cluster)
+    for i, line in zip(order, lines):
+        ret[i] = merged[line]
+    return [ret[i] for i in keys]
+
+
+def _resolve_collisions(keys: List[int], row: List[int], col: List[int], raise_error: bool) -> List[int]:
+    # The first key at a position keeps it; the others move right, to the first column free in their row.
+    # Returns the keys moved.
+    occupied: Dict[Tuple[int, int], int] = {}
+    later: List[int] = []
+    for i in keys:
+        position = (row[i], col[i])
+        j = occupied.get(position)
+        if j is None:
+            occupied[position] = i
+        elif raise_error:
+            raise ValueError("Error: keys %d and %d are both at row %d, column %d" % (j, i, row[i], col[i]))
+        else:
+            later.append(i)
+    for i in later:
+        r = row[i]
+        c = col[i] + 1
+        while (r, c) in occupied:
+            c += 1
+        col[i] = c
+        occupied[(r, c)] = i
+    return later
+
+
+def assign_matrix(keyboard: Any, row_tolerance: float = .5, col_tolerance: float = .5, columns: str = 'x',
+                  collisions: str = 'move', use_numpy: Optional[bool] = None) -> Matrix:
+    """
+    Assigns a switch matrix row and column to every key of ``keyboard`` (``Keyboard``, ``CompactKeyboard``,
+    ``LazyKeyboard`` or ``KeyTable``), from the centers of the keys. O(n log n).
+
+    Keys rotated by the same angle around the same origin form a cluster, and are grouped in the frame
+    of the cluster: a key starts a new row when its center is more than ``row_tolerance`` units below
+    the first key of the current row (columns: ``col_tolerance``, rightward). The rows of the clusters
+    are then merged by their mean rotated center, with the same tolerance, and numbered from the top;
+    the columns, from the left. Decal keys get -1.
+
+    ``columns='x'`` keeps the columns vertical, which suits ortholinear and column staggered layouts.
+    Row staggered layouts need more columns that way; ``columns='rank'`` numbers the keys of each row
+    from the left instead, for the smallest matrix.
+
+    Keys on the same row and column, such as overlapping or stacked keys, would share a switch.
+    With ``collisions='move'``, each key after the first goes to the next free column of its row,
+    and is listed in ``moved``; with ``collisions='raise'``, ``ValueError`` is raised.
+    """
+    if columns not in ('x', 'rank'):
+        raise ValueError("Error: columns must be 'x' or 'rank', not " + repr(columns))
+    if collisions not in ('move', 'raise'):
+        raise ValueError("Error: collisions must be 'move' or 'raise', not " + repr(collisions))
+    table = _plate_table(keyboard, use_numpy)
+    numpy = table.backend == 'numpy'
+    lx, ly, cx, cy = _centers(table)
+    cluster = _clusters(table)
+    keys = [i for i, decal in enumerate(table.decal) if not decal]
+    row = [-1] * len(table)
+    col = [-1] * len(table)
+    for i, r in zip(keys, _lines(keys, ly, cy, cluster, row_tolerance, numpy)):
+        row[i] = r
+    if columns == 'x':
+        for i, c in zip(keys, _lines(keys, lx, cx, cluster, col_tolerance, numpy)):
+            col[i] = c
+    else:
+        previous = rank = -1
+        for i in sorted(keys, key=lambda i: (row[i], cx[i])):
+            rank = rank + 1 if row[i] == previous else 0
+            previous = row[i]
+            col[i] = rank
+    moved = _resolve_collisions(keys, row, col, collisions == 'raise')
+    if numpy:
+        return Matrix(np.array(row, dtype=np.int32), np.array(col, dtype=np.int32), np.array(cx), np.array(cy),
+                      np.array(cluster, dtype=np.int32), np.array(moved, dtype=np.int32))
+    return Matrix(array('i', row), array('i', col), array('d', cx), array('d', cy), array('i', cluster),
+                  array('i', moved))
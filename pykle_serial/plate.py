@@ -0,0 +1,313 @@
+"""
+Switch and stabilizer cutouts of a plate, computed for all the keys at once.
+
+Coordinates are in millimeters, y growing downward as in KLE. A cutout is a rotated rectangle,
+given by its 4 corners. ``kerf`` is the width of the cut: every cutout is shrunk by ``kerf / 2``
+on each side, so that the hole comes out at its nominal size.
+"""
+import os
+from array import array
+from bisect import bisect_right
+from math import cos, radians, sin
+from operator import attrgetter
+from typing import IO, Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .geometry import Polygon
+from .lazy import LazyKeyboard
+from .table import KeyTable, np
+
+DEFAULT_UNIT = 19.05  # mm per key unit
+SWITCH_SIZE = 14.     # MX switch cutout
+
+KIND_SWITCH = 0
+KIND_STABILIZER = 1
+
+# Plate mount stabilizer cutout, relative to the stabilizer center (mm):
+# half width, top, bottom. The bottom extends further than the top.
+STAB_HALF_WIDTH = 3.375
+STAB_TOP = -6.77
+STAB_BOTTOM = 7.75
+
+# Key length (units) -> distance from the switch center to each stabilizer (mm).
+# Keys shorter than the first entry have no stabilizer.
+STAB_SPACING: Tuple[Tuple[float, float], ...] = (
+    (2., 11.938),
+    (3., 19.05),
+    (4., 28.575),
+    (4.5, 34.671),
+    (5.5, 42.8625),
+    (6., 47.625),
+    (6.25, 50.),
+    (6.5, 52.38),
+    (7., 57.15),
+    (8., 66.675),
+)
+_STAB_LENGTHS = [length for length, _ in STAB_SPACING]
+
+
+class Cutouts(NamedTuple):
+    """
+    Cutouts of one plate. ``polygons`` are the 4 corners of each cutout, ``key`` the index of its key
+    and ``kind`` ``KIND_SWITCH`` or ``KIND_STABILIZER``.
+
+    With NumPy, ``polygons`` is a float64 array of shape ``(n, 4, 2)`` and the others are int arrays.
+    Without NumPy, they are lists.
+    """
+    polygons: Any
+    key: Any
+    kind: Any
+
+    def __len__(self) -> int:  # type: ignore
+        return len(self.key)
+
+
+# The columns cutouts are computed from.
+_COLUMNS = ('x', 'y', 'width', 'height', 'rotation_angle', 'rotation_x', 'rotation_y', 'decal')
+_get_columns = attrgetter(*_COLUMNS)
+
+
+def _plate_table(keyboard: Any, use_numpy: Optional[bool]) -> KeyTable:
+    # KeyTable of the _COLUMNS only: reading them in one pass is about 4 times faster than to_table().
+    if isinstance(keyboard, KeyTable):
+        return keyboard
+    if isinstance(keyboard, LazyKeyboard):
+        return keyboard.to_table(use_numpy)  # already columnar
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True. Install pykle-serial[numpy].")
+    rows = list(map(_get_columns, keyboard.keys))
+    if use_numpy:
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), len(_COLUMNS))
+        columns = {name: values[:, j] for j, name in enumerate(_COLUMNS[:-1])}
+        columns['decal'] = values[:, -1].astype(np.bool_)
+    else:
+        values = list(zip(*rows)) or [()] * len(_COLUMNS)
+        columns = {name: array('d', values[j]) for j, name in enumerate(_COLUMNS[:-1])}
+        columns['decal'] = array('b', map(bool, values[-1]))
+    return KeyTable(columns, len(rows), 'numpy' if use_numpy else 'array')
+
+
+def _stab_spacing(length: float) -> float:
+    i = bisect_right(_STAB_LENGTHS, length + 1e-9)
+    return 0. if i == 0 else STAB_SPACING[i - 1][1]
+
+
+def _local_rects(w: float, h: float, switch_size: float, kerf: float) -> List[Tuple[int, Tuple]]:
+    # Cutouts of a key as (kind, (min_u, min_v, max_u, max_v)) around the switch center, unrotated.
+    a = (switch_size - kerf) / 2
+    ret: List[Tuple[int, Tuple]] = [(KIND_SWITCH, (-a, -a, a, a))]
+    vertical = h > w
+    spacing = _stab_spacing(h if vertical else w)
+    if spacing:
+        hw = STAB_HALF_WIDTH - kerf / 2
+        top = STAB_TOP + kerf / 2
+        bottom = STAB_BOTTOM - kerf / 2
+        for s in (-spacing, spacing):
+            if vertical:  # turned a quarter clockwise: the bottom of the stabilizer faces left
+                ret.append((KIND_STABILIZER, (-bottom, s - hw, -top, s + hw)))
+            else:
+                ret.append((KIND_STABILIZER, (s - hw, top, s + hw, bottom)))
+    return ret
+
+
+def _cutouts_py(table: KeyTable, unit: float, switch_size: float, kerf: float) -> Cutouts:
+    polygons: List[Polygon] = []
+    keys: List[int] = []
+    kinds: List[int] = []
+    for i, (x, y, w, h, angle, rx, ry, decal) in enumerate(zip(
+            table.x, table.y, table.width, table.height,
+            table.rotation_angle, table.rotation_x, table.rotation_y, table.decal)):
+        if decal:
+            continue
+        r = radians(angle)
+        cs = cos(r)
+        sn = sin(r)
+        ox = rx * unit
+        oy = ry * unit
+        cx = (x + w / 2) * unit - ox
+        cy = (y + h / 2) * unit - oy
+        for kind, (u0, v0, u1, v1) in _local_rects(w, h, switch_size, kerf):
+            corners = []
+            for u, v in ((u0, v0), (u1, v0), (u1, v1), (u0, v1)):
+                px = cx + u
+                py = cy + v
+                corners.append((ox + cs * px - sn * py, oy + sn * px + cs * py))
+            polygons.append(tuple(corners))  # type: ignore
+            keys.append(i)
+            kinds.append(kind)
+    return Cutouts(polygons, keys, kinds)
+
+
+def _cutouts_np(table: KeyTable, unit: float, switch_size: float, kerf: float) -> Cutouts:
+    keep = ~np.asarray(table.decal, dtype=np.bool_)
+    index = np.nonzero(keep)[0]
+    w = np.asarray(table.width)[keep]
+    h = np.asarray(table.height)[keep]
+    angles, inverse = np.unique(np.asarray(table.rotation_angle)[keep], return_inverse=True)
+    cs = np.cos(np.radians(angles))[inverse]
+    sn = np.sin(np.radians(angles))[inverse]
+    ox = np.asarray(table.rotation_x)[keep] * unit
+    oy = np.asarray(table.rotation_y)[keep] * unit
+    cx = (np.asarray(table.x)[keep] + w / 2) * unit - ox
+    cy = (np.asarray(table.y)[keep] + h / 2) * unit - oy
+
+    # Local rects (n_cutouts, 4): the switch of every key, then 2 stabilizers of the long keys.
+    a = (switch_size - kerf) / 2
+    n = len(index)
+    owner = [np.arange(n)]
+    kind = [np.full(n, KIND_SWITCH, dtype=np.int8)]
+    rects = [np.tile([-a, -a, a, a], (n, 1))]
+    vertical = h > w
+    lengths = np.where(vertical, h, w)
+    slot = np.searchsorted(np.array(_STAB_LENGTHS), lengths + 1e-9, side='right')
+    stab = np.nonzero(slot > 0)[0]
+    if len(stab):
+        spacing = np.array([s for _, s in STAB_SPACING])[slot[stab] - 1]
+        hw = STAB_HALF_WIDTH - kerf / 2
+        top = STAB_TOP + kerf / 2
+        bottom = STAB_BOTTOM - kerf / 2
+        v = vertical[stab]
+        for s in (-spacing, spacing):
+            horizontal_rect = np.stack([s - hw, np.full_like(s, top), s + hw, np.full_like(s, bottom)], axis=1)
+            vertical_rect = np.stack([np.full_like(s, -bottom), s - hw, np.full_like(s, -top), s + hw], axis=1)
+            rects.append(np.where(v[:, None], vertical_rect, horizontal_rect))
+            owner.append(stab)
+            kind.append(np.full(len(stab), KIND_STABILIZER, dtype=np.int8))
+    r = np.concatenate(rects)
+    o = np.concatenate(owner)
+    k = np.concatenate(kind)
+    order = np.lexsort((np.arange(len(o)), o))  # by key, switch first, as the pure Python version
+    r = r[order]
+    o = o[order]
+    k = k[order]
+
+    u = r[:, [0, 2, 2, 0]]
+    v = r[:, [1, 1, 3, 3]]
+    px = cx[o][:, None] + u
+    py = cy[o][:, None] + v
+    c = cs[o][:, None]
+    s = sn[o][:, None]
+    polygons = np.stack([ox[o][:, None] + c * px - s * py, oy[o][:, None] + s * px + c * py], axis=2)
+    return Cutouts(polygons, index[o], k)
+
+
+def cutouts(keyboard: Any, unit: float = DEFAULT_UNIT, kerf: float = 0., switch_size: float = SWITCH_SIZE,
+            use_numpy: Optional[bool] = None) -> Cutouts:
+    """
+    Switch and stabilizer cutouts of all the keys of ``keyboard`` (``Keyboard``, ``CompactKeyboard``,
+    ``LazyKeyboard`` or ``KeyTable``), rotated around their rotation origin. Decal keys have none.
+
+    Keys of 2u or longer get a pair of plate mount stabilizers, spaced by ``STAB_SPACING``;
+    keys taller than wide get them vertically.
+    """
+    table = _plate_table(keyboard, use_numpy)
+    if table.backend == 'numpy':
+        return _cutouts_np(table, unit, switch_size, kerf)
+    return _cutouts_py(table, unit, switch_size, kerf)
+
+
+def cutouts_many(keyboards: Sequence[Any], unit: float = DEFAULT_UNIT, kerf: float = 0.,
+                 switch_size: float = SWITCH_SIZE, use_numpy: Optional[bool] = None) -> List[Cutouts]:
+    """
+    ``cutouts()`` of several plates (keyboards or ``KeyTable`` of the same backend), computed in one batch
+    over all their keys. Returns one ``Cutouts`` per plate, with key indexes into that plate.
+    """
+    tables = [_plate_table(kbd, use_numpy) for kbd in keyboards]
+    if not tables:
+        return []
+    backend = tables[0].backend
+    if any(t.backend != backend for t in tables):
+        raise ValueError("Error: KeyTable backends differ")
+    counts = [len(t) for t in tables]
+    if backend == 'numpy':
+        columns = {name: np.concatenate([t[name] for t in tables]) for name in _COLUMNS}
+    else:
+        columns = {name: sum((t[name] for t in tables[1:]), array(tables[0][name].typecode, tables[0][name]))
+                   for name in _COLUMNS}
+    everything = cutouts(KeyTable(columns, sum(counts), backend), unit, kerf, switch_size)
+    ret: List[Cutouts] = []
+    start = 0
+    if backend == 'numpy':
+        bounds = np.searchsorted(everything.key, np.cumsum([0] + counts))
+        for i, n in enumerate(counts):
+            lo, hi = bounds[i], bounds[i + 1]
+            ret.append(Cutouts(everything.polygons[lo:hi], everything.key[lo:hi] - start, everything.kind[lo:hi]))
+            start += n
+        return ret
+    j = 0
+    for n in counts:
+        lo = j
+        while j < len(everything.key) and everything.key[j] < start + n:
+            j += 1
+        ret.append(Cutouts(everything.polygons[lo:j], [k - start for k in everything.key[lo:j]], everything.kind[lo:j]))
+        start += n
+    return ret
+
+
+def _polygon_list(cut: Cutouts) -> List[Any]:
+    # Formatting Python floats is about 3 times faster than NumPy scalars.
+    polygons = cut.polygons
+    return polygons.tolist() if hasattr(polygons, 'tolist') else polygons
+
+
+def _open_text(fp: Union[str, os.PathLike, IO]) -> Tuple[IO, bool]:
+    if isinstance(fp, (str, os.PathLike)):
+        return open(fp, 'w', encoding='utf-8', newline='\n'), True
+    return fp, False
+
+
+def write_dxf(cut: Cutouts, fp: Union[str, os.PathLike, IO]) -> None:
+    """
+    Writes the cutouts as closed polylines of an R12 DXF (entities only), to a path or a text file object.
+    The y axis is flipped, as DXF has y growing upward.
+    """
+    f, close = _open_text(fp)
+    try:
+        write = f.write
+        write('0\nSECTION\n2\nENTITIES\n')
+        for polygon in _polygon_list(cut):
+            buf = ['0\nPOLYLINE\n8\n0\n66\n1\n70\n1\n']
+            for x, y in polygon:
+                buf.append('0\nVERTEX\n8\n0\n10\n%.6f\n20\n%.6f\n' % (x, -y))
+            buf.append('0\nSEQEND\n8\n0\n')
+            write(''.join(buf))
+        write('0\nENDSEC\n0\nEOF\n')
+    finally:
+        if close:
+            f.close()
+
+
+def write_svg(cut: Cutouts, fp: Union[str, os.PathLike, IO], stroke_width: float = .1) -> None:
+    """
+    Writes the cutouts as an SVG path in millimeters, to a path or a text file object.
+    """
+    f, close = _open_text(fp)
+    try:
+        if len(cut):
+            if np is not None and isinstance(cut.polygons, np.ndarray):
+                x0, y0 = cut.polygons.min(axis=(0, 1))
+                x1, y1 = cut.polygons.max(axis=(0, 1))
+            else:
+                xs = [x for p in cut.polygons for x, _ in p]
+                ys = [y for p in cut.polygons for _, y in p]
+                x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+        else:
+            x0 = y0 = x1 = y1 = 0.
+        m = 1.
+        w = x1 - x0 + 2 * m
+        h = y1 - y0 + 2 * m
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" viewBox="%.4f %.4f %.4f %.4f" width="%.4fmm" height="%.4fmm">'
+                '<path fill="none" stroke="#000" stroke-width="%g" d="' % (x0 - m, y0 - m, w, h, w, h, stroke_width))
+        buf: List[str] = []
+        for polygon in _polygon_list(cut):
+            (ax, ay), (bx, by), (cx, cy), (dx, dy) = polygon
+            buf.append('M%.4f %.4fL%.4f %.4fL%.4f %.4fL%.4f %.4fZ' % (ax, ay, bx, by, cx, cy, dx, dy))
+            if len(buf) >= 4096:
+                f.write(''.join(buf))
+                buf.clear()
+        f.write(''.join(buf))
+        f.write('"/></svg>\n')
+    finally:
+        if close:
+            f.close()
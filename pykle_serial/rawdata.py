@@ -0,0 +1,107 @@
+import json
+import re
+from typing import Any, Tuple
+
+
+# Tiers of loads_with_tier(), fastest first.
+TIER_JSON = 'json'    # stdlib json
+TIER_KLE = 'kle'      # KLE raw data dialect, rewritten to JSON and read by stdlib json
+TIER_JSON5 = 'json5'  # json5 package
+
+# Double quoted string, single quoted string, unquoted key, or trailing comma.
+_TOKEN_RE = re.compile(r'''
+    (?P<dq>"(?:[^"\\\n]|\\.)*")
+  | (?P<sq>'(?:[^'\\\n]|\\.)*')
+  | (?P<key>[A-Za-z_$][A-Za-z0-9_$]*)(?=\s*:)
+  | (?P<comma>,)(?=\s*[\]}])
+''', re.VERBOSE)
+
+_SQ_ESCAPE_RE = re.compile(r'\\.|"')
+
+
+def _sq_escape(m: 're.Match') -> str:
+    s = m.group(0)
+    if s == "\\'":
+        return "'"
+    if s == '"':
+        return '\\"'
+    return s
+
+
+def _rewrite(m: 're.Match') -> str:
+    kind = m.lastgroup
+    if kind == 'dq':
+        return m.group(0)
+    if kind == 'sq':
+        return '"' + _SQ_ESCAPE_RE.sub(_sq_escape, m.group(0)[1:-1]) + '"'
+    if kind == 'key':
+        return '"' + m.group(0) + '"'
+    return ''  # trailing comma
+
+
+def _kle_to_json(text: str) -> str:
+    return _TOKEN_RE.sub(_rewrite, text)
+
+
+def _wrap_rows(data: Any) -> Any:
+    # KLE raw data of a single row, like ["Q", "W"], is a row rather than a list of rows.
+    if isinstance(data, list) and any(isinstance(d, str) for d in data) and not any(isinstance(d, list) for d in data):
+        return [data]
+    return data
+
+
+def _json_loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        # KLE raw data lacks the outer []
+        if e.msg != 'Extra data':
+            raise
+        return json.loads('[' + text + ']')
+
+
+def loads_with_tier(text: str) -> Tuple[Any, str]:
+    """
+    Loads JSON / KLE raw data / JSON5 text. Returns the data and the tier which handled it:
+    ``TIER_JSON``, ``TIER_KLE`` or ``TIER_JSON5``.
+
+    KLE raw data without the outer ``[]`` is accepted.
+    """
+    try:
+        return _wrap_rows(_json_loads(text)), TIER_JSON
+    except ValueError:
+        pass
+    try:
+        return _wrap_rows(_json_loads(_kle_to_json(text))), TIER_KLE
+    except ValueError:
+        pass
+    import json5
+    try:
+        return _wrap_rows(json5.loads(text)), TIER_JSON5
+    except ValueError as e:
+        error = e
+    try:
+        return _wrap_rows(json5.loads('[' + text + ']')), TIER_JSON5
+    except ValueError:
+        raise error from None
+
+
+def loads_value(text: str) -> Tuple[Any, str]:
+    """
+    Loads a single value, like one row of KLE raw data, without the handling of the outer ``[]``.
+    Returns the value and the tier which handled it.
+    """
+    try:
+        return json.loads(text), TIER_JSON
+    except ValueError:
+        pass
+    try:
+        return json.loads(_kle_to_json(text)), TIER_KLE
+    except ValueError:
+        pass
+    import json5
+    return json5.loads(text), TIER_JSON5
+
+
+def loads(text: str) -> Any:
+    return loads_with_tier(text)[0]
@@ -1,6 +1,13 @@
-from copy import deepcopy
-from dataclasses import dataclass, field as dcf
-from typing import Optional, List, Callable
+from dataclasses import asdict, dataclass, field as dcf, fields, is_dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Callable, Sequence, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .compact import CompactKeyboard
+    from .frozen import FrozenKeyboard
+    from .instrument import DeserializeStats
+    from .intern import InternPool
+    from .lazy import LazyKeyboard
+    from .table import KeyTable
 
 
 UB_LABEL_MAP = 12
@@ -74,6 +81,14 @@ class Keyboard:
     meta: KeyboardMetadata = dcf(default_factory=KeyboardMetadata)
     keys: List[Key] = _dcf_list()
 
+    def to_table(self, use_numpy: Optional[bool] = None) -> 'KeyTable':
+        from .table import to_table
+        return to_table(self.keys, use_numpy)
+
+    def freeze(self) -> 'FrozenKeyboard':
+        from .frozen import freeze
+        return freeze(self)
+
 
 @dataclass
 class _Cluster:
@@ -111,112 +126,282 @@ class _ReorderLabelsIn:
 reorder_labels_in = _ReorderLabelsIn()
 
 
-def deserialize(rows: List) -> Keyboard:  # noqa: C901
-    def _deserialize_error(msg: str, data):
-        import json5
-        raise ValueError("Error: " + msg + ":\n  " + json5.dumps(data) if data is not None else "")
+class _ReorderLabelsOut:
+    # Inverse of reorder_labels_in.
+    ALIGN_PREFERENCE = [7, 5, 6, 4, 3, 1, 2, 0]
 
-    if not isinstance(rows, List):
-        _deserialize_error("expected an array of objects", rows)
+    def __init__(self):
+        self._align_cache: Dict[Tuple[Tuple[int, ...], int], int] = {}
+        # Map from normalized label position to serialized position (-1: not reachable).
+        self.INVERSE_LABEL_MAP: List[List[int]] = []
+        for lm in reorder_labels_in.LABEL_MAP:
+            inv = [-1, ] * UB_LABEL_MAP
+            for i, j in enumerate(lm):
+                if j != -1:
+                    inv[j] = i
+            self.INVERSE_LABEL_MAP.append(inv)
+
+    def align_for(self, labels: Sequence, current_align: int) -> int:
+        # Returns the align which gives the shortest label item, counting a change of
+        # align as a few extra characters. If nothing can represent all of the labels,
+        # returns current_align.
+        used = tuple(j for j, lbl in enumerate(labels) if lbl)
+        cached = self._align_cache.get((used, current_align))
+        if cached is not None:
+            return cached
+        best = current_align
+        best_cost = None
+        for a in [current_align, ] + self.ALIGN_PREFERENCE:
+            inv = self.INVERSE_LABEL_MAP[a]
+            if any(inv[j] == -1 for j in used):
+                continue
+            cost = max((inv[j] for j in used), default=0) + (0 if a == current_align else 4)
+            if best_cost is None or cost < best_cost:
+                best = a
+                best_cost = cost
+        self._align_cache[(used, current_align)] = best
+        return best
+
+    def __call__(self, values: Sequence, align: int) -> List:
+        ret: List = [None, ] * UB_LABEL_MAP
+        inv = self.INVERSE_LABEL_MAP[align]
+        for j, v in enumerate(values):
+            if v is not None and inv[j] != -1:
+                ret[inv[j]] = v
+        return ret
+
+
+reorder_labels_out = _ReorderLabelsOut()
+
+
+def _reorder_key_labels(current: Key, labels: List, align: int) -> Tuple[List, List, List]:
+    # labels / textSize / textColor of the key emitted from the running state, in
+    # the order of the key. All three lists are created fresh.
+    labels = reorder_labels_in(labels, align)
+    # The sizes that reorder_labels_in() would drop are already None: see _set_f2() / _set_fa().
+    text_size: List = [None, ] * UB_LABEL_MAP
+    for i, size in zip(reorder_labels_in.LABEL_MAP[align], current.textSize):
+        if i != -1 and size is not None:
+            text_size[i] = size
+    return labels, text_size, list(current.textColor)
+
+
+def _cleanup_key_labels(current: Key, labels: List, text_size: List, text_color: List) -> None:
+    # Drops text sizes / colors of blank labels and those equal to the defaults, in place.
+    default = current.default
+    default_text_size = default.textSize
+    default_text_color = default.textColor
+    for i in range(UB_LABEL_MAP):
+        if not labels[i]:
+            text_size[i] = None
+            text_color[i] = None
+        else:
+            if text_size[i] == default_text_size:
+                text_size[i] = None
+            if text_color[i] == default_text_color:
+                text_color[i] = None
+
+
+def _emit_key_labels(current: Key, labels: List, align: int) -> Tuple[List, List, List]:
+    # instrument._emit_key_labels_timed() times the two steps separately.
+    labels, text_size, text_color = _reorder_key_labels(current, labels, align)
+    _cleanup_key_labels(current, labels, text_size, text_color)
+    return labels, text_size, text_color
+
+
+def _emit_key(current: Key, labels: List, align: int, emit_labels: Callable = _emit_key_labels) -> Key:
+    # Build the emitted key straight from the running state. Every list is
+    # created fresh here and all the scalar fields are immutable, so a
+    # shallow copy of __dict__ is as good as deepcopy(current).
+    new_key: Key = Key.__new__(Key)
+    d = current.__dict__.copy()
+    default = current.default
+    d['default'] = _inner_Key_default(default.textColor, default.textSize)
+
+    # Calculate some generated values
+    if current.width2 == 0:
+        d['width2'] = current.width
+    if current.height2 == 0:
+        d['height2'] = current.height
+    d['labels'], d['textSize'], d['textColor'] = emit_labels(current, labels, align)
+    new_key.__dict__ = d
+    return new_key
+
+
+def _deserialize_error(msg: str, data):
+    import json5
+    raise ValueError("Error: " + msg + ":\n  " + json5.dumps(data) if data is not None else "")
+
+
+# Property dicts of rows are applied by plans: for each tuple of keys of a dict, the setters of the
+# known keys, in the order of _PROPERTY_ORDER. Plans are compiled once and cached, so only the
+# keys present are visited. Setters take (current, cluster, value, align) and check the value as
+# the original kle-serial does: 'f' / 'f2' / 't' if truthy, 'x' / 'y' always, the others if not None.
+# 'a' is not a setter, as the running alignment is a local of _iter_deserialize().
+
+def _property_setter(attr: str, c: Callable) -> Callable:
+    def setter(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+        if v is not None:
+            setattr(current, attr, c(v))
+    return setter
+
+
+def _set_f(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v:
+        current.default.textSize = int(v)
+        current.textSize = [None, ] * UB_LABEL_MAP
+
+
+def _set_f2(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v:
+        size = int(v) or None
+        for i in range(1, UB_LABEL_MAP):
+            current.textSize[i] = size
+
+
+def _set_fa(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v is not None:
+        # Converted here once, rather than for every key. A new list, as _set_f2() modifies it.
+        # Falsy sizes are None, as reorder_labels_in() drops them, but "0" is converted to 0 after it.
+        current.textSize = [(int(x) if x.isdecimal() else None) if isinstance(x, str) else (x or None) for x in v]
+
+
+def _set_t(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v:
+        split = v.split("\n")
+        if len(split[0]) > 0:
+            current.default.textColor = split[0]
+        current.textColor = reorder_labels_in(split, align)
+
+
+def _set_rx(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v is not None:
+        cluster.x = float(v)
+        current.rotation_x = cluster.x
+        current.x = cluster.x
+        current.y = cluster.y
 
-    # Initialize with defaults
-    current: Key = Key()
-    kbd: Keyboard = Keyboard()
-    cluster = _Cluster()
-    align: int = 4
 
-    for r, rows_r in enumerate(rows):
+def _set_ry(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v is not None:
+        cluster.y = float(v)
+        current.rotation_y = cluster.y
+        current.x = cluster.x
+        current.y = cluster.y
+
+
+def _move_x(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    current.x += v
+
+
+def _move_y(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    current.y += v
+
+
+def _set_w(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v is not None:
+        current.width = current.width2 = float(v)
+
+
+def _set_h(current: Key, cluster: _Cluster, v: Any, align: int) -> None:
+    if v is not None:
+        current.height = current.height2 = float(v)
+
+
+_PROPERTY_ORDER: Tuple[Tuple[str, Optional[Callable]], ...] = (
+    ('g', _property_setter('ghost', bool)),
+    ('a', None),
+    ('f', _set_f),
+    ('f2', _set_f2),
+    ('t', _set_t),
+    ('rx', _set_rx),
+    ('ry', _set_ry),
+    ('x', _move_x),
+    ('y', _move_y),
+    ('fa', _set_fa),
+    ('p', _property_setter('profile', str)),
+    ('c', _property_setter('color', str)),
+    ('x2', _property_setter('x2', float)),
+    ('y2', _property_setter('y2', float)),
+    ('n', _property_setter('nub', bool)),
+    ('l', _property_setter('stepped', bool)),
+    ('d', _property_setter('decal', bool)),
+    ('sm', _property_setter('sm', str)),
+    ('sb', _property_setter('sb', str)),
+    ('st', _property_setter('st', str)),
+    ('r', _property_setter('rotation_angle', float)),
+    ('w', _set_w),
+    ('h', _set_h),
+    ('w2', _property_setter('width2', float)),
+    ('h2', _property_setter('height2', float)),
+)
+
+_PropertyPlan = Tuple[Tuple[str, ...], bool, Tuple[Tuple[str, Callable], ...]]
+
+_property_plans: Dict[Tuple, _PropertyPlan] = {}
+_MAX_PROPERTY_PLANS = 4096
+
+
+def _compile_property_plan(item: Dict) -> _PropertyPlan:
+    plan: _PropertyPlan = (
+        tuple(k for k in ('r', 'rx', 'ry') if k in item),
+        'a' in item,
+        tuple((k, setter) for k, setter in _PROPERTY_ORDER if setter is not None and k in item))
+    if len(_property_plans) >= _MAX_PROPERTY_PLANS:
+        _property_plans.clear()
+    _property_plans[tuple(item)] = plan
+    return plan
+
+
+def _iter_deserialize(rows: Iterable, emit_key: Callable,  # noqa: C901
+                      state: Optional[Tuple[Key, _Cluster, int, int]] = None, checkpoint: Optional[Callable] = None) -> Iterator:
+    # Yields KeyboardMetadata first, then each key as soon as it is emitted.
+    # If state (current, cluster, align, index of the first row) is given, resumes from it
+    # without yielding KeyboardMetadata. checkpoint(r, current, cluster, align) is called
+    # at the end of each row.
+
+    # Initialize with defaults
+    meta = KeyboardMetadata()
+    if state is None:
+        current: Key = Key()
+        cluster = _Cluster()
+        align: int = 4
+        start = 0
+        meta_pending = True
+    else:
+        current, cluster, align, start = state
+        meta_pending = False
+
+    for r, rows_r in enumerate(rows, start):
         if isinstance(rows_r, list):
+            if meta_pending:
+                meta_pending = False
+                yield meta
             for k, item in enumerate(rows_r):
                 if isinstance(item, str):
-                    new_key: Key = deepcopy(current)
-
-                    # Calculate some generated values
-                    new_key.width2 = current.width if new_key.width2 == 0 else current.width2
-                    new_key.height2 = current.height if new_key.height2 == 0 else current.height2
-                    new_key.labels = reorder_labels_in(item.split("\n"), align)
-                    new_key.textSize = [
-                        (int(x) if x.isdecimal() else None) if isinstance(x, str) else x for x in reorder_labels_in(new_key.textSize, align)]
-
-                    # Clean up the data
-                    for i in range(UB_LABEL_MAP):
-                        if not new_key.labels[i]:
-                            new_key.textSize[i] = None
-                            new_key.textColor[i] = None
-                        if new_key.textSize[i] == new_key.default.textSize:
-                            new_key.textSize[i] = None
-                        if new_key.textColor[i] == new_key.default.textColor:
-                            new_key.textColor[i] = None
+                    new_key = emit_key(current, item.split("\n"), align)
 
                     # Add the key!
-                    kbd.keys.append(new_key)
+                    yield new_key
 
                     # Set up for the next key
                     current.x += current.width
                     current.width = current.height = 1
                     current.x2 = current.y2 = current.width2 = current.height2 = 0
                     current.nub = current.stepped = current.decal = False
-                else:
-                    if k != 0 and any(item.get(v) is not None for v in ['r', 'rx', 'ry']):
+                elif isinstance(item, dict):
+                    plan = _property_plans.get(tuple(item))
+                    if plan is None:
+                        plan = _compile_property_plan(item)
+                    rotation_keys, has_align, setters = plan
+                    if k != 0 and rotation_keys and any(item[v] is not None for v in rotation_keys):
                         _deserialize_error("rotation can only be specified on the first key in a row", item)
-
-                    if item.get('g') is not None:
-                        current.ghost = bool(item['g'])
-                    if item.get('a') is not None:
+                    if has_align and item['a'] is not None:
                         align = item['a']
-                    if item.get('f'):
-                        current.default.textSize = int(item['f'])
-                        current.textSize = [None, ] * UB_LABEL_MAP
-                    if item.get('f2'):
-                        for i in range(1, UB_LABEL_MAP):
-                            current.textSize[i] = int(item['f2'])
-                    if item.get('t'):
-                        split = item['t'].split("\n")
-                        if len(split[0]) > 0:
-                            current.default.textColor = split[0]
-                        current.textColor = reorder_labels_in(split, align)
-                    if item.get('rx') is not None:
-                        cluster.x = float(item['rx'])
-                        current.rotation_x = cluster.x
-                        current.x = cluster.x
-                        current.y = cluster.y
-                    if item.get('ry') is not None:
-                        cluster.y = float(item['ry'])
-                        current.rotation_y = cluster.y
-                        current.x = cluster.x
-                        current.y = cluster.y
-
-                    current.x += item.get('x', 0.)
-                    current.y += item.get('y', 0.)
-
-                    for item_key, attr, c in [
-                        ('fa', 'textSize', lambda x: x),
-                        ('p', 'profile', str),
-                        ('c', 'color', str),
-                        ('x2', 'x2', float),
-                        ('y2', 'y2', float),
-                        ('n', 'nub', bool),
-                        ('l', 'stepped', bool),
-                        ('d', 'decal', bool),
-                        ('sm', 'sm', str),
-                        ('sb', 'sb', str),
-                        ('st', 'st', str),
-                    ]:
-                        v = item.get(item_key)
-                        if v is not None:
-                            setattr(current, attr, c(v))
-                    for item_key, attr in [
-                        ('r', 'rotation_angle'),
-                        ('w', 'width'),
-                        ('w', 'width2'),
-                        ('h', 'height'),
-                        ('h', 'height2'),
-                        ('w2', 'width2'),
-                        ('h2', 'height2'),
-                    ]:
-                        v = item.get(item_key)
-                        if v is not None:
-                            setattr(current, attr, float(v))
+                    for item_key, setter in setters:
+                        setter(current, cluster, item[item_key], align)
+                else:
+                    _deserialize_error("unexpected", item)
 
             # End of the row
             current.y += 1
@@ -224,14 +409,370 @@ def deserialize(rows: List) -> Keyboard:  # noqa: C901
         elif isinstance(rows_r, dict):
             if r != 0:
                 _deserialize_error("keyboard metadata must the be first element", rows_r)
-            for prop in vars(kbd.meta).keys():
+            for prop in vars(meta).keys():
                 if prop in rows_r:
-                    setattr(kbd.meta, prop, rows_r[prop])
+                    setattr(meta, prop, rows_r[prop])
+            meta_pending = False
+            yield meta
         else:
             _deserialize_error("unexpected", rows_r)
-    return kbd
-
-
-def parse(json: str) -> Keyboard:
-    import json5
-    return deserialize(json5.loads(json))
+        if checkpoint is not None:
+            checkpoint(r, current, cluster, align)
+    if meta_pending:
+        yield meta
+
+
+def _deserialize_trusted(rows: Iterable, emit_key: Callable) -> Tuple[KeyboardMetadata, List]:
+    # _iter_deserialize() without any check, for rows known to be valid like the output of serialize().
+    # Keys are collected in a list rather than yielded.
+    meta = KeyboardMetadata()
+    keys: List = []
+    append = keys.append
+    current = Key()
+    cluster = _Cluster()
+    align = 4
+    plans = _property_plans
+    for rows_r in rows:
+        if isinstance(rows_r, dict):
+            for prop in vars(meta).keys():
+                if prop in rows_r:
+                    setattr(meta, prop, rows_r[prop])
+            continue
+        for item in rows_r:
+            if type(item) is str:
+                append(emit_key(current, item.split("\n"), align))
+                current.x += current.width
+                current.width = current.height = 1
+                current.x2 = current.y2 = current.width2 = current.height2 = 0
+                current.nub = current.stepped = current.decal = False
+            else:
+                plan = plans.get(tuple(item))
+                if plan is None:
+                    plan = _compile_property_plan(item)
+                if plan[1] and item['a'] is not None:
+                    align = item['a']
+                for item_key, setter in plan[2]:
+                    setter(current, cluster, item[item_key], align)
+        current.y += 1
+        current.x = current.rotation_x
+    return meta, keys
+
+
+def _key_emitter(compact: bool, pool: Optional['InternPool']) -> Callable:
+    emit_key: Callable = _emit_key
+    if compact:
+        from .compact import _emit_compact_key
+        emit_key = _emit_compact_key
+    if pool is not None:
+        emit_key = pool.wrap(emit_key)
+    return emit_key
+
+
+def iter_deserialize(rows: Iterable, compact: bool = False, pool: Optional['InternPool'] = None) -> Iterator:
+    """
+    Generator version of ``deserialize()``. Yields ``KeyboardMetadata`` first, then each
+    ``Key`` (``CompactKey`` if ``compact``) as soon as its row item is processed.
+
+    ``rows`` can be any iterable, for example ``pykle_serial.stream.iter_rows()``.
+    If ``pool`` (``pykle_serial.intern.InternPool``) is given, equal values are shared through it.
+    """
+    return _iter_deserialize(rows, _key_emitter(compact, pool))
+
+
+def deserialize(rows: List, compact: bool = False, pool: Optional['InternPool'] = None,
+                stats: Optional['DeserializeStats'] = None, lazy: bool = False,
+                trusted: bool = False) -> Union[Keyboard, 'CompactKeyboard', 'LazyKeyboard']:
+    """
+    ``trusted=True`` skips all the checks, for rows known to be valid, like the output of ``serialize()``.
+    Invalid rows then give wrong results or arbitrary exceptions; see ``pykle_serial.validation.validate()``.
+    """
+    if lazy:
+        if compact or stats is not None:
+            raise ValueError("Error: lazy cannot be combined with compact or stats")
+        from .lazy import _deserialize_lazy
+        return _deserialize_lazy(rows, pool, trusted)
+    if stats is not None:
+        if trusted:
+            raise ValueError("Error: trusted cannot be combined with stats")
+        from .instrument import _deserialize
+        return _deserialize(rows, compact, pool, stats)
+    if trusted:
+        meta, keys = _deserialize_trusted(rows, _key_emitter(compact, pool))
+    else:
+        if not isinstance(rows, List):
+            _deserialize_error("expected an array of objects", rows)
+        it = iter_deserialize(rows, compact, pool)
+        meta = next(it)
+        keys = list(it)
+    if compact:
+        from .compact import CompactKeyboard
+        return CompactKeyboard(meta, keys)
+    return Keyboard(meta, keys)
+
+
+def parse(json: str, compact: bool = False, pool: Optional['InternPool'] = None,
+          stats: Optional['DeserializeStats'] = None, lazy: bool = False,
+          trusted: bool = False) -> Union[Keyboard, 'CompactKeyboard', 'LazyKeyboard']:
+    if stats is not None and not lazy:
+        if trusted:
+            raise ValueError("Error: trusted cannot be combined with stats")
+        from .instrument import _parse
+        return _parse(json, compact, pool, stats)
+    from .rawdata import loads
+    return deserialize(loads(json), compact, pool, stats, lazy, trusted)
+
+
+# Deltas of x / y are rounded to this number of decimal places when serialized.
+# It keeps floating point noise (0.30000000000000004) out of the output.
+_SERIALIZE_DIGITS = 10
+
+
+def _num(v: float) -> Union[int, float]:
+    return int(v) if float(v).is_integer() else v
+
+
+def _join_labels(values: List) -> str:
+    return "\n".join("" if v is None else str(v) for v in values).rstrip("\n")
+
+
+class _SerializerState:
+    # Mirror of the running state of deserialize(), enough to know what it would
+    # emit for the next key.
+    def __init__(self):
+        self.x: float = 0.
+        self.y: float = 0.
+        self.rotation_x: float = 0.
+        self.rotation_y: float = 0.
+        self.rotation_angle: float = 0.
+        self.color: str = Key.color
+        self.profile: str = Key.profile
+        self.ghost: bool = Key.ghost
+        self.sm: str = Key.sm
+        self.sb: str = Key.sb
+        self.st: str = Key.st
+        self.align: int = 4
+        self.default_text_size: int = _inner_Key_default.textSize
+        self.default_text_color: str = _inner_Key_default.textColor
+        self.text_size: List = [None, ] * UB_LABEL_MAP  # serialized order, as deserialize() keeps it
+        self.text_color: List = [None, ] * UB_LABEL_MAP  # normalized order
+
+
+def _serialize_meta(meta: KeyboardMetadata) -> Dict[str, Any]:
+    ret: Dict[str, Any] = {}
+    default = KeyboardMetadata()
+    for f in fields(KeyboardMetadata):
+        v = getattr(meta, f.name)
+        if v != getattr(default, f.name):
+            ret[f.name] = asdict(v) if is_dataclass(v) else v
+    return ret
+
+
+def _text_size_matches(state: _SerializerState, key: Key, labels: Sequence, inv: List[int]) -> bool:
+    default = key.default.textSize
+    for j, lbl in enumerate(labels):
+        if not lbl:
+            continue
+        v = state.text_size[inv[j]]
+        if not v:
+            v = None
+        expected = key.textSize[j]
+        if expected is None:
+            if v is not None and v != default:
+                return False
+        elif v != expected:
+            return False
+    return True
+
+
+def _text_color_matches(state: _SerializerState, key: Key, labels: Sequence) -> bool:
+    if state.default_text_color != key.default.textColor:
+        return False
+    default = key.default.textColor
+    for j, lbl in enumerate(labels):
+        if not lbl:
+            continue
+        v = state.text_color[j]
+        expected = key.textColor[j]
+        if expected is None:
+            if v is not None and v != default:
+                return False
+        elif v != expected:
+            return False
+    return True
+
+
+def _text_color_align(key: Key, labels: Sequence, align: int) -> int:
+    # 't' puts the default text color at LABEL_MAP[a][0] too, so that position must not need
+    # another color. Returns an align which works for 't', preferring align.
+    default = key.default.textColor
+    for a in [align, ] + reorder_labels_out.ALIGN_PREFERENCE:
+        inv = reorder_labels_out.INVERSE_LABEL_MAP[a]
+        p0 = reorder_labels_in.LABEL_MAP[a][0]
+        if all(inv[j] != -1 and (j != p0 or key.textColor[j] == default)
+               for j, lbl in enumerate(labels) if lbl and key.textColor[j] is not None):
+            return a
+    return align
+
+
+def _serialize_key_props(state: _SerializerState, key: Key) -> Tuple[List[Dict[str, Any]], str]:  # noqa: C901
+    # Returns the property dicts with the properties which differ from the running state,
+    # and the label item of the key. Updates the state the same way deserialize() would.
+    # Usually there is at most one dict. A second one is needed only when the text colors
+    # cannot be written with the align of the labels.
+    labels = key.labels
+    pre: Dict[str, Any] = {}
+    props: Dict[str, Any] = {}
+
+    # Text color
+    align = reorder_labels_out.align_for(labels, state.align)
+    if not _text_color_matches(state, key, labels):
+        t_align = _text_color_align(key, labels, align)
+        t_props = props
+        if t_align != align:
+            t_props = pre
+            if t_align != state.align:
+                pre['a'] = t_align
+                state.align = t_align
+        inv = reorder_labels_out.INVERSE_LABEL_MAP[t_align]
+        t: List = [None, ] * UB_LABEL_MAP
+        for j, lbl in enumerate(labels):
+            if lbl and key.textColor[j] is not None and inv[j] != -1:
+                t[inv[j]] = key.textColor[j]
+        t[0] = key.default.textColor
+        t_props['t'] = _join_labels(t)
+        state.default_text_color = key.default.textColor
+        state.text_color = reorder_labels_in(["" if c is None else c for c in t], t_align)
+
+    if align != state.align:
+        props['a'] = align
+        state.align = align
+    inv = reorder_labels_out.INVERSE_LABEL_MAP[align]
+
+    if key.color != state.color:
+        props['c'] = key.color
+        state.color = key.color
+    if key.ghost != state.ghost:
+        props['g'] = key.ghost
+        state.ghost = key.ghost
+    if key.profile != state.profile:
+        props['p'] = key.profile
+        state.profile = key.profile
+    for attr in ('sm', 'sb', 'st'):
+        v = getattr(key, attr)
+        if v != getattr(state, attr):
+            props[attr] = v
+            setattr(state, attr, v)
+
+    # Text size
+    f_emitted = False
+    if key.default.textSize != state.default_text_size:
+        props['f'] = key.default.textSize
+        state.default_text_size = key.default.textSize
+        state.text_size = [None, ] * UB_LABEL_MAP
+        f_emitted = True
+    if not _text_size_matches(state, key, labels, inv):
+        fa: List = [None, ] * UB_LABEL_MAP
+        for j, lbl in enumerate(labels):
+            if lbl and key.textSize[j] is not None:
+                fa[inv[j]] = key.textSize[j]
+        sizes = {fa[inv[j]] for j, lbl in enumerate(labels) if lbl and inv[j] != 0}
+        if f_emitted and fa[0] is None and len(sizes) == 1 and None not in sizes:
+            # 'f2' writes to the fresh list made by 'f'.
+            f2 = sizes.pop()
+            props['f2'] = f2
+            state.text_size = [None, ] + [f2, ] * (UB_LABEL_MAP - 1)
+        else:
+            while fa and fa[-1] is None:
+                fa.pop()
+            props['fa'] = fa
+            state.text_size = fa + [None, ] * (UB_LABEL_MAP - len(fa))
+
+    # Position
+    dy = round(key.y - state.y, _SERIALIZE_DIGITS)
+    if dy != 0:
+        props['y'] = _num(dy)
+        state.y += props['y']
+    dx = round(key.x - state.x, _SERIALIZE_DIGITS)
+    if dx != 0:
+        props['x'] = _num(dx)
+        state.x += props['x']
+
+    # Size and shape; these are reset after every key.
+    if key.width != 1:
+        props['w'] = _num(key.width)
+    if key.height != 1:
+        props['h'] = _num(key.height)
+    if key.width2 != key.width:
+        props['w2'] = _num(key.width2)
+    if key.height2 != key.height:
+        props['h2'] = _num(key.height2)
+    if key.x2 != 0:
+        props['x2'] = _num(key.x2)
+    if key.y2 != 0:
+        props['y2'] = _num(key.y2)
+    if key.nub:
+        props['n'] = True
+    if key.stepped:
+        props['l'] = True
+    if key.decal:
+        props['d'] = True
+    state.x += key.width
+
+    return [d for d in (pre, props) if d], _join_labels(reorder_labels_out(labels, align))
+
+
+def serialize(keyboard: Keyboard) -> List:  # noqa: C901
+    """
+    Inverse of ``deserialize()``. Returns KLE raw rows which deserialize to ``keyboard``.
+
+    Only the properties which change from key to key are written.
+    Keys are written in the order of ``keyboard.keys``. A new row starts when
+    ``y`` or the rotation cluster changes.
+    """
+    rows: List = []
+    meta = _serialize_meta(keyboard.meta)
+    if meta:
+        rows.append(meta)
+
+    state = _SerializerState()
+    row: List = []
+    row_y: Optional[float] = None
+    for key in keyboard.keys:
+        cluster_changed = (key.rotation_angle != state.rotation_angle
+                           or key.rotation_x != state.rotation_x or key.rotation_y != state.rotation_y)
+        if row_y is None or key.y != row_y or cluster_changed:
+            if row_y is not None:
+                # End of the row, as deserialize() does
+                rows.append(row)
+                row = []
+                state.y += 1
+                state.x = state.rotation_x
+            row_y = key.y
+            rotation: Dict[str, Any] = {}
+            # Rotation can only be specified on the first key in a row
+            if key.rotation_angle != state.rotation_angle:
+                rotation['r'] = _num(key.rotation_angle)
+                state.rotation_angle = float(key.rotation_angle)
+            if key.rotation_x != state.rotation_x or key.rotation_y != state.rotation_y:
+                if key.rotation_x != state.rotation_x:
+                    rotation['rx'] = _num(key.rotation_x)
+                if key.rotation_y != state.rotation_y:
+                    rotation['ry'] = _num(key.rotation_y)
+                state.rotation_x = float(key.rotation_x)
+                state.rotation_y = float(key.rotation_y)
+                state.x = state.rotation_x
+                state.y = state.rotation_y
+        else:
+            rotation = {}
+        props, label = _serialize_key_props(state, key)
+        if rotation:
+            if props:
+                rotation.update(props[0])
+                props[0] = rotation
+            else:
+                props = [rotation]
+        row.extend(props)
+        row.append(label)
+    if row_y is not None:
+        rows.append(row)
+    return rows
@@ -0,0 +1,214 @@
+import heapq
+from math import floor, hypot
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .geometry import Rect, bounding_boxes, rotation_matrix
+from .table import np
+
+
+# Per key: rotation_x, rotation_y, cos, sin, then the primary rect and the secondary rect
+# (None if it is the same) as (min_x, min_y, max_x, max_y) in the unrotated frame of the key.
+_Frame = Tuple[float, float, float, float, Rect, Optional[Rect]]
+
+
+def _frame(key: Any) -> _Frame:
+    cs, _, sn, _, _, _ = rotation_matrix(key.rotation_angle)
+    x = key.x
+    y = key.y
+    primary = (x, y, x + key.width, y + key.height)
+    secondary: Optional[Rect] = (x + key.x2, y + key.y2, x + key.x2 + key.width2, y + key.y2 + key.height2)
+    if secondary == primary:
+        secondary = None
+    return key.rotation_x, key.rotation_y, cs, sn, primary, secondary
+
+
+def _rect_distance(u: float, v: float, r: Rect) -> float:
+    dx = max(r[0] - u, 0., u - r[2])
+    dy = max(r[1] - v, 0., v - r[3])
+    return hypot(dx, dy)
+
+
+def _world_corners(frame: _Frame, r: Rect) -> List[Tuple[float, float]]:
+    rx, ry, cs, sn = frame[:4]
+    return [(rx + cs * (x - rx) - sn * (y - ry), ry + sn * (x - rx) + cs * (y - ry))
+            for x, y in ((r[0], r[1]), (r[2], r[1]), (r[2], r[3]), (r[0], r[3]))]
+
+
+def _rect_intersects(frame: _Frame, r: Rect, query: Rect, local: Sequence[Tuple[float, float]]) -> bool:
+    # Separating axis test of the rotated rect r and the axis-aligned query.
+    # local is the corners of the query in the frame of the key.
+    if max(u for u, _ in local) < r[0] or min(u for u, _ in local) > r[2]:
+        return False
+    if max(v for _, v in local) < r[1] or min(v for _, v in local) > r[3]:
+        return False
+    world = _world_corners(frame, r)
+    if max(x for x, _ in world) < query[0] or min(x for x, _ in world) > query[2]:
+        return False
+    if max(y for _, y in world) < query[1] or min(y for _, y in world) > query[3]:
+        return False
+    return True
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the keys of a ``Keyboard`` / ``CompactKeyboard`` for hit-testing and
+    range queries. Rotation and the secondary rect (``x2`` / ``y2`` / ``width2`` / ``height2``)
+    of stepped or ISO keys are taken into account. Edges belong to the key.
+
+    The index is a snapshot: build a new one after the keys are changed.
+    ``cell_size`` is in keyboard units; the default suits ordinary 1u keys.
+    """
+    def __init__(self, keyboard: Any, cell_size: float = 1.):
+        if cell_size <= 0:
+            raise ValueError("Error: cell_size must be positive")
+        self.keys: List[Any] = list(keyboard.keys)
+        self.cell_size = cell_size
+        self._frames: List[_Frame] = [_frame(k) for k in self.keys]
+        boxes = bounding_boxes(keyboard)
+        if np is not None and isinstance(boxes, np.ndarray):
+            boxes = boxes.tolist()
+        self._boxes: List[Rect] = [tuple(b) for b in boxes]  # type: ignore
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        cells = self._cells
+        for i, (x0, y0, x1, y1) in enumerate(self._boxes):
+            cx0, cy0 = self._cell(x0, y0)
+            cx1, cy1 = self._cell(x1, y1)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    c = cells.get((cx, cy))
+                    if c is None:
+                        cells[(cx, cy)] = [i]
+                    else:
+                        c.append(i)
+        if cells:
+            self._grid = (min(c[0] for c in cells), min(c[1] for c in cells),
+                          max(c[0] for c in cells), max(c[1] for c in cells))
+        self._occupied: List[Tuple[int, int]] = list(cells)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def _to_local(self, i: int, x: float, y: float) -> Tuple[float, float]:
+        rx, ry, cs, sn = self._frames[i][:4]
+        dx = x - rx
+        dy = y - ry
+        return rx + cs * dx + sn * dy, ry - sn * dx + cs * dy
+
+    def _distance(self, i: int, x: float, y: float) -> float:
+        frame = self._frames[i]
+        u, v = self._to_local(i, x, y)
+        d = _rect_distance(u, v, frame[4])
+        if frame[5] is not None:
+            d = min(d, _rect_distance(u, v, frame[5]))
+        return d
+
+    def keys_at(self, x: float, y: float) -> List[Any]:
+        """
+        Returns the keys which contain the point, in the order of ``keyboard.keys``
+        (the topmost key is the last).
+        """
+        ret = []
+        boxes = self._boxes
+        for i in self._cells.get(self._cell(x, y), ()):
+            b = boxes[i]
+            if b[0] <= x <= b[2] and b[1] <= y <= b[3] and self._distance(i, x, y) == 0.:
+                ret.append(i)
+        return [self.keys[i] for i in ret]
+
+    def _candidates(self, rect: Rect) -> List[int]:
+        if not self._cells:
+            return []
+        cx0, cy0 = self._cell(rect[0], rect[1])
+        cx1, cy1 = self._cell(rect[2], rect[3])
+        gx0, gy0, gx1, gy1 = self._grid
+        found = set()
+        cells = self._cells
+        for cy in range(max(cy0, gy0), min(cy1, gy1) + 1):
+            for cx in range(max(cx0, gx0), min(cx1, gx1) + 1):
+                c = cells.get((cx, cy))
+                if c is not None:
+                    found.update(c)
+        return sorted(found)
+
+    def keys_in(self, rect: Rect, contained: bool = False) -> List[Any]:
+        """
+        Returns the keys which intersect ``rect`` ``(min_x, min_y, max_x, max_y)``,
+        or, if ``contained``, which are entirely inside it. In the order of ``keyboard.keys``.
+        """
+        qx0, qy0, qx1, qy1 = rect
+        ret = []
+        for i in self._candidates(rect):
+            b = self._boxes[i]
+            if b[2] < qx0 or b[0] > qx1 or b[3] < qy0 or b[1] > qy1:
+                continue
+            inside = qx0 <= b[0] and b[2] <= qx1 and qy0 <= b[1] and b[3] <= qy1
+            if contained or inside:
+                if inside:
+                    ret.append(i)
+                continue
+            frame = self._frames[i]
+            local = [self._to_local(i, x, y) for x, y in ((qx0, qy0), (qx1, qy0), (qx1, qy1), (qx0, qy1))]
+            if _rect_intersects(frame, frame[4], rect, local) or (
+                    frame[5] is not None and _rect_intersects(frame, frame[5], rect, local)):
+                ret.append(i)
+        return [self.keys[i] for i in ret]
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[Any]:  # noqa: C901
+        """
+        Returns the ``k`` keys nearest to the point, nearest first. The distance is 0 inside a key.
+        Ties are in the order of ``keyboard.keys``.
+        """
+        if k <= 0 or not self._cells:
+            return []
+        cs = self.cell_size
+        px, py = self._cell(x, y)
+        gx0, gy0, gx1, gy1 = self._grid
+        cells = self._cells
+        seen = set()
+        heap: List[Tuple[float, int]] = []  # k best so far, as (-distance, -index)
+
+        def visit(c: Tuple[int, int]) -> None:
+            for i in cells.get(c, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                item = (-self._distance(i, x, y), -i)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        r = max(0, gx0 - px, px - gx1, gy0 - py, py - gy1)  # smaller rings are outside of the grid
+        r_max = max(px - gx0, gx1 - px, py - gy0, gy1 - py)
+        # Rings are searched while they have fewer cells than there are occupied cells. Beyond,
+        # as on sparse layouts or when k is about the number of keys, the occupied cells left are
+        # visited by their distance instead, so the cost follows the keys and not the grid area.
+        while r <= r_max and 8 * r <= len(self._occupied):
+            for cy in range(max(py - r, gy0), min(py + r, gy1) + 1):
+                if cy == py - r or cy == py + r:
+                    xs: Sequence[int] = range(max(px - r, gx0), min(px + r, gx1) + 1)
+                else:
+                    xs = [cx for cx in (px - r, px + r) if gx0 <= cx <= gx1]
+                for cx in xs:
+                    visit((cx, cy))
+            # Keys not seen yet are outside of the rings searched so far.
+            bound = min(x - (px - r) * cs, (px + r + 1) * cs - x, y - (py - r) * cs, (py + r + 1) * cs - y)
+            if len(heap) == k and -heap[0][0] < bound:
+                break
+            r += 1
+        else:
+            rest = []
+            for cx, cy in self._occupied:
+                if max(abs(cx - px), abs(cy - py)) >= r:
+                    d = hypot(max(cx * cs - x, 0., x - (cx + 1) * cs), max(cy * cs - y, 0., y - (cy + 1) * cs))
+                    rest.append((d, cx, cy))
+            rest.sort()
+            for d, cx, cy in rest:
+                # A key is at least as far as the nearest of its cells.
+                if len(heap) == k and -heap[0][0] < d:
+                    break
+                visit((cx, cy))
+        return [self.keys[-i] for _, i in sorted(heap, reverse=True)]
@@ -0,0 +1,147 @@
+import codecs
+import io
+import re
+from typing import IO, Any, Iterator, Optional, Union
+
+from .rawdata import loads_value
+from .serial import iter_deserialize
+
+
+# Complete strings, or brackets. A lone quote is a string which is not complete in the buffer yet.
+_SCAN_RE = re.compile(r'''"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|["'\[\]{}]''')
+_WS_RE = re.compile(r'\s*')
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class _Scanner:
+    # Cuts a text (or UTF-8 binary) stream into top-level values.
+    # Only the unread part of the stream, from mark if it is set, is kept in memory.
+    def __init__(self, fp: IO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.mark: Optional[int] = None
+        self.decoder: Optional[codecs.IncrementalDecoder] = None
+
+    def _read_more(self) -> int:
+        # Appends the next chunk to the buffer. Returns how far the buffer has been shifted
+        # to drop the consumed text, or -1 at the end of the stream.
+        chunk = self.fp.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            eof = not chunk
+            chunk = self.decoder.decode(chunk, final=eof)
+        else:
+            eof = not chunk
+        base = self.pos if self.mark is None else min(self.pos, self.mark)
+        self.buf = self.buf[base:] + chunk
+        self.pos -= base
+        if self.mark is not None:
+            self.mark -= base
+        return -1 if eof else base
+
+    def peek(self) -> str:
+        # Skips whitespace and returns the next character, or '' at the end of the stream.
+        while True:
+            self.pos = _WS_RE.match(self.buf, self.pos).end()  # type: ignore
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self._read_more() < 0:
+                return ''
+
+    def read_value(self) -> str:
+        # Returns the text of the array or object at pos, and moves pos after it.
+        if self.peek() not in ('[', '{'):
+            raise ValueError("Error: expected an array or object at offset " + str(self.pos))
+        start = self.pos
+        i = start
+        depth = 0
+        while True:
+            m = _SCAN_RE.search(self.buf, i)
+            if m is None or m.group(0) in ('"', "'"):
+                self.pos = start
+                shift = self._read_more()
+                if shift < 0:
+                    raise ValueError("Error: unexpected end of stream")
+                start -= shift
+                i -= shift
+                continue
+            t = m.group(0)
+            i = m.end()
+            if t in ('[', '{'):
+                depth += 1
+            elif t in (']', '}'):
+                depth -= 1
+                if depth == 0:
+                    break
+        self.pos = i
+        return self.buf[start:i]
+
+
+def _has_outer_array(sc: _Scanner) -> bool:
+    # KLE raw data may lack the outer []. Looks ahead, without consuming anything:
+    #   [[...   or  [{...}, [...   -> outer array of rows
+    #   [{...}, "...   or  ["...  -> the first row of raw data
+    if sc.peek() != '[':
+        return False
+    sc.mark = sc.pos
+    try:
+        sc.pos += 1
+        c = sc.peek()
+        if c in ('[', ']'):
+            return True
+        if c != '{':
+            return False
+        sc.read_value()
+        c = sc.peek()
+        if c == ',':
+            sc.pos += 1
+            c = sc.peek()
+        return c in ('[', ']', '')
+    finally:
+        sc.pos = sc.mark
+        sc.mark = None
+
+
+def iter_rows(fp: Union[IO, str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:  # noqa: C901
+    """
+    Reads rows of JSON / KLE raw data / JSON5 from a file object incrementally, and yields them
+    one by one. Only about one row is in memory at a time.
+
+    The outer ``[]`` is optional, as in KLE raw data. Comments are not supported.
+    """
+    if isinstance(fp, str):
+        fp = io.StringIO(fp)
+    sc = _Scanner(fp, chunk_size)
+    outer = _has_outer_array(sc)
+    if outer:
+        sc.pos += 1
+    while True:
+        c = sc.peek()
+        if c == ']' and outer:
+            sc.pos += 1
+            break
+        if c == '':
+            if outer:
+                raise ValueError("Error: unexpected end of stream")
+            break
+        yield loads_value(sc.read_value())[0]
+        c = sc.peek()
+        if c == ',':
+            sc.pos += 1
+        elif c == '' and outer:
+            raise ValueError("Error: unexpected end of stream")
+        elif not (c == ']' and outer) and c != '':
+            raise ValueError("Error: expected ',' at offset " + str(sc.pos))
+    if sc.peek() != '':
+        raise ValueError("Error: unexpected data after the rows")
+
+
+def iter_parse(fp: Union[IO, str], compact: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator:
+    """
+    Streaming version of ``parse()``. Yields ``KeyboardMetadata`` first, then each key.
+    """
+    return iter_deserialize(iter_rows(fp, chunk_size), compact)
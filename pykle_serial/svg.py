@@ -0,0 +1,189 @@
+import os
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import IO, Any, Dict, List, Tuple, Union
+
+from .bulk import ItemError
+from .files import load_dir
+from .geometry import extents
+from .labels import to_text
+
+# Pixels per key unit, and the insets of the top face, as drawn by KLE.
+DEFAULT_UNIT = 54.
+_TOP_INSET = (6 / 54, 3 / 54, 6 / 54, 9 / 54)  # left, top, right, bottom
+_LABEL_PAD = 2 / 54
+
+_STYLE = ('<style>'
+          '.o{stroke:#000;stroke-opacity:.35;stroke-width:1}'
+          '.f{stroke:none}'
+          '.t{fill:#fff;fill-opacity:.2;stroke:none}'
+          'text{font-family:%s}'
+          '</style>')
+
+# Keys are written in chunks of this many keys.
+_CHUNK = 1024
+
+# Label positions (index in Key.labels) -> (column, row): column 0..2 left / center / right,
+# row 0..2 top / center / bottom of the top face, 3 the front.
+_LABEL_CELLS = [(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (0, 2), (1, 2), (2, 2), (0, 3), (1, 3), (2, 3)]
+_ANCHORS = ('start', 'middle', 'end')
+
+# Characters not allowed in XML 1.0: controls apart from tab, newline and carriage return,
+# lone surrogates, U+FFFE and U+FFFF. They are dropped.
+_XML_ILLEGAL = dict.fromkeys([c for c in range(0x20) if c not in (0x09, 0x0a, 0x0d)] + list(range(0xd800, 0xe000))
+                             + [0xfffe, 0xffff])
+
+_Shape = Tuple[float, float, float, float, float, float, bool]  # width, height, x2, y2, width2, height2, stepped
+
+
+def _xml(s: str, quote: bool = True) -> str:
+    return escape(s.translate(_XML_ILLEGAL), quote)
+
+
+def _num(v: float) -> str:
+    return '%.7g' % v
+
+
+def _shape_def(shape_id: str, shape: _Shape, unit: float) -> str:
+    # Outlines of both rects first, then fills without stroke to hide the inner edges of ISO keys,
+    # then the top faces.
+    w, h, x2, y2, w2, h2, stepped = shape
+    rects = [(0., 0., w, h)]
+    if (x2, y2, w2, h2) != (0., 0., w, h):
+        rects.append((x2, y2, w2, h2))
+    il, it, ir, ib = _TOP_INSET
+    parts = ['<g id="%s">' % shape_id]
+    for x, y, rw, rh in rects:
+        parts.append('<rect class="o" x="%s" y="%s" width="%s" height="%s" rx="%s"/>' % (
+            _num(x * unit), _num(y * unit), _num(rw * unit), _num(rh * unit), _num(unit / 10)))
+    if len(rects) > 1:
+        for x, y, rw, rh in rects:
+            parts.append('<rect class="f" x="%s" y="%s" width="%s" height="%s" rx="%s"/>' % (
+                _num(x * unit), _num(y * unit), _num(rw * unit), _num(rh * unit), _num(unit / 10)))
+    for x, y, rw, rh in (rects[:1] if stepped else rects):
+        parts.append('<rect class="t" x="%s" y="%s" width="%s" height="%s" rx="%s"/>' % (
+            _num((x + il) * unit), _num((y + it) * unit), _num((rw - il - ir) * unit), _num((rh - it - ib) * unit),
+            _num(unit / 18)))
+    parts.append('</g>')
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=8192)
+def _label_svg(label: str, i: int, size: int, color: str, w: float, h: float, unit: float) -> str:
+    # <text> of one label, relative to the key. Memoized, as labels repeat across keys and layouts.
+    text = to_text(label).translate(_XML_ILLEGAL)
+    if not text:
+        return ''
+    il, it, ir, ib = _TOP_INSET
+    col, row = _LABEL_CELLS[i]
+    font = (6 + 2 * size) * unit / 54
+    x = (il + _LABEL_PAD, w / 2, w - ir - _LABEL_PAD)[col] * unit
+    if row == 3:
+        y = (h - ib / 2) * unit + font * .35
+    else:
+        top = (it + _LABEL_PAD) * unit + font * .8
+        bottom = (h - ib - _LABEL_PAD) * unit
+        y = (top, (top + bottom) / 2, bottom)[row]
+    lines = text.split('\n')
+    if len(lines) > 1 and row > 0:
+        y -= font * (len(lines) - 1) * (.5 if row == 1 else 1.)
+    head = '<text x="%s" y="%s" font-size="%s" fill="%s" text-anchor="%s">' % (
+        _num(x), _num(y), _num(font), _xml(color), _ANCHORS[col])
+    if len(lines) == 1:
+        return head + escape(text, False) + '</text>'
+    return head + ''.join('<tspan x="%s" dy="%s">%s</tspan>' % (_num(x), _num(font) if j else '0', escape(line, False))
+                          for j, line in enumerate(lines)) + '</text>'
+
+
+def _labels_svg(key: Any, unit: float) -> str:
+    default = key.default
+    text_size = key.textSize
+    text_color = key.textColor
+    return ''.join(
+        _label_svg(label, i, text_size[i] or default.textSize, text_color[i] or default.textColor,
+                   key.width, key.height, unit)
+        for i, label in enumerate(key.labels) if label)
+
+
+def render_svg(keyboard: Any, fp: Union[str, os.PathLike, IO], unit: float = DEFAULT_UNIT,
+               font_family: str = 'Helvetica, Arial, sans-serif') -> None:
+    """
+    Writes an SVG image of ``keyboard`` (``Keyboard``, ``CompactKeyboard`` or ``LazyKeyboard``) to a path
+    or a text file object, key by key. ``unit`` is the size of a 1u key in pixels.
+
+    Rotation, the secondary rect of stepped / ISO keys, colors and labels (as plain text) are drawn;
+    decal keys have labels only, and ghost keys are faded. Each distinct key shape is written once
+    and referenced by ``<use>``.
+    """
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, 'w', encoding='utf-8') as f:
+            render_svg(keyboard, f, unit, font_family)
+        return
+    ext = extents(keyboard) or (0., 0., 0., 0.)
+    margin = unit / 10
+    x0 = ext[0] * unit - margin
+    y0 = ext[1] * unit - margin
+    width = (ext[2] - ext[0]) * unit + 2 * margin
+    height = (ext[3] - ext[1]) * unit + 2 * margin
+    write = fp.write
+    write('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+          'viewBox="%s %s %s %s" width="%s" height="%s">' % (
+              _num(x0), _num(y0), _num(width), _num(height), _num(width), _num(height)))
+    write(_STYLE % _xml(font_family, False))
+    background = keyboard.meta.backcolor
+    if background:
+        write('<rect x="%s" y="%s" width="%s" height="%s" fill="%s"/>' % (
+            _num(x0), _num(y0), _num(width), _num(height), _xml(background)))
+
+    shapes: Dict[_Shape, str] = {}
+    buf: List[str] = []
+    for key in keyboard.keys:
+        if key.rotation_angle:
+            transform = 'rotate(%s %s %s) translate(%s %s)' % (
+                _num(key.rotation_angle), _num(key.rotation_x * unit), _num(key.rotation_y * unit),
+                _num(key.x * unit), _num(key.y * unit))
+        else:
+            transform = 'translate(%s %s)' % (_num(key.x * unit), _num(key.y * unit))
+        buf.append('<g transform="%s"%s>' % (transform, ' opacity=".3"' if key.ghost else ''))
+        if not key.decal:
+            shape: _Shape = (key.width, key.height, key.x2, key.y2, key.width2, key.height2, bool(key.stepped))
+            shape_id = shapes.get(shape)
+            if shape_id is None:
+                shape_id = shapes[shape] = 's%d' % len(shapes)
+                buf.append('<defs>%s</defs>' % _shape_def(shape_id, shape, unit))
+            buf.append('<use xlink:href="#%s" fill="%s"/>' % (shape_id, _xml(key.color)))
+        buf.append(_labels_svg(key, unit))
+        buf.append('</g>')
+        if len(buf) >= _CHUNK * 4:
+            write(''.join(buf))
+            buf.clear()
+    write(''.join(buf))
+    write('</svg>\n')
+
+
+def render_dir(src: Union[str, os.PathLike], dst: Union[str, os.PathLike], pattern: str = '*',
+               unit: float = DEFAULT_UNIT, **kwargs) -> List[Tuple[Path, Union[Path, ItemError]]]:
+    """
+    ``render_svg()`` every layout of ``load_dir(src, pattern)`` to ``dst/<name>.svg``. One layout
+    is in memory at a time. Returns ``(source path, SVG path or ItemError)`` in name order;
+    ``kwargs`` go to ``load_dir()``.
+    """
+    out = Path(dst)
+    out.mkdir(parents=True, exist_ok=True)
+    ret: List[Tuple[Path, Union[Path, ItemError]]] = []
+    for i, (path, kbd) in enumerate(load_dir(src, pattern, **kwargs)):
+        if isinstance(kbd, ItemError):
+            ret.append((path, kbd))
+            continue
+        name = path.name
+        for suffix in ('.gz', '.json', '.json5', '.txt'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        target = out / (name + '.svg')
+        try:
+            render_svg(kbd, target, unit)
+            ret.append((path, target))
+        except Exception as e:
+            ret.append((path, ItemError(i, type(e).__name__, str(e))))
+    return ret
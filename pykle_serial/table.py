@@ -0,0 +1,104 @@
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+NUMERIC_FIELDS: Tuple[str, ...] = (
+    'x', 'y', 'width', 'height', 'x2', 'y2', 'width2', 'height2', 'rotation_x', 'rotation_y', 'rotation_angle')
+FLAG_FIELDS: Tuple[str, ...] = ('decal', 'ghost', 'stepped', 'nub')
+STRING_FIELDS: Tuple[str, ...] = ('color', 'profile', 'sm', 'sb', 'st')
+
+
+class DictColumn:
+    """
+    Dictionary-encoded string column. ``categories[codes[i]]`` is the value of the i-th key.
+    """
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes: Any, categories: List[str]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def decode(self) -> List[str]:
+        c = self.categories
+        return [c[i] for i in self.codes]
+
+    def code_of(self, value: str) -> int:
+        """
+        Returns the code of ``value``, or -1 if no key has it.
+        """
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+
+class KeyTable:
+    """
+    Columnar (structure-of-arrays) view of ``Keyboard.keys``.
+
+    Numeric fields are float64 arrays, flags are bool arrays (``array('b')`` without NumPy),
+    string fields are ``DictColumn``. Columns are accessible as attributes: ``table.x``.
+    """
+    def __init__(self, columns: Dict[str, Any], n_keys: int, backend: str):
+        self.columns = columns
+        self.n_keys = n_keys
+        self.backend = backend
+
+    def __len__(self) -> int:
+        return self.n_keys
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _encode(values: List[str]) -> Tuple[List[int], List[str]]:
+    index: Dict[str, int] = {}
+    codes: List[int] = []
+    for v in values:
+        c = index.get(v)
+        if c is None:
+            c = index[v] = len(index)
+        codes.append(c)
+    return codes, list(index)
+
+
+def to_table(keys: Sequence, use_numpy: Optional[bool] = None) -> KeyTable:
+    """
+    Builds a ``KeyTable`` from ``keys`` (``Key`` or ``CompactKey``).
+
+    ``use_numpy=None`` uses NumPy if it is installed. ``use_numpy=False`` forces
+    the pure ``array`` module backend.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True. Install pykle-serial[numpy].")
+    n = len(keys)
+    columns: Dict[str, Any] = {}
+    for name in NUMERIC_FIELDS:
+        values = [getattr(k, name) for k in keys]
+        columns[name] = np.array(values, dtype=np.float64) if use_numpy else array('d', values)
+    for name in FLAG_FIELDS:
+        values = [bool(getattr(k, name)) for k in keys]
+        columns[name] = np.array(values, dtype=np.bool_) if use_numpy else array('b', values)
+    for name in STRING_FIELDS:
+        codes, categories = _encode([getattr(k, name) for k in keys])
+        columns[name] = DictColumn(np.array(codes, dtype=np.int32) if use_numpy else array('i', codes), categories)
+    return KeyTable(columns, n, 'numpy' if use_numpy else 'array')
@@ -0,0 +1,77 @@
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from .serial import Key, _Cluster, _compile_property_plan, _emit_key_labels, _property_plans, reorder_labels_in
+
+
+class ValidationError(NamedTuple):
+    """
+    A problem found by ``validate()``. ``row`` / ``item`` are the indexes of the row and of the item
+    in the row, ``None`` if the problem is about the whole rows or the whole row.
+    """
+    row: Optional[int]
+    item: Optional[int]
+    message: str
+
+
+_N_ALIGNS = len(reorder_labels_in.LABEL_MAP)
+
+
+def validate(rows: Any) -> List[ValidationError]:  # noqa: C901
+    """
+    Checks ``rows`` as ``deserialize()`` does, but collects all the problems instead of raising on the first.
+    Also reports alignments (``a``) out of range. Returns an empty list for valid rows.
+    """
+    if not isinstance(rows, list):
+        return [ValidationError(None, None, "expected an array of objects")]
+    errors: List[ValidationError] = []
+    current = Key()
+    cluster = _Cluster()
+    align = 4
+    for r, row in enumerate(rows):
+        if isinstance(row, dict):
+            if r != 0:
+                errors.append(ValidationError(r, None, "keyboard metadata must be the first element"))
+            continue
+        if not isinstance(row, list):
+            errors.append(ValidationError(r, None, "unexpected row of type " + type(row).__name__))
+            continue
+        for k, item in enumerate(row):
+            if isinstance(item, str):
+                try:
+                    _emit_key_labels(current, item.split("\n"), align)
+                except Exception as e:
+                    errors.append(ValidationError(r, k, "invalid key: %s: %s" % (type(e).__name__, e)))
+                current.x += current.width
+                current.width = current.height = 1
+                current.x2 = current.y2 = current.width2 = current.height2 = 0
+                current.nub = current.stepped = current.decal = False
+            elif isinstance(item, dict):
+                plan = _property_plans.get(tuple(item))
+                if plan is None:
+                    plan = _compile_property_plan(item)
+                rotation_keys, has_align, setters = plan
+                if k != 0 and rotation_keys and any(item[v] is not None for v in rotation_keys):
+                    errors.append(ValidationError(r, k, "rotation can only be specified on the first key in a row"))
+                if has_align and item['a'] is not None:
+                    a = item['a']
+                    if type(a) is int and 0 <= a < _N_ALIGNS:
+                        align = a
+                    else:
+                        errors.append(ValidationError(r, k, "invalid value of 'a': %r" % (a, )))
+                for item_key, setter in setters:
+                    try:
+                        setter(current, cluster, item[item_key], align)
+                    except Exception as e:
+                        errors.append(ValidationError(r, k, "invalid value of %r: %s: %s" % (item_key, type(e).__name__, e)))
+            else:
+                errors.append(ValidationError(r, k, "unexpected item of type " + type(item).__name__))
+        current.y += 1
+        current.x = current.rotation_x
+    return errors
+
+
+def validate_many(inputs: Iterable[Any]) -> List[List[ValidationError]]:
+    """
+    ``validate()`` every rows of ``inputs``. Returns a list in the order of ``inputs``.
+    """
+    return [validate(rows) for rows in inputs]
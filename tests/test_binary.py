@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+import unittest
+import pykle_serial as serial
+from pykle_serial.binary import dump_binary, load_binary, open_binary
+from pykle_serial.table import np
+
+
+ROWS = [
+    {'name': "binary", 'background': {'name': "Wood", 'style': "x"}},
+    [{'f': 4, 't': "#ff0000\n\n#00ff00", 'p': "DSA", 'c': "#aaaaaa"}, "Q\n\nq", {'w': 1.5, 'n': True}, "W"],
+    [{'r': 15, 'rx': 1, 'ry': 2, 'a': 7}, "R", {'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25, 'l': True}, "Enter"],
+]
+
+
+class TestBinary(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should round-trip one or more keyboards"
+        kbd = serial.deserialize(ROWS)
+        other = serial.deserialize([["A", "B"]])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'layouts.bin')
+            dump_binary([kbd, other], path)
+            self.assertEqual(load_binary(path), [kbd, other], msg)
+            with open_binary(path) as archive:
+                self.assertEqual(len(archive), 2, msg)
+                keys = archive.keys(0)
+                self.assertEqual(len(keys), len(kbd.keys), msg)
+                self.assertEqual(keys[-1], kbd.keys[-1], msg)
+                self.assertEqual(keys[1:3], kbd.keys[1:3], msg)
+                self.assertEqual(archive.meta(1), other.meta, msg)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_a_b(self):
+        msg = "should give a zero-copy view of the key records"
+        kbd = serial.deserialize(ROWS)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'layout.bin')
+            dump_binary(kbd, path)
+            archive = open_binary(path)
+            records = archive.records(0)
+            self.assertFalse(records.flags.owndata, msg)
+            self.assertEqual(list(records['width']), [k.width for k in kbd.keys], msg)
+            archive.close()  # the view keeps the mapping
+            self.assertEqual(list(records['width']), [k.width for k in kbd.keys], msg)
+            del records
+
+    def test_a_c(self):
+        with self.assertRaises(ValueError, msg="should fail on other data"):
+            load_binary(b'not a binary layout file at all, but long enough for a header.........')
+
+    def test_a_d(self):
+        msg = "should round-trip keys without labels and text sizes which are not whole numbers"
+        kbd = serial.deserialize([[{'fa': [2.5, 0, 4]}, "A\nB\nC"]])
+        kbd.keys.append(serial.Key())
+        buf = io.BytesIO()
+        dump_binary(kbd, buf)
+        loaded = load_binary(buf.getvalue())[0]
+        self.assertEqual(loaded.keys[0].textSize, kbd.keys[0].textSize, msg)
+        self.assertEqual(loaded.keys[0].textSize[0], 2.5, msg)
+        self.assertEqual(loaded.keys[1].labels, [None] * 12, msg)
+        self.assertEqual(loaded.keys[1].textSize, serial.Key().textSize, msg)
+        kbd.keys[1].labels = ["A"] * 13
+        with self.assertRaises(ValueError, msg=msg):
+            dump_binary(kbd, io.BytesIO())
@@ -0,0 +1,41 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.bulk import ItemError, parse_many, deserialize_many
+
+
+TEXTS = [
+    '[{name: "a"}, ["Q", {w: 1.5}, "W"]]',
+    '[["Q"], {name: "broken"}]',
+    '["A\\nB", {r: 15, rx: 1}, "C"]',
+]
+
+
+class TestBulk(unittest.TestCase):
+    def _check(self, workers: int):
+        results = parse_many(TEXTS, workers=workers, chunksize=2)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], serial.parse(TEXTS[0]))
+        self.assertIsInstance(results[1], ItemError)
+        self.assertEqual(results[1].index, 1)
+        self.assertEqual(results[1].type, 'ValueError')
+        self.assertIsInstance(results[2], ItemError)
+        self.assertEqual(results[2].index, 2)
+
+    def test_a_a(self):
+        self._check(1)
+
+    def test_a_b(self):
+        self._check(2)
+
+    def test_a_c(self):
+        msg = "should give compact keyboards and deserialize rows"
+        rows = [["Q", {'f': 4, 't': "#ff0000"}, "W\n\n\nx"]]
+        results = deserialize_many([rows, rows], workers=1, compact=True)
+        self.assertEqual(results[0], serial.deserialize(rows, compact=True), msg)
+        self.assertEqual(deserialize_many([rows], workers=1)[0], serial.deserialize(rows), msg)
+
+    def test_a_d(self):
+        msg = "should reject a chunksize below 1"
+        for chunksize in (0, -1):
+            with self.assertRaises(ValueError, msg=msg):
+                parse_many(TEXTS, chunksize=chunksize)
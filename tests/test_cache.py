@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import pykle_serial as serial
+from pykle_serial.cache import ParseCache
+
+
+TEXT = '{name: "cache", background: {name: "wood", style: "x"}},\n["Q", {w: 1.5}, "W"],\n["A"]'
+
+
+class TestCache(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should hit the memory tier and hand out independent copies"
+        cache = ParseCache(max_entries=1)
+        kbd1 = cache.parse(TEXT)
+        kbd1.keys[0].labels[0] = "changed"
+        kbd2 = cache.parse(TEXT)
+        self.assertEqual(kbd2, serial.parse(TEXT), msg)
+        self.assertEqual(cache.stats()['hits'], 1, msg)
+        self.assertEqual(cache.stats()['misses'], 1, msg)
+        self.assertIsInstance(cache.parse(TEXT, compact=True), serial.CompactKeyboard, msg)
+
+        cache.deserialize([["Q"]])
+        self.assertEqual(cache.stats()['evictions'], 1, msg)
+        self.assertEqual(cache.deserialize([["Q"]]), serial.deserialize([["Q"]]), msg)
+        self.assertEqual(cache.stats()['hits'], 3, msg)
+
+    def test_a_b(self):
+        msg = "should read entries from the disk tier and evict by size"
+        with tempfile.TemporaryDirectory() as d:
+            ParseCache(directory=d).parse(TEXT)
+            cache = ParseCache(directory=d)
+            self.assertEqual(cache.parse(TEXT), serial.parse(TEXT), msg)
+            self.assertEqual(cache.stats()['disk_hits'], 1, msg)
+            self.assertEqual(cache.stats()['misses'], 0, msg)
+
+            cache = ParseCache(directory=d, max_bytes=1)
+            cache.parse('[["Q"]]')
+            self.assertEqual(cache.stats()['disk_evictions'], 2, msg)
+            self.assertEqual(os.listdir(os.path.join(d, 'v' + serial.__version__)), [], msg)
+
+    def test_a_c(self):
+        msg = "should not be corrupted by changes to a returned keyboard"
+        with tempfile.TemporaryDirectory() as d:
+            cache = ParseCache(directory=d)
+            for compact in (False, True):
+                kbd = cache.parse(TEXT, compact)
+                kbd.meta.background['name'] = "CORRUPT"
+                kbd.meta.name = "CORRUPT"
+                kbd.keys[0].color = "CORRUPT"
+            self.assertEqual(cache.parse(TEXT), serial.parse(TEXT), msg)
+            self.assertEqual(cache.parse(TEXT).meta.background, {'name': "wood", 'style': "x"}, msg)
+            cache.clear()
+            self.assertEqual(cache.parse(TEXT), serial.parse(TEXT), msg)
+            self.assertEqual(cache.stats()['disk_hits'], 1, msg)
+
+    def test_a_d(self):
+        msg = "should count the disk size once when an entry is rewritten"
+        with tempfile.TemporaryDirectory() as d:
+            cache = ParseCache(directory=d)
+            cache.parse(TEXT)
+            size = cache.stats()['disk_bytes']
+            key = os.listdir(cache.directory)[0][:-len('.json')]
+            for _ in range(3):
+                cache._disk_put(key, cache._disk_get(key))
+            self.assertEqual(cache.stats()['disk_bytes'], size, msg)
+            self.assertTrue(all(name.endswith('.json') for name in os.listdir(cache.directory)), msg)
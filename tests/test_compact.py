@@ -0,0 +1,32 @@
+import unittest
+import pykle_serial as serial
+
+
+ROWS = [
+    {'name': "compact"},
+    [{'f': 2, 't': "#ff0000"}, "Esc", {'w': 1.5, 'c': "#aaaaaa"}, "Tab\nx", {'fa': [None, 4]}, "A\nB"],
+    [{'r': 15, 'rx': 1, 'ry': 2, 'a': 7}, "R", {'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25, 'l': True}, "Enter"],
+]
+
+
+class TestCompact(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should hold the same values as the ordinary representation"
+        normal = serial.deserialize(ROWS)
+        compact = serial.deserialize(ROWS, compact=True)
+        self.assertIsInstance(compact, serial.CompactKeyboard, msg)
+        self.assertEqual(normal.meta, compact.meta, msg)
+        self.assertEqual(len(normal.keys), len(compact.keys), msg)
+        for key, ckey in zip(normal.keys, compact.keys):
+            self.assertEqual(key, ckey.to_key(), msg)
+            self.assertEqual(serial.CompactKey.from_key(key), ckey, msg)
+
+    def test_a_b(self):
+        msg = "should not have __dict__ and should share defaults and empty labels"
+        compact = serial.deserialize(ROWS, compact=True)
+        self.assertFalse(hasattr(compact.keys[0], '__dict__'), msg)
+        self.assertFalse(hasattr(compact, '__dict__'), msg)
+        self.assertIs(compact.keys[0].default, compact.keys[1].default, msg)
+        self.assertIs(compact.keys[3].textColor, compact.keys[4].textColor, msg)
+        with self.assertRaises(AttributeError, msg=msg):
+            compact.keys[0].default.textSize = 5
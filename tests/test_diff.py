@@ -0,0 +1,75 @@
+import copy
+import unittest
+import pykle_serial as serial
+from pykle_serial.diff import KeyChange, diff
+
+
+ROWS = [
+    {'name': "diff"},
+    ["Esc", "F1", "F2"],
+    ["", "", {'c': "#ff0000"}, "Q"],
+    [{'r': 15, 'rx': 1, 'ry': 2}, "R", "T"],
+]
+
+
+class TestDiff(unittest.TestCase):
+    def test_a_a(self):
+        msg = "equal keyboards should give an empty diff, whatever the key order"
+        a = serial.deserialize(ROWS)
+        b = copy.deepcopy(a)
+        b.keys.reverse()
+        d = diff(a, b)
+        self.assertFalse(d, msg)
+        n = len(a.keys)
+        self.assertEqual(sorted(d.matched), [(i, n - 1 - i) for i in range(n)], msg)
+        self.assertFalse(diff(a, serial.deserialize(ROWS, compact=True)), msg)
+        self.assertFalse(diff(a, serial.deserialize(ROWS, lazy=True)), msg)
+
+    def test_a_b(self):
+        msg = "moved, relabeled, recolored, added and removed keys should be reported"
+        a = serial.deserialize(ROWS)
+        b = copy.deepcopy(a)
+        b.meta.name = "diff 2"
+        b.keys[0].x += 5    # Esc moved far: matched by its labels
+        b.keys[3].x += 0.25  # a blank key moved a little: matched by distance
+        b.keys[1].labels[0] = "F10"
+        b.keys[5].color = "#000000"
+        del b.keys[2]
+        b.keys.append(serial.Key(x=10, y=10))
+        d = diff(a, b)
+        self.assertEqual(d.meta, {'name': ("diff", "diff 2")}, msg)
+        self.assertEqual(d.removed, [2], msg)
+        self.assertEqual(d.added, [len(b.keys) - 1], msg)
+        self.assertEqual(d.changed, [
+            KeyChange(0, 0, {'x': (0., 5.)}),
+            KeyChange(1, 1, {'labels': (["F1"] + [None] * 11, ["F10"] + [None] * 11)}),
+            KeyChange(3, 2, {'x': (0., 0.25)}),
+            KeyChange(5, 4, {'color': ("#ff0000", "#000000")}),
+        ], msg)
+        d = diff(a, b, fields=['color'])
+        self.assertEqual(d.changed, [KeyChange(5, 4, {'color': ("#ff0000", "#000000")})], msg)
+
+    def test_a_c(self):
+        msg = "stacked keys should be paired by labels, rotation should count, and unknown fields raise"
+        a = serial.deserialize([["A", {'x': -1}, "B"]])
+        b = serial.deserialize([["B", {'x': -1}, "A"]])
+        self.assertFalse(diff(a, b), msg)
+        rotated = serial.deserialize([[{'r': 90, 'rx': 0.5, 'ry': 0.5}, "A", {'x': -1}, "B"]])
+        d = diff(a, rotated, max_distance=0)
+        self.assertEqual([(c.a, c.b) for c in d.changed], [(0, 0), (1, 1)], msg)
+        self.assertEqual([c.fields['rotation_angle'] for c in d.changed], [(0., 90.)] * 2, msg)
+        with self.assertRaises(ValueError, msg=msg):
+            diff(a, b, fields=['no_such_field'])
+
+    def test_a_d(self):
+        msg = "stacked keys should be paired by labels even when the other side has one key there"
+        a = serial.deserialize([["A", {'x': -1}, "B"]])
+        b = serial.deserialize([["B"]])
+        d = diff(a, b)
+        self.assertEqual(d.matched, [(1, 0)], msg)
+        self.assertEqual(d.removed, [0], msg)
+        self.assertFalse(d.changed, msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
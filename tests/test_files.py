@@ -0,0 +1,67 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+import pykle_serial as serial
+from pykle_serial.bulk import ItemError
+
+
+RAW = '{name: "files"},\n["Esc", {w: 1.5}, "Tab"],\n["A"]'
+
+
+class TestFiles(unittest.TestCase):
+    def test_a_a(self):
+        msg = "load() should read plain and gzip files, and file objects"
+        expected = serial.parse(RAW)
+        with tempfile.TemporaryDirectory() as d:
+            plain = os.path.join(d, 'layout.txt')
+            with open(plain, 'w', encoding='utf-8') as f:
+                f.write(RAW)
+            compressed = os.path.join(d, 'layout.json.gz')
+            with gzip.open(compressed, 'wt', encoding='utf-8') as f:
+                f.write(RAW)
+            self.assertEqual(serial.load(plain), expected, msg)
+            self.assertEqual(serial.load(compressed), expected, msg)
+            with open(compressed, 'rb') as f:
+                self.assertEqual(serial.load(f), expected, msg)
+        self.assertEqual(serial.load(io.StringIO(RAW)), expected, msg)
+        self.assertEqual(serial.load(io.BytesIO(b'\xef\xbb\xbf' + RAW.encode())), expected, msg)
+        self.assertEqual(serial.load(io.StringIO(RAW), compact=True), serial.parse(RAW, compact=True), msg)
+
+    def test_a_b(self):
+        msg = "load() should unwrap the rows of VIA / QMK definitions and KLE gists"
+        rows = json.loads(json.dumps(serial.serialize(serial.parse(RAW))))
+        expected = serial.deserialize(rows)
+        via = {'name': "via", 'matrix': {'rows': 2, 'cols': 3}, 'layouts': {'keymap': rows}}
+        self.assertEqual(serial.load(io.StringIO(json.dumps(via))), expected, msg)
+        gist = {'files': {'README.md': {'content': "x"}, 'layout.kbd.json': {'content': json.dumps(rows)}}}
+        self.assertEqual(serial.load(io.StringIO(json.dumps(gist))), expected, msg)
+        self.assertEqual(serial.load(io.StringIO('{"name": "meta only"}')).meta.name, "meta only", msg)
+        with self.assertRaises(ValueError, msg=msg):
+            serial.load(io.StringIO('{"files": {}}'))
+
+    def test_a_c(self):
+        msg = "load_dir() should load matching files in name order, with per-file errors"
+        with tempfile.TemporaryDirectory() as d:
+            for i in range(20):
+                with open(os.path.join(d, '%02d.json' % i), 'w') as f:
+                    f.write('[["K%d"]]' % i)
+            with open(os.path.join(d, '05x.json'), 'w') as f:
+                f.write('[[1]]')
+            with open(os.path.join(d, 'notes.md'), 'w') as f:
+                f.write('#')
+            results = list(serial.load_dir(d, '*.json', prefetch=2))
+            self.assertEqual(len(results), 21, msg)
+            self.assertEqual([p.name for p, _ in results][5:7], ['05.json', '05x.json'], msg)
+            self.assertIsInstance(results[6][1], ItemError, msg)
+            self.assertEqual(results[6][1].index, 6, msg)
+            self.assertEqual(results[20][1].keys[0].labels[0], "K19", msg)
+            it = serial.load_dir(d, '*.json', prefetch=1)
+            next(it)
+            it.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import copy
+import unittest
+import pykle_serial as serial
+from pykle_serial.compact import KEY_FIELDS
+from pykle_serial import frozen as frozen_module
+from pykle_serial.frozen import FrozenKey, FrozenKeyboard, freeze, freeze_key
+from pykle_serial.table import FLAG_FIELDS, NUMERIC_FIELDS
+
+
+ROWS = [
+    {'name': "frozen", 'background': {'name': "Wood", 'style': "x"}},
+    ["Esc", {'w': 1.5, 'c': "#ff0000"}, "Tab\nA"],
+    [{'r': 15, 'rx': 1, 'ry': 2, 'a': 7, 'f': 5}, "B", {'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25}, "Enter"],
+]
+
+
+class TestFrozen(unittest.TestCase):
+    def test_a_a(self):
+        msg = "freeze() should give hashable snapshots which round-trip"
+        kbd = serial.deserialize(ROWS)
+        frozen = kbd.freeze()
+        self.assertIsInstance(frozen, FrozenKeyboard, msg)
+        self.assertEqual(FrozenKey._fields, KEY_FIELDS, msg)
+        self.assertEqual(frozen.to_keyboard(), kbd, msg)
+        self.assertEqual(frozen.keys[0].to_key(), kbd.keys[0], msg)
+        self.assertEqual(serial.deserialize(ROWS, compact=True).freeze(), frozen, msg)
+        self.assertEqual(serial.deserialize(ROWS, lazy=True).freeze(), frozen, msg)
+        self.assertEqual(len({frozen, copy.deepcopy(kbd).freeze()}), 1, msg)
+        self.assertEqual(len(set(frozen.keys)), len(kbd.keys), msg)
+        with self.assertRaises(AttributeError, msg=msg):
+            frozen.keys = ()
+
+    def test_a_b(self):
+        msg = "fingerprints should ignore key order and number types, and optionally the metadata"
+        kbd = serial.deserialize(ROWS)
+        fp = kbd.freeze().fingerprint()
+        other = copy.deepcopy(kbd)
+        other.keys.reverse()
+        other.keys[-1].width = int(other.keys[-1].width)
+        self.assertEqual(other.freeze().fingerprint(), fp, msg)
+        other.meta.name = "renamed"
+        self.assertNotEqual(other.freeze().fingerprint(), fp, msg)
+        self.assertEqual(other.freeze().fingerprint(ignore_meta=True), kbd.freeze().fingerprint(ignore_meta=True), msg)
+        other.keys[1].labels[0] = "X"
+        self.assertNotEqual(other.freeze().fingerprint(ignore_meta=True), kbd.freeze().fingerprint(ignore_meta=True), msg)
+        self.assertRegex(fp, '^[0-9a-f]{32}$', msg)
+
+    def test_a_c(self):
+        msg = "fingerprints should not depend on which of equal keys was seen first"
+        for first, second in (([4.0], [4]), ([4], [4.0])):
+            frozen_module._key_digests.clear()
+            freeze(serial.deserialize([[{'fa': first}, "A"]])).fingerprint()
+            cached = freeze(serial.deserialize([[{'fa': second}, "A"]])).fingerprint()
+            frozen_module._key_digests.clear()
+            self.assertEqual(freeze(serial.deserialize([[{'fa': second}, "A"]])).fingerprint(), cached, msg)
+        key = serial.deserialize([["A"]]).keys[0]
+        key.decal = 1
+        key.default.textSize = 3.0
+        self.assertEqual(repr(freeze_key(key)), repr(freeze_key(serial.deserialize([[{'d': True}, "A"]]).keys[0])), msg)
+
+    def test_a_d(self):
+        msg = "freeze_key() relies on this order of the fields of Key"
+        self.assertEqual(KEY_FIELDS[:5], ('color', 'labels', 'textColor', 'textSize', 'default'), msg)
+        self.assertEqual(KEY_FIELDS[5:5 + len(NUMERIC_FIELDS)], NUMERIC_FIELDS, msg)
+        self.assertEqual(KEY_FIELDS[5 + len(NUMERIC_FIELDS):9 + len(NUMERIC_FIELDS)], FLAG_FIELDS, msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
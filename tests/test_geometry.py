@@ -0,0 +1,46 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial import geometry
+from pykle_serial.table import np
+
+
+ROWS = [
+    ["Esc", {'w': 1.5}, "Tab"],
+    [{'r': 90, 'rx': 4, 'ry': 0}, "R"],
+    [{'x': 0.25, 'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25}, "Enter"],
+]
+
+
+class TestGeometry(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should rotate corners around the rotation origin"
+        kbd = serial.deserialize(ROWS)
+        primary, secondary = geometry.corners(kbd, use_numpy=False)
+        self.assertEqual(primary[0], ((0., 0.), (1., 0.), (1., 1.), (0., 1.)), msg)
+        # 'R' is at (4, 0) rotated by 90 degrees around (4, 0)
+        for (px, py), (ex, ey) in zip(primary[2], ((4., 0.), (4., 1.), (3., 1.), (3., 0.))):
+            self.assertAlmostEqual(px, ex, msg=msg)
+            self.assertAlmostEqual(py, ey, msg=msg)
+        self.assertEqual(len(secondary), len(kbd.keys), msg)
+
+    def test_a_b(self):
+        msg = "should cover secondary rects in bounding boxes and extents"
+        kbd = serial.deserialize(ROWS)
+        boxes = geometry.bounding_boxes(kbd, use_numpy=False)
+        # ISO Enter: primary at x 4.25..5.5, secondary at x 4.0..5.5, rotated by 90 degrees
+        self.assertAlmostEqual(boxes[3][1], 0., msg=msg)
+        self.assertAlmostEqual(boxes[3][3], 1.5, msg=msg)
+        ext = geometry.extents(kbd, use_numpy=False)
+        self.assertAlmostEqual(ext[0], 0., msg=msg)
+        self.assertAlmostEqual(ext[2], 4., msg=msg)
+        self.assertIsNone(geometry.extents(serial.Keyboard(), use_numpy=False), msg)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_a_c(self):
+        msg = "should give the same result with and without NumPy"
+        kbd = serial.deserialize(ROWS)
+        for a, b in zip(geometry.corners(kbd, use_numpy=True), geometry.corners(kbd, use_numpy=False)):
+            self.assertTrue(np.allclose(a, np.array(b)), msg)
+        self.assertTrue(np.allclose(geometry.bounding_boxes(kbd, use_numpy=True),
+                                    np.array(geometry.bounding_boxes(kbd, use_numpy=False))), msg)
+        self.assertTrue(np.allclose(geometry.extents(kbd, use_numpy=True), geometry.extents(kbd, use_numpy=False)), msg)
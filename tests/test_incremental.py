@@ -0,0 +1,99 @@
+import random
+import unittest
+import pykle_serial as serial
+from pykle_serial.incremental import IncrementalKeyboard
+
+
+ROWS = [
+    {'name': "test"},
+    ["Esc", {'x': 1}, "F1", "F2"],
+    [{'y': 0.5}, "~", "1", {'w': 2}, "Backspace"],
+    [{'a': 7, 'c': "#ff0000"}, "Tab", "Q"],
+    [{'r': 15, 'rx': 2, 'ry': 4}, "A", "S"],
+    ["Z", {'f': 5}, "X"],
+    [{'r': 0, 'rx': 0, 'ry': 7}, "Space"],
+    ["Ctrl", "Alt"],
+]
+
+
+class TestIncremental(unittest.TestCase):
+    def _check(self, ik: IncrementalKeyboard, msg: str):
+        expected = serial.deserialize(ik.rows)
+        self.assertEqual(ik.keyboard, expected, msg)
+        self.assertEqual(sum(len(ik.keys_of_row(r)) for r in range(len(ik))), len(expected.keys), msg)
+
+    def test_a_a(self):
+        msg = "an edit which does not change the state after the row should stop there"
+        ik = IncrementalKeyboard(ROWS)
+        self._check(ik, msg)
+        tail = ik.keyboard.keys[-3:]
+        ik.set_row(2, [{'y': 0.5}, "`", "1", {'w': 2}, "BS"])
+        self._check(ik, msg)
+        self.assertEqual(ik.rows_processed, 1, msg)
+        for a, b in zip(tail, ik.keyboard.keys[-3:]):
+            self.assertIs(a, b, msg)
+        self.assertEqual([k.labels[0] for k in ik.keys_of_row(2)], ['`', '1', 'BS'], msg)
+
+    def test_a_b(self):
+        msg = "an edit which changes the state should go on until it converges"
+        ik = IncrementalKeyboard(ROWS)
+        ik.set_row(2, [{'y': 1}, "~"])  # the following rows move down, until 'ry' resets y
+        self._check(ik, msg)
+        self.assertEqual(ik.rows_processed, 3, msg)
+        ik.insert_row(4, ["New"])
+        self._check(ik, msg)
+        ik.delete_row(1)
+        self._check(ik, msg)
+        ik.replace_rows(0, 1, [{'name': "renamed"}])
+        self._check(ik, msg)
+        self.assertEqual(ik.keyboard.meta.name, "renamed", msg)
+
+    def test_a_c(self):
+        msg = "a failed edit should change nothing"
+        ik = IncrementalKeyboard(ROWS)
+        before = serial.deserialize(ROWS)
+        with self.assertRaises(ValueError, msg=msg):
+            ik.set_row(3, ["A", {'r': 10}, "B"])
+        self.assertEqual(ik.keyboard, before, msg)
+        self.assertEqual(ik.rows, ROWS, msg)
+
+    def test_a_d(self):
+        msg = "set_row() and delete_row() should take negative indexes as lists do, and reject others"
+        ik = IncrementalKeyboard([["A"], ["B"], ["C"]])
+        ik.set_row(-1, ["Z"])
+        self.assertEqual(ik.rows, [["A"], ["B"], ["Z"]], msg)
+        self._check(ik, msg)
+        ik.delete_row(-3)
+        self.assertEqual(ik.rows, [["B"], ["Z"]], msg)
+        self._check(ik, msg)
+        for r in (2, 10, -3):
+            with self.assertRaises(IndexError, msg=msg):
+                ik.set_row(r, ["X"])
+            with self.assertRaises(IndexError, msg=msg):
+                ik.delete_row(r)
+        self.assertEqual(ik.rows, [["B"], ["Z"]], msg)
+        self._check(ik, msg)
+
+    def test_b_a(self):
+        msg = "random edits should give the same result as deserialize()"
+        rng = random.Random(3)
+        items = ["A", "B\nC", {'w': 1.5}, {'x': 0.25}, {'y': 0.5}, {'a': 5}, {'f': 4}, {'c': "#00ff00"}, {'h': 2}]
+        for compact in (False, True):
+            ik = IncrementalKeyboard(ROWS, compact=compact)
+            for _ in range(200):
+                r = rng.randrange(1, len(ik) + 1)
+                row = [rng.choice(items) for _ in range(rng.randrange(0, 5))]
+                op = rng.randrange(3)
+                if op == 0 and r < len(ik):
+                    ik.set_row(r, row)
+                elif op == 1:
+                    ik.insert_row(r, row)
+                elif len(ik) > 2 and r < len(ik):
+                    ik.delete_row(r)
+                expected = serial.deserialize(ik.rows, compact=compact)
+                self.assertEqual(ik.keyboard.meta, expected.meta, msg)
+                self.assertEqual(ik.keyboard.keys, expected.keys, msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
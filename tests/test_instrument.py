@@ -0,0 +1,51 @@
+import random
+import unittest
+import pykle_serial as serial
+from pykle_serial.instrument import PHASES, DeserializeStats
+from pykle_serial.rawdata import loads
+
+from .util import random_rows
+
+
+TEXT = '{name: "x"}, [{a: 7, f: 4}, "A", {t: "#ff0000"}, "B\\nC"], [{r: 15, rx: 1, ry: 2}, "D"]'
+
+
+class TestInstrument(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should record phases, rows, keys and property counts"
+        exported = []
+        stats = DeserializeStats(sink=lambda s: exported.append(s.as_dict()))
+        kbd = serial.parse(TEXT, stats=stats)
+        self.assertEqual(kbd, serial.parse(TEXT), msg)
+        self.assertEqual((stats.calls, stats.rows, stats.keys), (1, 3, 3), msg)
+        self.assertEqual(stats.properties, {'a': 1, 'f': 1, 't': 1, 'r': 1, 'rx': 1, 'ry': 1}, msg)
+        self.assertEqual(stats.decode_tiers, {'kle': 1}, msg)
+        for phase in PHASES:
+            self.assertGreaterEqual(stats.seconds[phase], 0., msg)
+        self.assertGreater(stats.seconds['total'], stats.seconds['decode'], msg)
+        self.assertEqual(len(exported), 1, msg)
+        self.assertEqual(exported[0]['properties.rx'], 1, msg)
+        self.assertEqual(exported[0]['decode_tier.kle'], 1, msg)
+
+        serial.deserialize(loads(TEXT), compact=True, stats=stats)
+        self.assertEqual((stats.calls, stats.keys, stats.properties['a']), (2, 6, 2), msg)
+        stats.reset()
+        self.assertEqual(stats.as_dict()['calls'], 0, msg)
+
+    def test_a_b(self):
+        msg = "instrumented deserialize() should give the same result"
+        rng = random.Random(5)
+        stats = DeserializeStats()
+        for _ in range(300):
+            rows = random_rows(rng)
+            try:
+                expected = serial.deserialize(rows)
+            except (ValueError, IndexError):
+                continue
+            self.assertEqual(serial.deserialize(rows, stats=stats), expected, msg)
+            self.assertEqual(serial.deserialize(rows, compact=True, stats=stats).keys,
+                             serial.deserialize(rows, compact=True).keys, msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
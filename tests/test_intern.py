@@ -0,0 +1,44 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.bulk import parse_many
+from pykle_serial.intern import InternPool
+
+
+TEXT = '[{c: "#cccccc", p: "DCS"}, "Shift", "Shift\\nA", {t: "#ff0000"}, "Shift"], [{a: 7}, "Shift", "Shift"]'
+
+
+class TestIntern(unittest.TestCase):
+    def test_a_a(self):
+        pool = InternPool()
+        kbd = serial.parse(TEXT, pool=pool)
+        self.assertEqual(kbd, serial.parse(TEXT), msg="pooling must not change the result")
+        k0, k1 = kbd.keys[0], kbd.keys[2]
+        self.assertIs(k0.labels[0], k1.labels[0], msg="equal labels must be shared")
+        self.assertIs(k0.labels[0], kbd.keys[1].labels[0])
+        self.assertIsNot(k0.labels, k1.labels, msg="Key lists are mutable and must not be shared")
+        k0.labels[0] = 'X'
+        self.assertEqual(k1.labels[0], 'Shift')
+
+    def test_a_b(self):
+        pool = InternPool()
+        kbd = serial.parse(TEXT, compact=True, pool=pool)
+        self.assertEqual(kbd.keys, serial.parse(TEXT, compact=True).keys)
+        self.assertIs(kbd.keys[-2].labels, kbd.keys[-1].labels, msg="equal tuples must be shared")
+        self.assertIs(kbd.keys[0].textSize, kbd.keys[-1].textSize)
+
+    def test_b_a(self):
+        pool = InternPool()
+        kbd1, kbd2 = parse_many([TEXT, TEXT], workers=1, pool=pool)
+        self.assertIs(kbd1.keys[0].color, kbd2.keys[0].color, msg="a pool is shared across a batch")
+        self.assertIs(kbd1.keys[0].labels[0], kbd2.keys[0].labels[0])
+        stats = pool.stats()
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['bytes_saved'], 0)
+        self.assertGreater(stats['dedup_ratio'], 1.)
+        self.assertEqual(stats['unique'], stats['strings'] + stats['tuples'])
+        pool.clear()
+        self.assertEqual(pool.stats()['lookups'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.labels import Run, cache_info, clear_cache, iter_texts, key_texts, keyboard_texts, to_runs, to_text
+
+
+class TestLabels(unittest.TestCase):
+    def test_a_a(self):
+        msg = "to_text() should strip tags, decode entities and turn <br> into newlines"
+        self.assertEqual(to_text("A"), "A", msg)
+        self.assertIsNone(to_text(None), msg)
+        self.assertEqual(to_text("Shift&nbsp;L"), "Shift L", msg)
+        self.assertEqual(to_text("<b>Fn</b> lock"), "Fn lock", msg)
+        self.assertEqual(to_text("Print<br>Screen<BR/>SysRq"), "Print\nScreen\nSysRq", msg)
+        self.assertEqual(to_text("&lt;&amp;&gt;"), "<&>", msg)
+        self.assertEqual(to_text("<i class='kb kb-Arrows-Up'></i>"), "", msg)
+
+    def test_a_b(self):
+        msg = "to_runs() should split styled runs and keep icons"
+        self.assertEqual(to_runs(None), (), msg)
+        self.assertEqual(to_runs("A"), (Run("A"), ), msg)
+        self.assertEqual(to_runs("<b>Fn</b> <i>lock</i><br><b><em>x</em></b>"), (
+            Run("Fn", bold=True), Run(" "), Run("lock", italic=True), Run("\n"), Run("x", bold=True, italic=True)), msg)
+        self.assertEqual(to_runs("Up <i class='kb kb-Arrows-Up'></i>"), (
+            Run("Up "), Run("", icon="kb kb-Arrows-Up")), msg)
+        self.assertEqual(to_runs("<span style='color: red'>a&amp;b</span>"), (Run("a&b"), ), msg)
+
+    def test_a_d(self):
+        msg = "to_runs() should match end tags with their start tags, and not wait for the end of void elements"
+        self.assertEqual(to_runs("<b>A<img src=x></b>B"), (Run("A", bold=True), Run("B")), msg)
+        self.assertEqual(to_runs("<b>A<hr>B</b>C"), (Run("AB", bold=True), Run("C")), msg)
+        self.assertEqual(to_runs("<b>A</i>B</b>C"), (Run("AB", bold=True), Run("C")), msg)
+        self.assertEqual(to_runs("<b><i>A</b>B"), (Run("A", bold=True, italic=True), Run("B")), msg)
+        self.assertEqual(to_runs("A</b>B"), (Run("AB"), ), msg)
+
+    def test_a_e(self):
+        msg = "to_text() should agree with to_runs() on text which is not a tag"
+        for fragment in ("< >", "<>", "1 < 2", "<b>A<img src=x></b>B", "a&lt;b"):
+            self.assertEqual(to_text(fragment), "".join(run.text for run in to_runs(fragment)), msg)
+        self.assertEqual(to_text("< >"), "< >", msg)
+        self.assertEqual(to_text("<>"), "<>", msg)
+
+    def test_a_c(self):
+        msg = "batch APIs should work on Keyboard, CompactKeyboard and LazyKeyboard, sharing the cache"
+        rows = [["<b>Esc</b>", "Tab\n&amp;"], ["<b>Esc</b>"]]
+        clear_cache()
+        expected = [["Esc"] + [None] * 11, ["Tab", None, None, None, None, None, "&"] + [None] * 5, ["Esc"] + [None] * 11]
+        for kwargs in [{}, {'compact': True}, {'lazy': True}]:
+            kbd = serial.deserialize(rows, **kwargs)
+            self.assertEqual(keyboard_texts(kbd), expected, msg)
+            self.assertEqual(key_texts(kbd.keys[2]), expected[2], msg)
+        self.assertEqual(list(iter_texts([serial.deserialize(rows)] * 2)), [expected] * 2, msg)
+        info = cache_info()
+        self.assertEqual(info['text_misses'], 2, msg)
+        self.assertGreater(info['text_hits'], 0, msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.geometry import rotation_matrix
+from benchmarks.layouts import LAYOUTS
+
+
+class TestLayouts(unittest.TestCase):
+    def test_a_a(self):
+        msg = "no two keys of a benchmark layout should share a position"
+        for name, layout in LAYOUTS.items():
+            seen = {}
+            for i, key in enumerate(serial.deserialize(layout()).keys):
+                a, b, c, d, e, f = rotation_matrix(key.rotation_angle, key.rotation_x, key.rotation_y)
+                x = key.x + key.width / 2
+                y = key.y + key.height / 2
+                center = (round(a * x + b * y + e, 6), round(c * x + d * y + f, 6))
+                self.assertNotIn(center, seen, "%s: %s, keys %s and %d" % (msg, name, seen.get(center), i))
+                seen[center] = i
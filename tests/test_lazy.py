@@ -0,0 +1,74 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.lazy import KeyProxy, LazyKeyboard
+from pykle_serial.table import np
+
+
+ROWS = [
+    {'name': "lazy"},
+    ["Esc", {'w': 1.5, 'c': "#ff0000"}, "Tab\nA"],
+    [{'r': 15, 'rx': 1, 'ry': 2, 'a': 7, 'f': 5}, "B", {'l': True, 'n': True, 'w': 1.75, 'w2': 1.25}, "Caps"],
+    [{'x': 0.25, 'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25, 't': "#00ff00", 'p': "DCS"}, "Enter"],
+]
+
+
+def _text(key) -> str:
+    return next(label for label in key.labels if label)
+
+
+class TestLazy(unittest.TestCase):
+    def test_a_a(self):
+        msg = "lazy keys should read the same values as Key"
+        expected = serial.deserialize(ROWS)
+        kbd = serial.deserialize(ROWS, lazy=True)
+        self.assertIsInstance(kbd, LazyKeyboard, msg)
+        self.assertEqual(len(kbd.keys), len(expected.keys), msg)
+        for k, e in zip(kbd.keys, expected.keys):
+            self.assertIsInstance(k, KeyProxy, msg)
+            for name in ('x', 'y', 'width', 'height2', 'rotation_angle', 'stepped', 'nub', 'color', 'profile'):
+                self.assertEqual(getattr(k, name), getattr(e, name), msg)
+            self.assertEqual(list(k.labels), e.labels, msg)
+            self.assertEqual(list(k.textSize), e.textSize, msg)
+            self.assertEqual(k.default, e.default, msg)
+        self.assertEqual(kbd, expected, msg)
+        self.assertEqual(kbd.to_keyboard(), expected, msg)
+        self.assertEqual(serial.parse('[["A"]]', lazy=True).keys[0].labels[0], "A", msg)
+
+    def test_a_b(self):
+        msg = "slices should be views, and equality should not materialize keys"
+        kbd = serial.deserialize(ROWS, lazy=True)
+        self.assertEqual(kbd, serial.deserialize(ROWS), msg)
+        self.assertEqual(kbd._store.materialized, {}, msg)
+        tail = kbd.keys[1:]
+        self.assertEqual(len(tail), 4, msg)
+        self.assertEqual(_text(tail[-1]), "Enter", msg)
+        self.assertEqual([_text(k) for k in kbd.keys[::2]], ["Esc", "B", "Enter"], msg)
+        with self.assertRaises(AttributeError, msg=msg):
+            kbd.keys[0].no_such_field
+
+    def test_a_c(self):
+        msg = "a mutated key should be materialized and kept"
+        kbd = serial.deserialize(ROWS, lazy=True)
+        kbd.keys[1].x = 10.
+        key = kbd.keys[1]
+        self.assertIsInstance(key, serial.Key, msg)
+        self.assertEqual(key.x, 10., msg)
+        key.labels[0] = "Changed"
+        self.assertEqual(_text(kbd.keys[1]), "Changed", msg)
+        self.assertIs(kbd.keys[0].to_key(), kbd.keys[0], msg)
+        self.assertEqual(kbd.to_table(use_numpy=False).x[1], 10., msg)
+
+    def test_a_d(self):
+        msg = "to_table() from the columns should match Keyboard.to_table()"
+        expected = serial.deserialize(ROWS).to_table(use_numpy=False)
+        for use_numpy in ([False, True] if np is not None else [False]):
+            table = serial.deserialize(ROWS, lazy=True).to_table(use_numpy=use_numpy)
+            for name in ('x', 'y', 'width2', 'height2', 'rotation_angle', 'stepped', 'nub'):
+                self.assertEqual(list(table.columns[name]), list(expected.columns[name]), msg)
+            self.assertEqual(table.profile.decode(), expected.profile.decode(), msg)
+        with self.assertRaises(ValueError, msg=msg):
+            serial.deserialize(ROWS, compact=True, lazy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.matrix import assign_matrix
+from pykle_serial.table import np
+
+
+ORTHO = [["A", "B", "C"], ["D", "E", "F"], [{'d': True}, "decal", "G", {'x': 1}, "H"]]
+
+# Split: 3x3 halves rotated by +10 / -10 degrees around their own origins, and one rotated thumb key each.
+SPLIT = [
+    [{'r': 10, 'rx': 0, 'ry': 0}, "Q", "W", "E"], ["A", "S", "D"], ["Z", "X", "C"],
+    [{'r': -10, 'rx': 6, 'ry': 0.5}, "I", "O", "P"], ["K", "L", ";"], [",", ".", "/"],
+    [{'r': 30, 'rx': 3, 'ry': 3.5}, "Space"],
+]
+
+
+def _positions(kbd, m):
+    return {key.labels[0]: (m.row[i], m.col[i]) for i, key in enumerate(kbd.keys)}
+
+
+class TestMatrix(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should assign rows and columns of an ortholinear layout, -1 for decals"
+        kbd = serial.deserialize(ORTHO)
+        m = assign_matrix(kbd, use_numpy=False)
+        self.assertEqual(list(m.row), [0, 0, 0, 1, 1, 1, -1, 2, 2], msg)
+        self.assertEqual(list(m.col), [0, 1, 2, 0, 1, 2, -1, 1, 3], msg)
+        self.assertEqual(m.shape, (3, 4), msg)
+        self.assertEqual((m.center_x[0], m.center_y[0]), (.5, .5), msg)
+
+    def test_a_b(self):
+        msg = "should number the keys of each row with columns='rank'"
+        m = assign_matrix(serial.deserialize(ORTHO), columns='rank', use_numpy=False)
+        self.assertEqual(list(m.col), [0, 1, 2, 0, 1, 2, -1, 0, 1], msg)
+        with self.assertRaises(ValueError, msg=msg):
+            assign_matrix(serial.deserialize(ORTHO), columns='y')
+
+    def test_a_c(self):
+        msg = "should group rotated clusters in their own frame, and merge the rows of the halves"
+        kbd = serial.deserialize(SPLIT)
+        m = assign_matrix(kbd, use_numpy=False)
+        p = _positions(kbd, m)
+        self.assertEqual(len(set(m.cluster)), 3, msg)
+        # The last key of a row rotated by 10 degrees is 0.35u lower than the first, but in the same row.
+        self.assertEqual([p[c][0] for c in "QWEIOP"], [0] * 6, msg)
+        self.assertEqual([p[c][0] for c in "ZXC,./"], [2] * 6, msg)
+        self.assertEqual([p[c][1] for c in "QAZ"], [0] * 3, msg)
+        self.assertEqual([p[c][1] for c in "IOP"], [4, 5, 6], msg)
+        self.assertEqual(p["Space"], (3, 3), msg)
+        self.assertEqual(len(set(p.values())), len(kbd.keys), msg)
+
+    def test_a_d(self):
+        msg = "should split or merge lines by the tolerances"
+        rows = [["A", {'y': -0.3}, "B"]]
+        self.assertEqual(list(assign_matrix(serial.deserialize(rows), use_numpy=False).row), [0, 0], msg)
+        self.assertEqual(list(assign_matrix(serial.deserialize(rows), row_tolerance=.2, use_numpy=False).row), [1, 0], msg)
+        self.assertEqual(assign_matrix(serial.Keyboard(), use_numpy=False).shape, (0, 0), msg)
+
+    def test_a_e(self):
+        msg = "should move keys which land on the position of an earlier key, or raise"
+        # A stacked key, and a key 0.2u right of another one.
+        rows = [["A", "B", {'x': -1}, "C", {'x': -0.8}, "D"]]
+        m = assign_matrix(serial.deserialize(rows), use_numpy=False)
+        self.assertEqual(list(m.col), [0, 1, 2, 3], msg)
+        self.assertEqual(list(m.moved), [2, 3], msg)
+        self.assertEqual(list(assign_matrix(serial.deserialize(ORTHO), use_numpy=False).moved), [], msg)
+        with self.assertRaises(ValueError, msg=msg):
+            assign_matrix(serial.deserialize(rows), collisions='raise')
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_b_a(self):
+        msg = "NumPy and pure Python should give the same matrix"
+        for rows in (ORTHO, SPLIT):
+            kbd = serial.deserialize(rows)
+            for columns in ('x', 'rank'):
+                a = assign_matrix(kbd, columns=columns, use_numpy=True)
+                b = assign_matrix(kbd, columns=columns, use_numpy=False)
+                self.assertEqual(a.row.tolist(), list(b.row), msg)
+                self.assertEqual(a.col.tolist(), list(b.col), msg)
+                self.assertEqual(a.moved.tolist(), list(b.moved), msg)
+                self.assertTrue(np.allclose(a.center_y, np.array(b.center_y)), msg)
@@ -0,0 +1,89 @@
+import io
+import unittest
+import pykle_serial as serial
+from pykle_serial.plate import KIND_STABILIZER, KIND_SWITCH, cutouts, cutouts_many, write_dxf, write_svg
+from pykle_serial.table import np
+
+
+ROWS = [
+    ["Esc", {'w': 2}, "Backspace", {'d': True}, "decal"],
+    [{'w': 6.25}, "Space", {'h': 2}, "+"],
+    [{'r': 90, 'rx': 1, 'ry': 1}, "R"],
+]
+
+
+def _close(a, b):
+    return all(abs(u - v) < 1e-9 for u, v in zip(a, b))
+
+
+class TestPlate(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should cut a switch per key and 2 stabilizers per key of 2u or longer, none for decals"
+        cut = cutouts(serial.deserialize(ROWS), use_numpy=False)
+        self.assertEqual(cut.key, [0, 1, 1, 1, 3, 3, 3, 4, 4, 4, 5], msg)
+        self.assertEqual(cut.kind.count(KIND_SWITCH), 5, msg)
+        self.assertEqual(cut.kind.count(KIND_STABILIZER), 6, msg)
+
+    def test_a_b(self):
+        msg = "should center a 14mm switch cutout on the key, shrunk by the kerf"
+        cut = cutouts(serial.deserialize(ROWS), use_numpy=False)
+        self.assertTrue(_close(cut.polygons[0][0] + cut.polygons[0][2], (2.525, 2.525, 16.525, 16.525)), msg)
+        cut = cutouts(serial.deserialize(ROWS), kerf=.2, unit=19., use_numpy=False)
+        self.assertTrue(_close(cut.polygons[0][0] + cut.polygons[0][2], (2.6, 2.6, 16.4, 16.4)), msg)
+
+    def test_a_c(self):
+        msg = "should space stabilizers by key length, and turn them on tall keys"
+        cut = cutouts(serial.deserialize(ROWS), use_numpy=False)
+        (x0, _), _, (x1, _), _ = cut.polygons[2]
+        self.assertAlmostEqual((x0 + x1) / 2, 2 * 19.05 - 11.938, msg=msg)
+        (x0, _), _, (x1, _), _ = cut.polygons[6]
+        self.assertAlmostEqual((x0 + x1) / 2, 3.125 * 19.05 + 50., msg=msg)
+        (x0, y0), _, (x1, y1), _ = cut.polygons[8]
+        self.assertAlmostEqual((y0 + y1) / 2, 2 * 19.05 - 11.938, msg=msg)
+        self.assertAlmostEqual(x1 - x0, 7.75 + 6.77, msg=msg)
+
+    def test_a_d(self):
+        msg = "should rotate cutouts around the rotation origin"
+        cut = cutouts(serial.deserialize(ROWS), use_numpy=False)
+        xs = [x for x, _ in cut.polygons[-1]]
+        ys = [y for _, y in cut.polygons[-1]]
+        # 90 degrees clockwise around (19.05, 19.05): center (28.575, 28.575) goes to (9.525, 28.575)
+        self.assertAlmostEqual((min(xs) + max(xs)) / 2, 9.525, msg=msg)
+        self.assertAlmostEqual((min(ys) + max(ys)) / 2, 28.575, msg=msg)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_b_a(self):
+        msg = "NumPy and pure Python should give the same cutouts"
+        kbd = serial.deserialize(ROWS)
+        a = cutouts(kbd, kerf=.1, use_numpy=True)
+        b = cutouts(kbd, kerf=.1, use_numpy=False)
+        self.assertEqual(a.polygons.shape, (len(b), 4, 2), msg)
+        self.assertTrue(np.allclose(a.polygons, np.array(b.polygons)), msg)
+        self.assertEqual(a.key.tolist(), b.key, msg)
+        self.assertEqual(a.kind.tolist(), b.kind, msg)
+
+    def test_c_a(self):
+        msg = "cutouts_many() should split the batch per plate, with key indexes per plate"
+        kbds = [serial.deserialize(ROWS), serial.deserialize([["A", "B"]]), serial.Keyboard(), serial.deserialize(ROWS)]
+        for use_numpy in ([False, True] if np is not None else [False]):
+            many = cutouts_many(kbds, use_numpy=use_numpy)
+            self.assertEqual([len(c) for c in many], [11, 2, 0, 11], msg)
+            self.assertEqual(list(many[1].key), [0, 1], msg)
+            single = cutouts(kbds[3], use_numpy=use_numpy)
+            self.assertEqual(list(many[3].key), list(single.key), msg)
+            for p, q in zip(many[3].polygons, single.polygons):
+                self.assertTrue(_close([v for pt in p for v in pt], [v for pt in q for v in pt]), msg)
+
+    def test_d_a(self):
+        msg = "should write a closed polyline per cutout, y flipped in DXF"
+        cut = cutouts(serial.deserialize(ROWS), use_numpy=False)
+        f = io.StringIO()
+        write_dxf(cut, f)
+        text = f.getvalue()
+        self.assertEqual(text.count('\nPOLYLINE\n'), len(cut), msg)
+        self.assertEqual(text.count('\nVERTEX\n'), 4 * len(cut), msg)
+        self.assertIn('20\n-2.525000\n', text, msg)
+        self.assertTrue(text.endswith('EOF\n'), msg)
+        f = io.StringIO()
+        write_svg(cut, f)
+        self.assertEqual(f.getvalue().count('Z'), len(cut), msg)
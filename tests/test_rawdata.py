@@ -0,0 +1,35 @@
+import unittest
+import json5
+import pykle_serial as serial
+from pykle_serial.rawdata import loads_with_tier, TIER_JSON, TIER_KLE, TIER_JSON5
+
+
+class TestRawData(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should use the fastest tier which can read the text"
+        for text, tier in [
+            ('[{"name": "x"}, ["Q", {"x": 0.5}, "W"]]', TIER_JSON),
+            ('[{name: "x"}, ["Q", {x: 0.5}, "W",],]', TIER_KLE),
+            ("[['Q\\'s', {p: 'DSA \"R1\"'}, \"W\"]]", TIER_KLE),
+            ('[["Q", {x: .5}, "W"]]', TIER_JSON5),
+            ('[["Q", /* comment */ "W"]]', TIER_JSON5),
+        ]:
+            data, t = loads_with_tier(text)
+            self.assertEqual(t, tier, msg + " " + text)
+            self.assertEqual(data, json5.loads(text), msg + " " + text)
+
+    def test_a_b(self):
+        msg = "should accept KLE raw data without the outer []"
+        for text in [
+            '{name: "x"},\n["Q", "W"],\n["A"]',
+            '["Q", "W"],\n["A"]',
+            '["Q", {x: .5}, "W"],\n["A"]',
+        ]:
+            data, _ = loads_with_tier(text)
+            self.assertEqual(data, json5.loads('[' + text + ']'), msg + " " + text)
+        self.assertEqual(loads_with_tier('["Q", "W"]')[0], [["Q", "W"]], msg)
+        self.assertEqual(len(serial.parse('["Q", "W"],\n["A"]').keys), 3, msg)
+
+    def test_a_c(self):
+        with self.assertRaises(ValueError, msg="should raise on invalid text"):
+            serial.parse('[["Q"')
@@ -478,3 +478,40 @@ class TestDeserialization(unittest.TestCase):
         
         assert deep_equal(result1, result2), msg + " 1<>2"
         assert deep_equal(result1, result3), msg + " 1<>3"
+
+    # key objects
+    def test_k_a(self):
+        msg = "should not share mutable state between keys"
+        result = serial.deserialize([[{'f': 2, 't': "#ff0000"}, "1", "2"]])
+        assert len(result.keys) == 2, msg
+        result.keys[0].default.textSize = 5
+        result.keys[0].textColor[0] = "#00ff00"
+        result.keys[0].labels[0] = "x"
+        assert result.keys[1].default.textSize == 2, msg
+        self.assertIsNone(result.keys[1].textColor[0], msg)
+        assert result.keys[1].labels[0] == "2", msg
+
+    def test_k_b(self):
+        msg = "should not modify the rows"
+        fa = [1, "2", 3] + [None] * 9
+        serial.deserialize([[{'fa': fa}, "1", {'f2': 4}, "2"]])
+        assert fa == [1, "2", 3] + [None] * 9, msg
+
+    def test_k_c(self):
+        msg = "should keep a text size of \"0\" from 'fa', and drop a text size of 0"
+        result = serial.deserialize([[{'fa': ["0", "2", 4]}, "A\nB\nC", {'fa': [0, 2]}, "D\nE"]])
+        assert result.keys[0].textSize[:7] == [0, None, 4, None, None, None, 2], msg
+        assert result.keys[1].textSize[:7] == [None, None, None, None, None, None, 2], msg
+
+    # trusted
+    def test_l_a(self):
+        msg = "trusted=True should give the same results on valid rows"
+        rows = [
+            {'name': "trusted"},
+            [{'fa': [1, "2"], 'a': 5}, "A\nB", {'w': 1.5, 'c': "#ff0000"}, "C"],
+            [{'r': 15, 'rx': 1, 'ry': 2, 'f': 5}, "D", {'x': 0.25, 'l': True}, "E"],
+        ]
+        for kwargs in [{}, {'compact': True}]:
+            assert serial.deserialize(rows, trusted=True, **kwargs) == serial.deserialize(rows, **kwargs), msg
+        assert serial.deserialize(rows, trusted=True, lazy=True) == serial.deserialize(rows), msg
+        assert serial.parse('[["A"]]', trusted=True).keys[0].labels[0] == "A", msg
@@ -0,0 +1,51 @@
+import math
+import random
+import unittest
+import pykle_serial as serial
+
+from .util import random_rows
+
+
+def _close(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, abs_tol=1e-8)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_close(x, y) for x, y in zip(a, b))
+    if hasattr(a, '__dataclass_fields__'):
+        return type(a) is type(b) and all(_close(getattr(a, f), getattr(b, f)) for f in a.__dataclass_fields__)
+    return a == b
+
+
+class TestSerialization(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should return empty rows on empty keyboard"
+        self.assertEqual(serial.serialize(serial.Keyboard()), [], msg)
+
+    def test_a_b(self):
+        msg = "should write only the changed properties"
+        rows = [
+            {'name': "test"},
+            ["Q", {'w': 1.5}, "W", "E"],
+            [{'c': "#aaaaaa", 'x': 0.25}, "A", "S"],
+            [{'r': 15, 'rx': 1, 'ry': 2, 'a': 7}, "R"],
+        ]
+        self.assertEqual(serial.serialize(serial.deserialize(rows)), rows, msg)
+
+    def test_a_c(self):
+        msg = "should round-trip through deserialize()"
+        rng = random.Random(0)
+        for i in range(300):
+            rows = random_rows(rng)
+            try:
+                kbd = serial.deserialize(rows)
+            except (ValueError, IndexError):
+                # 'f2' after a short 'fa', for example
+                continue
+            out = serial.serialize(kbd)
+            self.assertTrue(_close(kbd, serial.deserialize(out)), msg + " " + repr(rows))
+            self.assertEqual(serial.serialize(serial.deserialize(out)), out, msg + " " + repr(rows))
+
+    def test_a_d(self):
+        msg = "should round-trip compact keyboards"
+        rows = [["Q", {'w': 1.5, 'f': 4}, "W\n\n\n\nx"]]
+        self.assertEqual(serial.serialize(serial.deserialize(rows, compact=True)), rows, msg)
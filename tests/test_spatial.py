@@ -0,0 +1,87 @@
+import random
+import unittest
+import pykle_serial as serial
+from pykle_serial import geometry
+from pykle_serial.spatial import SpatialIndex
+
+
+ROWS = [
+    ["Esc", {'w': 1.5}, "Tab"],
+    [{'r': 90, 'rx': 4, 'ry': 0}, "R"],
+    [{'x': 0.25, 'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25}, "Enter"],
+    [{'r': -30, 'rx': 8, 'ry': 2}, "A", "B", {'h': 2}, "C"],
+    [{'r': 15, 'rx': 10, 'ry': 6, 'y': -1}, "D", {'l': True, 'w': 1.75, 'w2': 1.25}, "Caps"],
+]
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _in_polygon(p, poly, eps=1e-9):
+    return all(_cross(poly[i], poly[(i + 1) % 4], p) >= -eps for i in range(4))
+
+
+def _segments_cross(a, b, c, d):
+    return (_cross(a, b, c) * _cross(a, b, d) < 0) and (_cross(c, d, a) * _cross(c, d, b) < 0)
+
+
+def _polygon_meets_rect(poly, rect):
+    x0, y0, x1, y1 = rect
+    q = ((x0, y0), (x1, y0), (x1, y1), (x0, y1))
+    if any(x0 <= x <= x1 and y0 <= y <= y1 for x, y in poly) or any(_in_polygon(p, poly) for p in q):
+        return True
+    return any(_segments_cross(poly[i], poly[(i + 1) % 4], q[j], q[(j + 1) % 4]) for i in range(4) for j in range(4))
+
+
+class TestSpatial(unittest.TestCase):
+    def setUp(self):
+        self.kbd = serial.deserialize(ROWS)
+        self.index = SpatialIndex(self.kbd, cell_size=0.7)
+        primary, secondary = geometry.corners(self.kbd, use_numpy=False)
+        self.polygons = list(zip(primary, secondary))
+        self.rng = random.Random(12)
+
+    def test_a_a(self):
+        msg = "keys_at() should match a brute-force point-in-polygon test"
+        for _ in range(2000):
+            p = (self.rng.uniform(-1, 13), self.rng.uniform(-2, 9))
+            expected = [k for k, polys in zip(self.kbd.keys, self.polygons) if any(_in_polygon(p, poly) for poly in polys)]
+            self.assertEqual(self.index.keys_at(*p), expected, msg)
+        # ISO Enter rotated by 90 degrees around (4, 0): primary at x 1..3, y 0.25..1.5, secondary at x 2..3, y 0..1.5
+        self.assertEqual([k.labels[0] for k in self.index.keys_at(2.7, 0.1)], ['Enter'], msg)
+
+    def test_a_b(self):
+        msg = "keys_in() should match a brute-force polygon / rect intersection test"
+        for _ in range(500):
+            x, y = self.rng.uniform(-1, 13), self.rng.uniform(-2, 9)
+            rect = (x, y, x + self.rng.uniform(0, 3), y + self.rng.uniform(0, 3))
+            expected = [k for k, polys in zip(self.kbd.keys, self.polygons)
+                        if any(_polygon_meets_rect(poly, rect) for poly in polys)]
+            self.assertEqual(self.index.keys_in(rect), expected, msg)
+        self.assertEqual(self.index.keys_in((-1, -1, 2.6, 1.1), contained=True), self.kbd.keys[:2], msg)
+
+    def test_a_c(self):
+        msg = "nearest() should match a brute-force distance sort"
+        for k in (1, 3, len(self.kbd.keys) + 2):
+            for _ in range(300):
+                p = (self.rng.uniform(-20, 30), self.rng.uniform(-20, 30))
+                distances = [self.index._distance(i, *p) for i in range(len(self.kbd.keys))]
+                order = sorted(range(len(distances)), key=lambda i: (distances[i], i))[:k]
+                self.assertEqual(self.index.nearest(*p, k=k), [self.kbd.keys[i] for i in order], msg)
+        self.assertEqual(SpatialIndex(serial.Keyboard()).nearest(0, 0), [], msg)
+
+    def test_a_d(self):
+        msg = "nearest() should visit the occupied cells rather than the whole grid of a sparse layout"
+        # 10^8 cells in the grid: searching them ring by ring would not finish.
+        kbd = serial.deserialize([["A", {'x': 5000}, "B"], [{'y': 5000}, "C"]])
+        index = SpatialIndex(kbd, cell_size=0.5)
+        for k in (1, 2, 5):
+            for p in ((2500, 2500), (4000, -100), (0.5, 0.5)):
+                distances = [index._distance(i, *p) for i in range(3)]
+                order = sorted(range(3), key=lambda i: (distances[i], i))[:k]
+                self.assertEqual(index.nearest(*p, k=k), [kbd.keys[i] for i in order], msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
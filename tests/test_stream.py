@@ -0,0 +1,36 @@
+import io
+import unittest
+import pykle_serial as serial
+from pykle_serial.stream import iter_rows, iter_parse
+
+
+RAW = '{name: "stream"},\n["Q", {w: 1.5}, "W"],\n[{y: 0.5}, "A\\nB"]'
+ROWS = [{'name': "stream"}, ["Q", {'w': 1.5}, "W"], [{'y': 0.5}, "A\nB"]]
+
+
+class TestStream(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should yield the rows of raw data, with or without the outer []"
+        for chunk_size in (1, 5, 1 << 16):
+            self.assertEqual(list(iter_rows(io.StringIO(RAW), chunk_size)), ROWS, msg)
+            self.assertEqual(list(iter_rows(io.StringIO('[' + RAW + ']'), chunk_size)), ROWS, msg)
+            self.assertEqual(list(iter_rows(io.BytesIO(RAW.encode()), chunk_size)), ROWS, msg)
+        self.assertEqual(list(iter_rows('[{x: 1}, "Q"], ["A"]')), [[{'x': 1}, "Q"], ["A"]], msg)
+        self.assertEqual(list(iter_rows('[{x: 1}, "Q"]')), [[{'x': 1}, "Q"]], msg)
+        self.assertEqual(list(iter_rows('')), [], msg)
+
+    def test_a_b(self):
+        msg = "should yield the metadata first, then the same keys as deserialize()"
+        kbd = serial.deserialize(ROWS)
+        it = iter_parse(io.StringIO(RAW), chunk_size=3)
+        self.assertEqual(next(it), kbd.meta, msg)
+        self.assertEqual(list(it), kbd.keys, msg)
+
+        it = serial.iter_deserialize(iter([["Q"]]))
+        self.assertEqual(next(it), serial.KeyboardMetadata(), msg)
+        self.assertEqual(len(list(it)), 1, msg)
+
+    def test_a_c(self):
+        for text in ['[["Q"]', '[["Q"]] x', '["Q"] ["A"]']:
+            with self.assertRaises(ValueError, msg="should fail on broken stream: " + text):
+                list(iter_rows(text))
@@ -0,0 +1,76 @@
+import io
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+import pykle_serial as serial
+from pykle_serial.bulk import ItemError
+from pykle_serial.svg import render_dir, render_svg
+
+
+ROWS = [
+    {'name': "svg", 'backcolor': "#222222"},
+    ["<b>Esc</b>", {'c': "#ff0000", 't': "#ffffff"}, "A & B", "C",
+     {'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x': 0.25, 'x2': -0.25}, "Enter"],
+    [{'l': True, 'w': 1.75, 'w2': 1.25}, "Caps", {'d': True}, "decal", {'g': True}, "ghost"],
+    [{'r': 15, 'rx': 4, 'ry': 0}, "Shift\n\n\n\n\n\nfront"],
+]
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def _render(rows) -> ET.Element:
+    f = io.StringIO()
+    render_svg(serial.deserialize(rows), f)
+    return ET.fromstring(f.getvalue())
+
+
+class TestSvg(unittest.TestCase):
+    def test_a_a(self):
+        msg = "should write each key shape once, and a use per non-decal key"
+        root = _render(ROWS)
+        self.assertEqual(root.tag, SVG + 'svg', msg)
+        shapes = root.findall('.//%sdefs/%sg' % (SVG, SVG))
+        uses = root.findall('.//%suse' % SVG)
+        self.assertEqual(len(shapes), 3, msg)  # 1u, ISO Enter, stepped Caps
+        self.assertEqual(len(uses), 7, msg)
+        self.assertEqual(uses[1].get('fill'), "#ff0000", msg)
+        self.assertEqual(len(shapes[1].findall('%srect' % SVG)), 6, msg)  # ISO: 2 outlines, 2 fills, 2 faces
+        self.assertEqual(len(shapes[2].findall("%srect[@class='t']" % SVG)), 1, msg)  # stepped: 1 face
+
+    def test_a_b(self):
+        msg = "should draw rotation, ghost keys and plain text labels"
+        root = _render(ROWS)
+        groups = root.findall('%sg' % SVG)
+        self.assertEqual(groups[-1].get('transform'), "rotate(15 216 0) translate(216 0)", msg)
+        self.assertEqual(groups[-2].get('opacity'), ".3", msg)
+        texts = [''.join(t.itertext()) for t in root.iter(SVG + 'text')]
+        self.assertEqual(texts[:3], ["Esc", "A & B", "C"], msg)
+        self.assertIn("front", texts, msg)
+        self.assertEqual(_render([["A"]]).get('viewBox'), "-5.4 -5.4 64.8 64.8", msg)
+
+    def test_a_c(self):
+        msg = "render_dir() should write one SVG per layout and report broken ones"
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, 'src')
+            os.mkdir(src)
+            with open(os.path.join(src, 'a.json'), 'w') as f:
+                f.write('[["A"]]')
+            with open(os.path.join(src, 'b.json'), 'w') as f:
+                f.write('[[1]]')
+            results = render_dir(src, os.path.join(d, 'out'))
+            self.assertEqual([p.name for p, _ in results], ['a.json', 'b.json'], msg)
+            self.assertEqual(results[0][1].name, 'a.svg', msg)
+            ET.parse(str(results[0][1]))
+            self.assertIsInstance(results[1][1], ItemError, msg)
+
+    def test_a_d(self):
+        msg = "should drop characters not allowed in XML from labels and colors"
+        root = _render([[{'c': "#ff\x000000"}, "a\x01b\tc", "<b>x\x1f</b>\ud800y"]])
+        texts = [t.text for t in root.iter(SVG + 'text')]
+        self.assertEqual(texts, ["ab\tc", "xy"], msg)
+        self.assertEqual(root.find('.//%suse' % SVG).get('fill'), "#ff0000", msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.table import NUMERIC_FIELDS, FLAG_FIELDS, STRING_FIELDS, np
+
+
+ROWS = [
+    [{'c': "#111111", 'p': "DSA"}, "Esc", {'w': 1.5}, "Tab", {'c': "#222222", 'n': True}, "F"],
+    [{'r': 15, 'rx': 1, 'ry': 2, 'p': "DSA"}, "R", {'w': 1.25, 'h': 2, 'w2': 1.5, 'h2': 1, 'x2': -0.25, 'l': True}, "Enter"],
+]
+
+
+class TestTable(unittest.TestCase):
+    def _check(self, use_numpy: bool):
+        kbd = serial.deserialize(ROWS)
+        table = kbd.to_table(use_numpy=use_numpy)
+        self.assertEqual(len(table), len(kbd.keys))
+        for name in NUMERIC_FIELDS + FLAG_FIELDS:
+            self.assertEqual(list(table[name]), [getattr(k, name) for k in kbd.keys], name)
+        for name in STRING_FIELDS:
+            self.assertEqual(getattr(table, name).decode(), [getattr(k, name) for k in kbd.keys], name)
+        self.assertEqual(table.color.categories, ["#111111", "#222222"])
+        self.assertEqual(table.profile.code_of("DSA"), 0)
+        self.assertEqual(table.profile.code_of("SA"), -1)
+
+    def test_a_a(self):
+        self._check(False)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_a_b(self):
+        self._check(True)
+
+    def test_a_c(self):
+        msg = "should work on compact keyboards"
+        kbd = serial.deserialize(ROWS, compact=True)
+        self.assertEqual(list(kbd.to_table(use_numpy=False).width), [1., 1.5, 1., 1., 1.25], msg)
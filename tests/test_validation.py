@@ -0,0 +1,37 @@
+import unittest
+import pykle_serial as serial
+from pykle_serial.validation import ValidationError, validate_many
+
+
+class TestValidation(unittest.TestCase):
+    def test_a_a(self):
+        msg = "valid rows should give no errors"
+        rows = [{'name': "valid"}, [{'a': 7, 'fa': [2, "3"]}, "A", {'w': 1.5}, "B"], [{'r': 15, 'rx': 1}, "C"]]
+        self.assertEqual(serial.validate(rows), [], msg)
+        self.assertEqual(serial.validate(serial.serialize(serial.deserialize(rows))), [], msg)
+
+    def test_a_b(self):
+        msg = "all the errors should be collected, with their row and item indexes"
+        rows = [
+            ["A", {'r': 45}, "B", 5],
+            {'name': "late"},
+            [{'w': "wide", 'a': 9}, "C", {'x': None}, "D"],
+            "E",
+        ]
+        errors = serial.validate(rows)
+        self.assertEqual([(e.row, e.item) for e in errors], [(0, 1), (0, 3), (1, None), (2, 0), (2, 0), (2, 2), (3, None)], msg)
+        self.assertIn("rotation", errors[0].message, msg)
+        self.assertIn("'a'", errors[3].message, msg)
+        self.assertIn("'w'", errors[4].message, msg)
+        self.assertEqual(serial.validate("rows"), [ValidationError(None, None, "expected an array of objects")], msg)
+        with self.assertRaises(ValueError, msg=msg):
+            serial.deserialize(rows)
+
+    def test_a_c(self):
+        msg = "validate_many() should keep the input order"
+        results = validate_many([[["A"]], [[1]], [["B"]]])
+        self.assertEqual([len(r) for r in results], [0, 1, 0], msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
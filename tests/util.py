@@ -0,0 +1,31 @@
+"""
+Helpers shared by the tests.
+"""
+import random
+
+
+def random_rows(rng: random.Random) -> list:
+    # Random rows, with property dicts of all kinds before about 60% of the keys.
+    rows = []
+    for r in range(rng.randint(1, 6)):
+        row = []
+        for k in range(rng.randint(1, 8)):
+            if rng.random() < 0.6:
+                p = {}
+                if k == 0 and rng.random() < 0.3:
+                    p['r'] = rng.choice([0, 10, -15])
+                    p['rx'] = rng.choice([0, 1, 2.5])
+                    p['ry'] = rng.choice([0, 3.25])
+                for prop, values in [
+                    ('a', list(range(8))), ('f', [1, 3, 6]), ('f2', [2, 4]), ('fa', [[None, 2, 4], [5, None, 1, 3]]),
+                    ('t', ["#ff0000", "\n#00ff00", "#000000\n\n#ff0000"]), ('c', ["#aaaaaa", "#cccccc"]),
+                    ('p', ["", "DSA"]), ('g', [True, False]), ('x', [0.25, -0.1, 0.3]), ('y', [0.5, -0.1]),
+                    ('w', [1.25, 2]), ('h', [2]), ('w2', [1.5]), ('h2', [1]), ('x2', [-0.25]), ('y2', [0.5]),
+                    ('n', [True]), ('l', [True]), ('d', [True]), ('sm', ["cherry"]),
+                ]:
+                    if rng.random() < 0.15:
+                        p[prop] = rng.choice(values)
+                row.append(p)
+            row.append("\n".join(rng.choice(["", "A", "B", "Shift"]) for _ in range(rng.randint(0, 12))))
+        rows.append(row)
+    return rows